@@ -13,9 +13,18 @@ Usage:
     # Process specific PDF
     python pipeline.py --pdf Data/SDS-31_Part1.pdf
 
+    # Extract PDFs and clean tables in 4 worker processes
+    python pipeline.py --all --workers 4
+
+    # Re-extract everything, ignoring the extraction cache
+    python pipeline.py --all --refresh-cache
+
     # Resume from specific stage
     python pipeline.py --all --start-from clean
 
+    # Only redo PDFs and tables that changed since the last run
+    python pipeline.py --all --incremental
+
     # Process with custom config
     python pipeline.py --all --config my_config.yaml
 """
@@ -30,7 +39,9 @@ import json
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
 
-from scripts import extract, clean
+from scripts import extract, clean, page_index
+from tabula_session import close_session
+from extraction_cache import configure_cache
 # prepare_db and analyze will be imported when we create them
 
 
@@ -42,6 +53,7 @@ class Pipeline:
         self.config = self.load_config(config_path)
         self.results = {}
         self.start_time = datetime.now()
+        self.incremental = False
 
     def load_config(self, config_path: Path = None) -> dict:
         """Load configuration from YAML file"""
@@ -58,13 +70,22 @@ class Pipeline:
                 'cleaned': 'output/02_cleaned',
                 'analyzed': 'output/03_analyzed',
                 'database': 'output/04_database',
+                'page_index': 'output/.page_index',
             },
             'extraction': {
                 'pages': 'all',
                 'multiple_tables': True,
+                'workers': 1,
+                'shard_size': None,
+                'prefilter': None,
+                'page_timeout': None,
+                'table_areas': False,
             },
             'cleaning': {
+                'workers': 1,
                 'apply_ocr_fixes': True,
+                'fix_number_spaces': True,
+                'fix_decimal_comma': True,
             },
             'database': {
                 'merge_sequences': True,
@@ -98,6 +119,39 @@ class Pipeline:
             }
             return False
 
+    def configure_extraction_cache(self, enabled: bool = True, refresh: bool = False):
+        """Set up the on-disk extraction cache from config and CLI switches"""
+        cache_config = self.config['extraction'].get('cache', {})
+        cache_dir = cache_config.get(
+            'dir', str(Path(self.config['directories']['output_base']) / '.extraction_cache')
+        )
+        return configure_cache(
+            enabled=enabled and cache_config.get('enabled', True),
+            refresh=refresh,
+            cache_dir=Path(cache_dir),
+            max_bytes=int(cache_config.get('max_size_mb', 1024)) * 1024 * 1024,
+        )
+
+    @property
+    def page_index_dir(self) -> Path:
+        """Directory of the page index, written by stage 0 and read by the later stages"""
+        return Path(self.config['directories'].get('page_index', page_index.DEFAULT_INDEX_DIR))
+
+    def stage_index_pages(self, pdf_path: Path = None):
+        """Stage 0: Scan PDF pages once (text, table boxes) for later stages"""
+        dirs = self.config['directories']
+
+        if pdf_path:
+            # As in index_all_pdfs: an unreadable PDF is recorded, and
+            # extraction reads it without an index
+            try:
+                pages = page_index.load_page_index(pdf_path, self.page_index_dir)
+            except Exception as e:
+                print(f"  ✗ Could not index {pdf_path.name}: {e}")
+                return {'success': True, 'pdfs_indexed': 0, 'failed': [pdf_path.name], 'total_pages': 0}
+            return {'success': True, 'pdfs_indexed': 1, 'failed': [], 'total_pages': len(pages)}
+        return page_index.index_all_pdfs(Path(dirs['input']), self.page_index_dir)
+
     def stage_extract(self, pdf_path: Path = None):
         """Stage 1: Extract tables from PDFs"""
         dirs = self.config['directories']
@@ -106,12 +160,24 @@ class Pipeline:
             return extract.extract_pdf(
                 pdf_path,
                 Path(dirs['extracted']),
-                self.config['extraction']['pages']
+                self.config['extraction']['pages'],
+                shard_size=self.config['extraction'].get('shard_size'),
+                prefilter=self.config['extraction'].get('prefilter'),
+                page_timeout=self.config['extraction'].get('page_timeout'),
+                use_table_areas=self.config['extraction'].get('table_areas', False),
+                index_dir=self.page_index_dir
             )
         else:
             return extract.extract_all_pdfs(
                 Path(dirs['input']),
-                Path(dirs['extracted'])
+                Path(dirs['extracted']),
+                workers=self.config['extraction'].get('workers', 1),
+                shard_size=self.config['extraction'].get('shard_size'),
+                incremental=self.incremental,
+                prefilter=self.config['extraction'].get('prefilter'),
+                page_timeout=self.config['extraction'].get('page_timeout'),
+                use_table_areas=self.config['extraction'].get('table_areas', False),
+                index_dir=self.page_index_dir
             )
 
     def stage_clean(self):
@@ -119,7 +185,10 @@ class Pipeline:
         dirs = self.config['directories']
         return clean.clean_all_tables(
             Path(dirs['extracted']),
-            Path(dirs['cleaned'])
+            Path(dirs['cleaned']),
+            incremental=self.incremental,
+            cleaning=self.config.get('cleaning'),
+            workers=(self.config.get('cleaning') or {}).get('workers', 1)
         )
 
     def stage_analyze(self):
@@ -134,15 +203,20 @@ class Pipeline:
         # Will implement when we move prepare_db.py
         return {'success': True, 'message': 'Database preparation complete'}
 
-    def run_full_pipeline(self, pdf_path: Path = None, start_from: str = None):
+    def run_full_pipeline(self, pdf_path: Path = None, start_from: str = None, incremental: bool = False):
         """
         Run complete pipeline
 
         Args:
             pdf_path: Optional specific PDF to process
             start_from: Optional stage name to start from
+            incremental: Only recompute PDFs/tables whose inputs, config or
+                code changed since the last run
         """
+        self.incremental = incremental
+
         stages = [
+            ('index_pages', lambda: self.stage_index_pages(pdf_path)),
             ('extract', lambda: self.stage_extract(pdf_path)),
             ('clean', self.stage_clean),
             ('analyze', self.stage_analyze),
@@ -156,12 +230,15 @@ class Pipeline:
             if start_idx > 0:
                 print(f"\nResuming pipeline from stage: {start_from}")
 
-        # Run stages
-        for stage_name, stage_func in stages[start_idx:]:
-            success = self.run_stage(stage_name, stage_func)
-            if not success:
-                print(f"\n⚠ Pipeline stopped at stage '{stage_name}' due to error")
-                break
+        # Run stages (all extraction shares one warm tabula JVM)
+        try:
+            for stage_name, stage_func in stages[start_idx:]:
+                success = self.run_stage(stage_name, stage_func)
+                if not success:
+                    print(f"\n⚠ Pipeline stopped at stage '{stage_name}' due to error")
+                    break
+        finally:
+            close_session()
 
         # Final summary
         self.print_summary()
@@ -210,9 +287,18 @@ Examples:
   # Process specific PDF
   python pipeline.py --pdf Data/SDS-31_Part1.pdf
 
+  # Extract PDFs and clean tables in 4 worker processes
+  python pipeline.py --all --workers 4
+
+  # Re-extract everything, ignoring the extraction cache
+  python pipeline.py --all --refresh-cache
+
   # Resume from cleaning stage
   python pipeline.py --all --start-from clean
 
+  # Only redo PDFs and tables that changed since the last run
+  python pipeline.py --all --incremental
+
   # Use custom configuration
   python pipeline.py --all --config custom_config.yaml
         """
@@ -230,7 +316,7 @@ Examples:
     )
     parser.add_argument(
         '--start-from',
-        choices=['extract', 'clean', 'analyze', 'prepare_database'],
+        choices=['index_pages', 'extract', 'clean', 'analyze', 'prepare_database'],
         help='Start pipeline from specific stage'
     )
     parser.add_argument(
@@ -238,6 +324,31 @@ Examples:
         type=Path,
         help='Path to configuration YAML file'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of worker processes for extraction and cleaning (overrides config)'
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=extract.parse_shard_size,
+        help="Pages per concurrent shard within a PDF, or 'auto' (overrides config)"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the extraction cache'
+    )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Re-extract every page and overwrite cached results'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only recompute PDFs and tables whose inputs changed; delete outputs of removed sources'
+    )
 
     args = parser.parse_args()
 
@@ -256,9 +367,16 @@ Examples:
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     pipeline = Pipeline(args.config)
+    if args.workers:
+        pipeline.config['extraction']['workers'] = args.workers
+        pipeline.config.setdefault('cleaning', {})['workers'] = args.workers
+    if args.shard_size:
+        pipeline.config['extraction']['shard_size'] = args.shard_size
+    pipeline.configure_extraction_cache(enabled=not args.no_cache, refresh=args.refresh_cache)
     pipeline.run_full_pipeline(
         pdf_path=args.pdf if not args.all else None,
-        start_from=args.start_from
+        start_from=args.start_from,
+        incremental=args.incremental
     )
 
     return 0
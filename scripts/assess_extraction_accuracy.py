@@ -5,11 +5,14 @@ This script evaluates current extraction accuracy and tests improved methods.
 """
 
 import pandas as pd
-import tabula
 from pathlib import Path
 from typing import Dict, List, Tuple
 import json
 
+from tabula_session import close_session
+from extraction_cache import read_page
+from page_index import DEFAULT_INDEX_DIR, table_areas
+
 
 def assess_table_quality(df: pd.DataFrame) -> Dict:
     """
@@ -73,27 +76,32 @@ def test_extraction_method(
     pdf_path: Path,
     page: int,
     method: str,
+    index_dir: Path = DEFAULT_INDEX_DIR,
     **kwargs
 ) -> Tuple[pd.DataFrame, float]:
     """
     Test an extraction method and return the best table + time taken.
+
+    The 'area' method reads the page's table boxes from the page index in index_dir.
     """
     import time
 
     start = time.time()
 
     try:
+        # Repeat runs are served from the extraction cache
         if method == 'default':
-            tables = tabula.read_pdf(str(pdf_path), pages=str(page), multiple_tables=True, **kwargs)
+            tables = read_page(pdf_path, page, mode=method, multiple_tables=True, **kwargs)
         elif method == 'lattice':
-            tables = tabula.read_pdf(str(pdf_path), pages=str(page), multiple_tables=True, lattice=True, **kwargs)
+            tables = read_page(pdf_path, page, mode=method, multiple_tables=True, lattice=True, **kwargs)
         elif method == 'stream':
-            tables = tabula.read_pdf(str(pdf_path), pages=str(page), multiple_tables=True, stream=True, **kwargs)
+            tables = read_page(pdf_path, page, mode=method, multiple_tables=True, stream=True, **kwargs)
         elif method == 'guess':
-            tables = tabula.read_pdf(str(pdf_path), pages=str(page), multiple_tables=True, guess=True, **kwargs)
+            tables = read_page(pdf_path, page, mode=method, multiple_tables=True, guess=True, **kwargs)
         elif method == 'area':
-            # Manual area specification (most accurate but requires configuration)
-            tables = tabula.read_pdf(str(pdf_path), pages=str(page), area=kwargs.get('area'), **kwargs)
+            # Only the table boxes recorded in the page index (or a manual area=)
+            kwargs.setdefault('area', table_areas(pdf_path, index_dir).get(page))
+            tables = read_page(pdf_path, page, mode=method, multiple_tables=True, **kwargs)
         else:
             return None, 0
 
@@ -107,18 +115,22 @@ def test_extraction_method(
         return None, time.time() - start
 
 
-def compare_extraction_methods(pdf_path: Path, test_pages: List[int] = [10, 15, 20]) -> Dict:
+def compare_extraction_methods(
+    pdf_path: Path,
+    test_pages: List[int] = [10, 15, 20],
+    index_dir: Path = DEFAULT_INDEX_DIR
+) -> Dict:
     """
     Compare different extraction methods across multiple pages.
     """
-    methods = ['default', 'stream', 'guess']
+    methods = ['default', 'stream', 'guess', 'area']
     results = {}
 
     for page in test_pages:
         page_results = {}
 
         for method in methods:
-            df, time_taken = test_extraction_method(pdf_path, page, method)
+            df, time_taken = test_extraction_method(pdf_path, page, method, index_dir)
 
             if df is not None:
                 quality = assess_table_quality(df)
@@ -215,7 +227,10 @@ def main():
     print("\n\n2. Testing alternative extraction methods...")
     pdf_path = Path('Data/SDS-31_Part3.pdf')
     if pdf_path.exists():
-        comparison = compare_extraction_methods(pdf_path, [10, 15, 20])
+        try:
+            comparison = compare_extraction_methods(pdf_path, [10, 15, 20])
+        finally:
+            close_session()
 
         print("\nMethod Comparison (average across 3 pages):")
         method_avgs = {}
@@ -0,0 +1,1058 @@
+"""
+Performance benchmarks for the extraction and cleaning pipeline
+
+Each benchmark is a subcommand, e.g.:
+    python scripts/benchmark.py session --booklet-dir filtered_booklet
+    python scripts/benchmark.py memory --booklet-dir filtered_booklet
+    python scripts/benchmark.py consensus --rows 200 --cols 20 --methods 3
+    python scripts/benchmark.py timeout
+    python scripts/benchmark.py formula --booklet-dir filtered_booklet --fuzz 20000
+    python scripts/benchmark.py prefilter --pdf-dir Data --manifest output/01_extracted/extraction_manifest.json
+    python scripts/benchmark.py batch --booklet-dir filtered_booklet
+    python scripts/benchmark.py ocr --data-dir web-interface/public/data --fuzz 20000 --config config.yaml
+    python scripts/benchmark.py numeric --data-dir web-interface/public/data output/filtered_extracted
+    python scripts/benchmark.py fused --data-dir web-interface/public/data
+    python scripts/benchmark.py phases --data-dir web-interface/public/data output/filtered_extracted --fuzz 20000
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from utils import count_pdf_pages
+
+
+def _summarize(latencies: List[float]) -> Dict:
+    """Mean/median/max of a list of latencies (seconds → ms)"""
+    if not latencies:
+        return {'pages': 0, 'mean_ms': 0.0, 'median_ms': 0.0, 'max_ms': 0.0}
+
+    ordered = sorted(latencies)
+    return {
+        'pages': len(latencies),
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'median_ms': ordered[len(ordered) // 2] * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def benchmark_session(booklet_dir: Path, max_pages: int = 0) -> Dict:
+    """
+    Per-page tabula latency: one Java process per call vs shared JVM session
+
+    Args:
+        booklet_dir: Directory with PDF booklets
+        max_pages: Limit pages per booklet (0 = all)
+
+    Returns:
+        Dict with latency summaries for both modes
+    """
+    from tabula_session import TabulaSession
+
+    pdf_files = sorted(booklet_dir.glob("*.pdf"))
+    pages_by_pdf = {}
+    for pdf_path in pdf_files:
+        page_count = count_pdf_pages(pdf_path)
+        pages_by_pdf[pdf_path] = range(1, (min(page_count, max_pages) if max_pages else page_count) + 1)
+
+    def run(session: TabulaSession) -> List[float]:
+        latencies = []
+        for pdf_path, pages in pages_by_pdf.items():
+            for page in pages:
+                start = time.perf_counter()
+                try:
+                    session.read_pdf(pdf_path, pages=page, multiple_tables=True,
+                                     pandas_options={'header': None})
+                except Exception as e:
+                    print(f"  ✗ {pdf_path.name} page {page}: {e}")
+                latencies.append(time.perf_counter() - start)
+        return latencies
+
+    # The warm session runs first: a subprocess-mode call replaces tabula-py's
+    # module-level backend for the rest of the process.
+    print("Shared JVM session...")
+    with TabulaSession() as session:
+        after = run(session)
+        startup = session.stats['startup_seconds']
+
+    print("One Java process per call...")
+    before = run(TabulaSession(force_subprocess=True))
+
+    return {
+        'booklets': len(pdf_files),
+        'before': _summarize(before),
+        'after': _summarize(after),
+        'jvm_startup_ms': startup * 1000,
+    }
+
+
+def _print_latency_table(results: Dict):
+    print(f"\n{'mode':<10} {'pages':>6} {'mean ms':>10} {'median ms':>10} {'max ms':>10}")
+    for mode in ['before', 'after']:
+        r = results[mode]
+        print(f"{mode:<10} {r['pages']:>6} {r['mean_ms']:>10.1f} {r['median_ms']:>10.1f} {r['max_ms']:>10.1f}")
+
+
+def _extract_and_measure(pdf_path: Path, output_dir: Path, streaming: bool) -> Dict:
+    """Extract one PDF (in a fresh process) and report its peak RSS"""
+    from extract import extract_pdf, extract_tables_from_pdf, save_tables
+    from extraction_cache import ExtractionCache
+    from tabula_session import close_session
+    from utils import parse_pdf_filename
+
+    cache = ExtractionCache(enabled=False)
+    try:
+        if streaming:
+            tables = extract_pdf(pdf_path, output_dir, cache=cache).get('tables', 0)
+        else:
+            # Whole list in memory before the first CSV is written
+            tables = len(save_tables(extract_tables_from_pdf(pdf_path, cache=cache),
+                                     output_dir, parse_pdf_filename(pdf_path)))
+    finally:
+        close_session()
+
+    # ru_maxrss is in kilobytes on Linux
+    return {'tables': tables, 'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def benchmark_memory(booklet_dir: Path) -> Dict:
+    """
+    Peak RSS of extracting each booklet: in-memory list vs streaming
+
+    Every extraction runs in its own process so peaks do not carry over.
+
+    Args:
+        booklet_dir: Directory with PDF booklets (of varying size)
+
+    Returns:
+        Dict with one row per booklet, ordered by page count
+    """
+    pdf_files = sorted(booklet_dir.glob("*.pdf"), key=count_pdf_pages)
+    context = multiprocessing.get_context('spawn')
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pdf_path in pdf_files:
+            row = {'booklet': pdf_path.name, 'pages': count_pdf_pages(pdf_path)}
+            for mode, streaming in [('list', False), ('stream', True)]:
+                output_dir = Path(tmp) / mode
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    measured = executor.submit(_extract_and_measure, pdf_path, output_dir, streaming).result()
+                row['tables'] = measured['tables']
+                row[f'{mode}_peak_mb'] = measured['peak_rss_mb']
+            rows.append(row)
+
+    return {'booklets': rows}
+
+
+def _print_memory_table(results: Dict):
+    print(f"\n{'booklet':<28} {'pages':>6} {'tables':>7} {'list MB':>9} {'stream MB':>10}")
+    for r in results['booklets']:
+        print(f"{r['booklet']:<28} {r['pages']:>6} {r['tables']:>7} "
+              f"{r['list_peak_mb']:>9.1f} {r['stream_peak_mb']:>10.1f}")
+
+
+def _synthetic_extractions(rows: int, cols: int, methods: int, seed: int = 0) -> Dict:
+    """Tables as several methods might extract them: same numbers, some cells dropped or misread"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    truth = rng.uniform(0, 100, size=(rows, cols)).round(3).astype(str).astype(object)
+
+    extractions = {}
+    for m in range(methods):
+        values = truth.copy()
+        values[rng.random((rows, cols)) < 0.05] = None
+        misread = rng.random((rows, cols)) < 0.05
+        values[misread] = [f"{v} (D)" for v in truth[misread]]
+        # Methods disagree on trailing rows/columns now and then
+        extractions[f"method_{m}"] = pd.DataFrame(values).iloc[:rows - m, :cols - (m % 2)]
+    return extractions
+
+
+def _consensus_cell_by_cell(extractor, extractions: Dict):
+    """Reference majority vote: one _most_common_value call per cell"""
+    import pandas as pd
+
+    max_rows = max(df.shape[0] for df in extractions.values())
+    max_cols = max(df.shape[1] for df in extractions.values())
+    consensus = pd.DataFrame(index=range(max_rows), columns=range(max_cols))
+    for i in range(max_rows):
+        for j in range(max_cols):
+            values = [df.iloc[i, j] for df in extractions.values()
+                      if i < df.shape[0] and j < df.shape[1] and pd.notna(df.iloc[i, j])]
+            if values:
+                consensus.iloc[i, j] = extractor._most_common_value(values)
+    return consensus
+
+
+def benchmark_consensus(rows: int = 200, cols: int = 20, methods: int = 3, repeat: int = 5) -> Dict:
+    """
+    Majority-vote consensus: cell-by-cell reference vs the array-backed builder
+
+    Args:
+        rows: Rows per synthetic table
+        cols: Columns per synthetic table
+        methods: Number of extraction methods voting
+        repeat: Timed runs per implementation (best is reported)
+
+    Returns:
+        Dict with best times and whether both consensus tables are identical
+    """
+    from multi_method_extractor import MultiMethodExtractor
+
+    extractor = MultiMethodExtractor()
+    extractions = _synthetic_extractions(rows, cols, methods)
+
+    def best_of(func) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    before = _consensus_cell_by_cell(extractor, extractions)
+    after = extractor._build_consensus(extractions)
+
+    return {
+        'shape': [rows, cols],
+        'methods': methods,
+        'before_ms': best_of(lambda: _consensus_cell_by_cell(extractor, extractions)) * 1000,
+        'after_ms': best_of(lambda: extractor._build_consensus(extractions)) * 1000,
+        'identical': before.equals(after),
+    }
+
+
+def benchmark_method_timeout(seconds: float = 0.5) -> Dict:
+    """
+    Per-method timeouts of MultiMethodExtractor when methods wait for a worker
+
+    Two methods sleep `seconds` each and the timeout is 1.5x that, so every
+    method fits its own budget but not both in a row. Each worker setting
+    must return tables from both; a third method sleeping 3x the budget
+    must time out on its own.
+
+    Args:
+        seconds: How long each slow method takes
+
+    Returns:
+        Dict mapping each case to the methods that returned tables and the elapsed time
+    """
+    import contextlib
+    import io
+
+    import pandas as pd
+
+    from multi_method_extractor import MultiMethodExtractor
+
+    def slow(delay: float):
+        def method(pdf_path, page, area=None):
+            time.sleep(delay)
+            return [pd.DataFrame({'a': [1]})]
+        return method
+
+    cases = {
+        'max_workers=1': ({'first': seconds, 'second': seconds}, 1),
+        'max_workers=2': ({'first': seconds, 'second': seconds}, 2),
+        'max_workers=1, one hung': ({'first': seconds, 'hung': seconds * 4.5, 'last': seconds}, 1),
+    }
+    results = {}
+    for case, (delays, workers) in cases.items():
+        extractor = MultiMethodExtractor(max_workers=workers, method_timeout=seconds * 1.5, use_table_areas=False)
+        extractor.methods = {name: slow(delay) for name, delay in delays.items()}
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            tables = extractor.extract_page_with_all_methods(Path('timeout-check.pdf'), 1)
+        results[case] = {'methods': sorted(tables), 'seconds': time.perf_counter() - start}
+
+    results['ok'] = (results['max_workers=1']['methods'] == ['first', 'second']
+                     and results['max_workers=2']['methods'] == ['first', 'second']
+                     and results['max_workers=1, one hung']['methods'] == ['first'])
+    return results
+
+
+_FUZZ_TOKENS = [
+    'Na', 'K', 'Mg', 'Ca', 'NH4', 'Li', 'H', 'O', 'PO4', 'P2O7', 'HPO4', 'H2PO4', 'Cl',
+    '2', '3', '(', ')', '(NH4)2', 'Na3PO4', 'MgHPO4', 'KH2PO4', 'H2O', 'H 2 O', 'H O',
+    '-', ' - ', '–', '—', ' ', '\n', 'system', ' system', 'x', 'mass %',
+]
+
+
+def _fuzz_text(rng, max_tokens: int = 25) -> str:
+    """Random formula-like text: element symbols, dashes, water and noise"""
+    return ''.join(rng.choice(_FUZZ_TOKENS) for _ in range(rng.randint(1, max_tokens)))
+
+
+def benchmark_formula(booklet_dir: Path, fuzz: int = 0, chain_length: int = 14, repeat: int = 3) -> Dict:
+    """
+    Chemical-system scanning: original single regexes vs the compiled scanner
+
+    Args:
+        booklet_dir: Directory with PDF booklets (page text from the page index)
+        fuzz: Number of random texts to compare results on (0 = skip)
+        chain_length: Formulas in the worst-case chain (one not ending in water)
+        repeat: Timed runs per implementation (best is reported)
+
+    Returns:
+        Dict with timings per scanner and the number of mismatching texts
+    """
+    import random
+
+    from formula_scanner import CHEMICAL_SYSTEM_SCANNER, SYSTEM_SCANNER
+    from page_index import load_page_index
+
+    scanners = {'identify_systems': SYSTEM_SCANNER, 'extract_chemical_systems': CHEMICAL_SYSTEM_SCANNER}
+    texts = [page['text'] for pdf_path in sorted(booklet_dir.glob("*.pdf"))
+             for page in load_page_index(pdf_path)]
+    worst_case = '-'.join(['Na2HPO4'] * chain_length) + ' solution'
+
+    def best_of(func, inputs) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for text in inputs:
+                func(text)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    results = {'pages': len(texts), 'chain_length': chain_length, 'scanners': {}}
+    for name, scanner in scanners.items():
+        mismatches = sum(set(scanner.scan(text)) != set(scanner.scan_with_regex(text)) for text in texts)
+
+        rng = random.Random(0)
+        for _ in range(fuzz):
+            text = _fuzz_text(rng)
+            if set(scanner.scan(text)) != set(scanner.scan_with_regex(text)):
+                mismatches += 1
+                print(f"  ✗ {name} differs on {text!r}")
+
+        results['scanners'][name] = {
+            'pages_regex_ms': best_of(scanner.scan_with_regex, texts) * 1000,
+            'pages_scanner_ms': best_of(scanner.scan, texts) * 1000,
+            'worst_case_regex_ms': best_of(scanner.scan_with_regex, [worst_case]) * 1000,
+            'worst_case_scanner_ms': best_of(scanner.scan, [worst_case]) * 1000,
+            'fuzz_texts': fuzz,
+            'mismatches': mismatches,
+        }
+    return results
+
+
+def _print_formula_table(results: Dict):
+    print(f"\n{results['pages']} pages, worst case: {results['chain_length']}-formula chain without water")
+    print(f"\n{'scanner':<26} {'pages regex':>12} {'scanner':>9} {'worst regex':>12} {'scanner':>9} {'mismatches':>11}")
+    for name, r in results['scanners'].items():
+        print(f"{name:<26} {r['pages_regex_ms']:>9.1f} ms {r['pages_scanner_ms']:>6.1f} ms "
+              f"{r['worst_case_regex_ms']:>9.1f} ms {r['worst_case_scanner_ms']:>6.1f} ms {r['mismatches']:>11}")
+
+
+def benchmark_prefilter(pdf_dir: Path, manifest_path: Path, thresholds: List[float]) -> Dict:
+    """
+    Table-presence prefilter against an extraction manifest
+
+    The manifest must come from a run without the prefilter, so every page
+    went through tabula; the per-PDF extraction times saved next to it
+    (extraction_timings.json) and its per-table page numbers give the time
+    saved and the tables missed at each threshold.
+
+    Args:
+        pdf_dir: Directory with the PDFs listed in the manifest
+        manifest_path: extraction_manifest.json of an unfiltered run
+        thresholds: Prefilter thresholds to evaluate
+
+    Returns:
+        Dict with one row per threshold
+    """
+    from extract import TIMINGS_FILE
+    from table_prefilter import score_pages
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    timings_path = manifest_path.parent / TIMINGS_FILE
+    timings = {}
+    if timings_path.exists():
+        with open(timings_path) as f:
+            timings = json.load(f)
+
+    pdfs = []
+    for result in manifest['results']:
+        if not result['success']:
+            continue
+        if result.get('pages_skipped'):
+            print(f"  ✗ {result['pdf']} was extracted with the prefilter on; skipping it")
+            continue
+        if result['pdf'] not in timings or any('page' not in t for t in result['table_info']):
+            print(f"  ✗ {result['pdf']} has no page numbers or timings; re-run extract.py without --prefilter")
+            continue
+        pdf_path = pdf_dir / result['pdf']
+        start = time.perf_counter()
+        scores = score_pages(pdf_path)
+        pdfs.append({
+            'scores': scores,
+            'scan_seconds': time.perf_counter() - start,
+            'tabula_seconds_per_page': timings[result['pdf']] / max(1, result['pages']),
+            'table_pages': [t['page'] for t in result['table_info']],
+        })
+
+    total_tables = sum(len(pdf['table_pages']) for pdf in pdfs)
+    rows = []
+    for threshold in thresholds:
+        skipped_pages = 0
+        missed = 0
+        saved = 0.0
+        for pdf in pdfs:
+            skipped = {page for page, features in pdf['scores'].items() if features['score'] < threshold}
+            skipped_pages += len(skipped)
+            missed += sum(page in skipped for page in pdf['table_pages'])
+            saved += len(skipped) * pdf['tabula_seconds_per_page']
+        rows.append({
+            'threshold': threshold,
+            'pages_skipped': skipped_pages,
+            'tables_missed': missed,
+            'recall': 1 - missed / total_tables if total_tables else 1.0,
+            'tabula_seconds_saved': saved,
+        })
+
+    return {
+        'pdfs': len(pdfs),
+        'pages': sum(len(pdf['scores']) for pdf in pdfs),
+        'tables': total_tables,
+        'tabula_seconds': sum(pdf['tabula_seconds_per_page'] * len(pdf['scores']) for pdf in pdfs),
+        'prefilter_seconds': sum(pdf['scan_seconds'] for pdf in pdfs),
+        'thresholds': rows,
+    }
+
+
+def _print_prefilter_table(results: Dict):
+    print(f"\n{results['pdfs']} PDFs, {results['pages']} pages, {results['tables']} tables")
+    print(f"Tabula: {results['tabula_seconds']:.1f} s, prefilter scan: {results['prefilter_seconds']:.1f} s")
+    print(f"\n{'threshold':>9} {'skipped':>8} {'missed':>7} {'recall':>7} {'saved s':>8}")
+    for r in results['thresholds']:
+        print(f"{r['threshold']:>9.2f} {r['pages_skipped']:>8} {r['tables_missed']:>7} "
+              f"{r['recall']:>7.1%} {r['tabula_seconds_saved']:>8.1f}")
+
+
+def _same_tables(dir_a: Path, dir_b: Path) -> bool:
+    """Whether two extraction directories hold the same tables (as pandas reads them back)"""
+    import pandas as pd
+
+    files_a = sorted(p.name for p in dir_a.glob("*.csv"))
+    if files_a != sorted(p.name for p in dir_b.glob("*.csv")):
+        return False
+    for name in files_a:
+        a = pd.read_csv(dir_a / name, dtype=str, keep_default_na=False)
+        b = pd.read_csv(dir_b / name, dtype=str, keep_default_na=False)
+        if list(a.columns) != list(b.columns) or a.shape != b.shape:
+            return False
+        # Per-booklet path writes pandas-converted numbers ("1.5" for "1.50")
+        a = a.apply(pd.to_numeric, errors='coerce').fillna(a)
+        b = b.apply(pd.to_numeric, errors='coerce').fillna(b)
+        if not (a.astype(str).values == b.astype(str).values).all():
+            return False
+    return True
+
+
+def benchmark_batch(booklet_dir: Path) -> Dict:
+    """
+    Filtered-booklet extraction: read_pdf per booklet vs one batch JSON conversion
+
+    Args:
+        booklet_dir: Directory with SDS-*_filtered.pdf booklets
+
+    Returns:
+        Dict with wall time and table counts per mode, and whether both
+        produced the same tables
+    """
+    from extract_filtered_booklets import extract_from_filtered_booklets
+    from tabula_session import get_session
+
+    # Boot the JVM up front so neither mode pays for it
+    get_session()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, batch in [('per_booklet', False), ('batch', True)]:
+            start = time.perf_counter()
+            report = extract_from_filtered_booklets(booklet_dir, Path(tmp) / mode, batch=batch)
+            results[mode] = {
+                'seconds': time.perf_counter() - start,
+                'booklets': report['booklets_processed'],
+                'tables': report['total_tables'],
+            }
+        results['identical'] = _same_tables(Path(tmp) / 'per_booklet', Path(tmp) / 'batch')
+
+    return results
+
+
+def _print_batch_table(results: Dict):
+    print(f"\n{'mode':<12} {'booklets':>9} {'tables':>7} {'seconds':>8}")
+    for mode in ['per_booklet', 'batch']:
+        r = results[mode]
+        print(f"{mode:<12} {r['booklets']:>9} {r['tables']:>7} {r['seconds']:>8.2f}")
+    print(f"\nSame tables: {'✓' if results['identical'] else '✗'}")
+
+
+_OCR_FUZZ_TOKENS = [
+    '0', '1', '2', '5', '9', '.', ',', ' ', '  ', '\t', '(', ')', '[', ']', '-', '--', '%',
+    'D', 'B', 'A.', 'x', 's', 'o', 'so', 's o', 'mo1', 'Q', 'a', 'I', 'II', 'g', 'H2O',
+    '0.026', '12,5', '0. so', '. so', 'Q .', 'a .', 'I I', 'nan', '\u00a0', 'é', '٣',
+]
+
+
+def _fuzz_cell(rng, max_tokens: int = 8):
+    """Random OCR-like cell: digits, separators, markers, broken letters; sometimes missing"""
+    if rng.random() < 0.05:
+        return rng.choice([None, float('nan')])
+    if rng.random() < 0.05:
+        return rng.choice([0, 1.5, True, -2])
+    return ''.join(rng.choice(_OCR_FUZZ_TOKENS) for _ in range(rng.randint(1, max_tokens)))
+
+
+def _same_cells(a, b) -> bool:
+    """Cell-by-cell equality, treating None and NaN as different values"""
+    import pandas as pd
+
+    if list(a.columns) != list(b.columns) or list(a.dtypes) != list(b.dtypes):
+        return False
+    for x, y in zip(a.to_numpy(dtype=object).ravel(), b.to_numpy(dtype=object).ravel()):
+        if type(x) is not type(y) or (x != y and not (pd.isna(x) and pd.isna(y))):
+            return False
+    return True
+
+
+def benchmark_ocr(data_dir: Path, fuzz: int = 0, config_path: Path = None, repeat: int = 3) -> Dict:
+    """
+    OCR cleaning: advanced_clean mapped per cell vs the table-wise engine
+
+    Args:
+        data_dir: Directory with table CSVs
+        fuzz: Number of random cells to compare results on (0 = skip)
+        config_path: Compile the engine from this config's cleaning section
+            (default: built-in settings; results only match advanced_clean
+            if the config keeps its fixes)
+        repeat: Timed runs per implementation (best is reported)
+
+    Returns:
+        Dict with timings, throughput and the number of mismatches
+    """
+    import random
+
+    import pandas as pd
+
+    from ocr_cleaner import OcrCleaner, load_cleaning_config
+    from utils import advanced_clean
+    from value_cache import clear_caches
+
+    cleaner = OcrCleaner.from_config(load_cleaning_config(config_path) if config_path else None)
+
+    # The original, unmemoized per-cell function
+    advanced_clean = advanced_clean.__wrapped__
+
+    def per_cell(df):
+        df = df.copy()
+        for col in df.columns:
+            if df[col].dtype == 'object':
+                df[col] = df[col].map(advanced_clean)
+        return df
+
+    tables = [pd.read_csv(csv_path) for csv_path in sorted(data_dir.glob("*.csv"))]
+    cells = sum(int(df.size) for df in tables)
+
+    def best_of(func) -> float:
+        times = []
+        for _ in range(repeat):
+            clear_caches()   # each run starts cold, memoization only helps within it
+            start = time.perf_counter()
+            for df in tables:
+                func(df)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    mismatches = sum(not _same_cells(per_cell(df), cleaner.clean_frame(df)) for df in tables)
+
+    rng = random.Random(0)
+    batch = 1000
+    for offset in range(0, fuzz, batch):
+        values = pd.Series([_fuzz_cell(rng) for _ in range(min(batch, fuzz - offset))], dtype=object)
+        expected = values.map(advanced_clean)
+        actual = cleaner.clean_series(values)
+        for value, x, y in zip(values, expected, actual):
+            if x != y and not (x is None and y is None):
+                mismatches += 1
+                print(f"  ✗ differs on {value!r}: {x!r} vs {y!r}")
+
+    per_cell_s = best_of(per_cell)
+    engine_s = best_of(cleaner.clean_frame)
+    return {
+        'tables': len(tables),
+        'cells': cells,
+        'per_cell_ms': per_cell_s * 1000,
+        'engine_ms': engine_s * 1000,
+        'per_cell_cells_per_s': cells / per_cell_s if per_cell_s else 0.0,
+        'engine_cells_per_s': cells / engine_s if engine_s else 0.0,
+        'fuzz_cells': fuzz,
+        'mismatches': mismatches,
+    }
+
+
+def _count_numeric_per_cell(df) -> int:
+    """The original count_numeric_values: a regex search on str(value) per cell"""
+    import re
+
+    import pandas as pd
+
+    count = 0
+    for val in df.values.flatten():
+        if pd.notna(val) and re.search(r'\d+\.?\d*', str(val)):
+            count += 1
+    return count
+
+
+def _same_numeric_profile(profile, df) -> bool:
+    """The profile's ratios and parsed floats equal a per-cell pass over df"""
+    import re
+
+    import numpy as np
+    import pandas as pd
+
+    values = np.full(df.shape, np.nan)
+    ratios = []
+    for j in range(df.shape[1]):
+        present = numeric = 0
+        for i, val in enumerate(df.iloc[:, j]):
+            if pd.isna(val):
+                continue
+            present += 1
+            if re.search(r'\d', str(val)):
+                numeric += 1
+                try:
+                    values[i, j] = float(str(val))
+                except ValueError:
+                    pass
+        ratios.append(numeric / present if present else 0.0)
+    column_ratios = profile.column_ratios
+    return (list(column_ratios.index) == list(df.columns) and list(column_ratios) == ratios
+            and np.array_equal(profile.values, values, equal_nan=True))
+
+
+def benchmark_numeric(data_dirs: List[Path], repeat: int = 3) -> Dict:
+    """
+    Numeric-cell counting: per-cell regex vs NumericProfile
+
+    Times the cleaning stage's use: a count before and after OCR cleaning,
+    i.e. two per-cell passes vs one profile refreshed for the text columns.
+    The per-column ratios and parsed floats are checked against a per-cell
+    pass as well.
+
+    Args:
+        data_dirs: Directories with table CSVs
+        repeat: Timed runs per implementation (best is reported)
+
+    Returns:
+        Dict with timings and the number of tables whose counts differ
+    """
+    import pandas as pd
+
+    from numeric_profile import NumericProfile
+    from ocr_cleaner import DEFAULT_CLEANER
+    from value_cache import clear_caches
+
+    tables = [pd.read_csv(csv_path) for data_dir in data_dirs for csv_path in sorted(data_dir.glob("*.csv"))]
+    pairs = [(df, DEFAULT_CLEANER.clean_frame(df)) for df in tables]
+
+    mismatches = 0
+    for raw, cleaned in pairs:
+        profile = NumericProfile.from_frame(raw)
+        refreshed = profile.refresh(cleaned)
+        if (profile.numeric_count != _count_numeric_per_cell(raw)
+                or refreshed.numeric_count != _count_numeric_per_cell(cleaned)
+                or not _same_numeric_profile(profile, raw)
+                or not _same_numeric_profile(refreshed, cleaned)):
+            mismatches += 1
+
+    def per_cell():
+        for raw, cleaned in pairs:
+            _count_numeric_per_cell(raw), _count_numeric_per_cell(cleaned)
+
+    def profiled():
+        for raw, cleaned in pairs:
+            NumericProfile.from_frame(raw).refresh(cleaned).numeric_count
+
+    def best_of(func) -> float:
+        times = []
+        for _ in range(repeat):
+            clear_caches()
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    return {
+        'tables': len(tables),
+        'cells': sum(int(df.size) for df in tables),
+        'per_cell_ms': best_of(per_cell) * 1000,
+        'profile_ms': best_of(profiled) * 1000,
+        'mismatches': mismatches,
+    }
+
+
+def benchmark_fused(data_dir: Path, repeat: int = 3) -> Dict:
+    """
+    Staged scripts (a CSV per table between steps) vs the fused table pipeline
+
+    Staged: enhanced_clean_all, improve_headers_batch, validate_all_tables,
+    run as their main()s do. Fused: fused_clean_all with the same defaults.
+    Every table the fused pipeline re-types with as_read_back (the enhanced
+    and the header-improved table), and a table of long decimals, is also
+    compared with a real in-memory CSV round trip.
+
+    Args:
+        data_dir: Directory with extracted table CSVs
+        repeat: Timed runs per mode (best is reported)
+
+    Returns:
+        Dict with timings, whether the final tables and both reports are
+        identical, and the number of tables as_read_back re-types differently
+        from read_csv
+    """
+    import contextlib
+    import filecmp
+    import io
+    import random
+
+    import pandas as pd
+
+    from enhanced_clean import enhanced_clean_all
+    from header_detector import improve_headers_batch
+    from quality_validator import validate_all_tables
+    from table_pipeline import as_read_back, fuse_table, fused_clean_all
+    from value_cache import clear_caches
+
+    def read_back_differs(df) -> bool:
+        expected = pd.read_csv(io.StringIO(df.to_csv(index=False)))
+        try:
+            pd.testing.assert_frame_equal(as_read_back(df), expected)
+        except AssertionError:
+            return True
+        return False
+
+    # Long decimals, which read_csv does not always parse to the nearest
+    # double: as text, and as the floats read_csv made of them
+    rng = random.Random(0)
+    decimals = pd.DataFrame({'text': [f"{rng.randint(0, 999)}.{rng.randint(0, 10**18):018d}" for _ in range(10000)],
+                             'label': 'x'})
+    mismatches = read_back_differs(decimals) + read_back_differs(as_read_back(decimals))
+
+    for csv_path in sorted(data_dir.glob("*.csv")):
+        stages = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            improved_df, _, _, _ = fuse_table(csv_path, stages=stages)
+        mismatches += read_back_differs(stages['enhanced']) + read_back_differs(improved_df)
+
+    def staged(out: Path):
+        enhanced_clean_all(data_dir, out / 'enhanced')
+        improve_headers_batch(out / 'enhanced', out / 'final', out / 'enhanced')
+        validate_all_tables(out / 'final', out / 'enhanced', out / 'validation_report.json')
+
+    def fused(out: Path):
+        fused_clean_all(data_dir, out / 'final', validation_file=out / 'validation_report.json')
+
+    def best_of(func, out: Path) -> float:
+        times = []
+        for _ in range(repeat):
+            clear_caches()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                func(out)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def same_json(a: Path, b: Path) -> bool:
+        with open(a) as fa, open(b) as fb:
+            return json.load(fa) == json.load(fb)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        staged_dir, fused_dir = Path(tmp) / 'staged', Path(tmp) / 'fused'
+        staged_s = best_of(staged, staged_dir)
+        fused_s = best_of(fused, fused_dir)
+
+        names = sorted(p.name for p in (staged_dir / 'final').glob("*.csv"))
+        identical = (
+            names == sorted(p.name for p in (fused_dir / 'final').glob("*.csv"))
+            and all(filecmp.cmp(staged_dir / 'final' / name, fused_dir / 'final' / name, shallow=False)
+                    for name in names)
+            and same_json(staged_dir / 'final' / '_header_improvement_report.json',
+                          fused_dir / 'final' / '_header_improvement_report.json')
+            and same_json(staged_dir / 'validation_report.json', fused_dir / 'validation_report.json')
+        )
+
+    return {
+        'tables': len(names),
+        'staged_seconds': staged_s,
+        'fused_seconds': fused_s,
+        'identical': identical,
+        'read_back_mismatches': mismatches,
+    }
+
+
+_PHASE_FUZZ_TOKENS = ['0', '1', '2', '5', '.', '.5', ' ', '  ', '\t', '-', '---', '(', ')', 'A', 'B', 'D', 'F', 'G',
+                      'I', 'II', 'V', 'IV', 'VI', '+', '+B', '(A)', '(A+B)', '(D0.5)', ' A', ' II', ' C+D', 'x', '\n']
+
+
+def _fuzz_phase_cell(rng, max_tokens: int = 6):
+    """Random cell made of numbers, separators and phase-label pieces; sometimes missing"""
+    if rng.random() < 0.05:
+        return rng.choice([None, float('nan')])
+    if rng.random() < 0.05:
+        return rng.choice([0, 1.5, True, -2])
+    return ''.join(rng.choice(_PHASE_FUZZ_TOKENS) for _ in range(rng.randint(1, max_tokens)))
+
+
+def benchmark_phases(data_dirs: List[Path], fuzz: int = 0, repeat: int = 3) -> Dict:
+    """
+    Phase extraction: extract_phase applied per cell vs the single-pattern split
+
+    Compares process_dataframe and get_unique_phases with a PhaseProfile on
+    the OCR-cleaned tables (as enhanced cleaning runs it, and on every
+    column with numeric_only=False), and on random cells.
+
+    Args:
+        data_dirs: Directories with table CSVs
+        fuzz: Number of random cells to compare results on (0 = skip)
+        repeat: Timed runs per implementation (best is reported)
+
+    Returns:
+        Dict with timings, throughput and the number of mismatches
+    """
+    import random
+    import re
+
+    import numpy as np
+    import pandas as pd
+
+    from ocr_cleaner import DEFAULT_CLEANER
+    from phase_extractor import PhaseExtractor
+    from value_cache import clear_caches
+
+    # The original, unmemoized per-cell function
+    extract_phase = PhaseExtractor.extract_phase.__wrapped__
+
+    class PerCellExtractor(PhaseExtractor):
+        """The original extraction: extract_phase applied column by column"""
+
+        def extract_from_series(self, series):
+            results = series.apply(lambda value: extract_phase(self, value))
+            return results.apply(lambda x: x[0]), results.apply(lambda x: x[1])
+
+        def process_dataframe(self, df, numeric_only=True):
+            df_processed = df.copy()
+            for col in df.columns:
+                if 'phase' in str(col).lower():
+                    continue
+                if numeric_only:
+                    sample = df[col].dropna().head(10)
+                    if len(sample) == 0 or not any(re.search(self.combined_pattern, str(v)) for v in sample):
+                        continue
+                cleaned_values, phases = self.extract_from_series(df[col])
+                df_processed[col] = cleaned_values
+                if phases.notna().any():
+                    df_processed[f"{col}_phase"] = phases
+            return df_processed
+
+    per_cell, split = PerCellExtractor(), PhaseExtractor()
+    tables = [DEFAULT_CLEANER.clean_frame(pd.read_csv(csv_path))
+              for data_dir in data_dirs for csv_path in sorted(data_dir.glob("*.csv"))]
+
+    def differs(df, numeric_only) -> bool:
+        """process_dataframe + get_unique_phases vs one profile"""
+        expected = per_cell.process_dataframe(df, numeric_only)
+        profile = split.profile(df, numeric_only)
+        return (not _same_cells(expected, profile.apply(df))
+                or per_cell.get_unique_phases(expected) != profile.unique_phases)
+
+    mismatches = sum(differs(df, numeric_only) for df in tables for numeric_only in (True, False))
+
+    rng = random.Random(0)
+    batch = 1000
+    for offset in range(0, fuzz, batch):
+        values = pd.Series([_fuzz_phase_cell(rng) for _ in range(min(batch, fuzz - offset))], dtype=object)
+        expected = zip(*per_cell.extract_from_series(values))
+        actual = zip(*split.extract_from_series(values))
+        for value, x, y in zip(values, expected, actual):
+            if x != y:
+                mismatches += 1
+                print(f"  ✗ differs on {value!r}: {x!r} vs {y!r}")
+
+        # Column selection: the same cells, mostly diluted with plain numbers, as 10-row columns
+        if len(values) % 10 == 0:
+            cells = [value if rng.random() < 0.1 else rng.choice(['1.5', '0.25', '-']) for value in values]
+            df = pd.DataFrame(np.array(cells, dtype=object).reshape(10, -1, order='F'))
+            df.columns = [f"c{n}" for n in range(df.shape[1])]
+            if differs(df, True):
+                mismatches += 1
+                print(f"  ✗ columns selected differently in random batch at {offset}")
+
+    def per_cell_pass(df):
+        per_cell.get_unique_phases(per_cell.process_dataframe(df, numeric_only=False))
+
+    def profile_pass(df):
+        profile = split.profile(df, numeric_only=False)
+        profile.apply(df), profile.unique_phases
+
+    def best_of(func) -> float:
+        times = []
+        for _ in range(repeat):
+            clear_caches()
+            start = time.perf_counter()
+            for df in tables:
+                func(df)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    cells = sum(int(df.size) for df in tables)
+    per_cell_s = best_of(per_cell_pass)
+    split_s = best_of(profile_pass)
+    return {
+        'tables': len(tables),
+        'cells': cells,
+        'per_cell_ms': per_cell_s * 1000,
+        'split_ms': split_s * 1000,
+        'per_cell_cells_per_s': cells / per_cell_s if per_cell_s else 0.0,
+        'split_cells_per_s': cells / split_s if split_s else 0.0,
+        'fuzz_cells': fuzz,
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    """Command-line interface"""
+    parser = argparse.ArgumentParser(description='Pipeline performance benchmarks')
+    parser.add_argument('--output', type=Path, help='Save results as JSON')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    session_parser = subparsers.add_parser('session', help='Per-page latency with and without a shared JVM')
+    session_parser.add_argument('--booklet-dir', type=Path, default=Path('filtered_booklet'))
+    session_parser.add_argument('--max-pages', type=int, default=0,
+                                help='Limit pages per booklet (default: all)')
+
+    memory_parser = subparsers.add_parser('memory', help='Peak RSS per booklet: in-memory list vs streaming')
+    memory_parser.add_argument('--booklet-dir', type=Path, default=Path('filtered_booklet'))
+
+    consensus_parser = subparsers.add_parser('consensus', help='Majority-vote consensus on synthetic tables')
+    consensus_parser.add_argument('--rows', type=int, default=200)
+    consensus_parser.add_argument('--cols', type=int, default=20)
+    consensus_parser.add_argument('--methods', type=int, default=3)
+
+    subparsers.add_parser('timeout', help='Per-method timeouts when methods queue for a worker')
+
+    formula_parser = subparsers.add_parser('formula', help='Chemical-system scanning: regexes vs compiled scanner')
+    formula_parser.add_argument('--booklet-dir', type=Path, default=Path('filtered_booklet'))
+    formula_parser.add_argument('--fuzz', type=int, default=0,
+                                help='Also compare results on this many random texts')
+    formula_parser.add_argument('--chain-length', type=int, default=14,
+                                help='Formulas in the worst-case chain (regex time grows exponentially)')
+
+    prefilter_parser = subparsers.add_parser('prefilter', help='Pages skipped, time saved and tables missed by the prefilter')
+    prefilter_parser.add_argument('--pdf-dir', type=Path, default=Path('Data'))
+    prefilter_parser.add_argument('--manifest', type=Path, default=Path('output/01_extracted/extraction_manifest.json'),
+                                  help='Manifest of an extraction run without --prefilter')
+    prefilter_parser.add_argument('--thresholds', type=lambda v: [float(t) for t in v.split(',')],
+                                  default=[0.1, 0.2, 0.3, 0.4])
+
+    batch_parser = subparsers.add_parser('batch', help='Filtered booklets: read_pdf per booklet vs one batch conversion')
+    batch_parser.add_argument('--booklet-dir', type=Path, default=Path('filtered_booklet'))
+
+    ocr_parser = subparsers.add_parser('ocr', help='OCR cleaning: advanced_clean per cell vs table-wise engine')
+    ocr_parser.add_argument('--data-dir', type=Path, default=Path('web-interface/public/data'))
+    ocr_parser.add_argument('--fuzz', type=int, default=0,
+                            help='Also compare results on this many random cells')
+    ocr_parser.add_argument('--config', type=Path,
+                            help='Compile the engine from the cleaning section of this config (e.g. config.yaml)')
+
+    numeric_parser = subparsers.add_parser('numeric', help='Numeric-cell counting: per-cell regex vs numeric profile')
+    numeric_parser.add_argument('--data-dir', type=Path, nargs='+', default=[Path('web-interface/public/data')])
+
+    fused_parser = subparsers.add_parser('fused', help='Clean, headers, validation: staged CSVs vs fused in-memory pipeline')
+    fused_parser.add_argument('--data-dir', type=Path, default=Path('web-interface/public/data'))
+
+    phases_parser = subparsers.add_parser('phases', help='Phase extraction: extract_phase per cell vs single-pattern profile')
+    phases_parser.add_argument('--data-dir', type=Path, nargs='+', default=[Path('web-interface/public/data')])
+    phases_parser.add_argument('--fuzz', type=int, default=0, help='Also compare on N random cells')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'session':
+        results = benchmark_session(args.booklet_dir, args.max_pages)
+        _print_latency_table(results)
+        print(f"\nJVM startup (paid once): {results['jvm_startup_ms']:.0f} ms")
+    elif args.benchmark == 'memory':
+        results = benchmark_memory(args.booklet_dir)
+        _print_memory_table(results)
+    elif args.benchmark == 'consensus':
+        results = benchmark_consensus(args.rows, args.cols, args.methods)
+        print(f"\n{args.methods} methods, {args.rows}x{args.cols} tables")
+        print(f"  cell-by-cell: {results['before_ms']:>8.1f} ms")
+        print(f"  array-backed: {results['after_ms']:>8.1f} ms")
+        print(f"  identical:    {'✓' if results['identical'] else '✗'}")
+    elif args.benchmark == 'timeout':
+        results = benchmark_method_timeout()
+        for case, r in results.items():
+            if case != 'ok':
+                print(f"  {case:<24} tables from {', '.join(r['methods']) or 'none'} in {r['seconds']:.2f} s")
+        print(f"  per-method timeouts: {'✓' if results['ok'] else '✗'}")
+    elif args.benchmark == 'formula':
+        results = benchmark_formula(args.booklet_dir, args.fuzz, args.chain_length)
+        _print_formula_table(results)
+    elif args.benchmark == 'prefilter':
+        results = benchmark_prefilter(args.pdf_dir, args.manifest, args.thresholds)
+        _print_prefilter_table(results)
+    elif args.benchmark == 'batch':
+        try:
+            results = benchmark_batch(args.booklet_dir)
+        finally:
+            from tabula_session import close_session
+            close_session()
+        _print_batch_table(results)
+    elif args.benchmark == 'ocr':
+        results = benchmark_ocr(args.data_dir, args.fuzz, args.config)
+        print(f"\n{results['tables']} tables, {results['cells']:,} cells, {results['fuzz_cells']:,} random cells")
+        print(f"  per cell:   {results['per_cell_ms']:>8.1f} ms ({results['per_cell_cells_per_s']:>10,.0f} cells/s)")
+        print(f"  table-wise: {results['engine_ms']:>8.1f} ms ({results['engine_cells_per_s']:>10,.0f} cells/s)")
+        print(f"  mismatches: {results['mismatches']}")
+    elif args.benchmark == 'numeric':
+        results = benchmark_numeric(args.data_dir)
+        print(f"\n{results['tables']} tables, {results['cells']:,} cells (counted before and after cleaning)")
+        print(f"  per-cell regex:  {results['per_cell_ms']:>8.1f} ms")
+        print(f"  numeric profile: {results['profile_ms']:>8.1f} ms")
+        print(f"  tables with different profiles: {results['mismatches']}")
+    elif args.benchmark == 'fused':
+        results = benchmark_fused(args.data_dir)
+        print(f"\n{results['tables']} tables: enhanced cleaning, header detection, validation")
+        print(f"  staged (CSV between steps): {results['staged_seconds']:>6.2f} s")
+        print(f"  fused (in memory):          {results['fused_seconds']:>6.2f} s")
+        print(f"  identical outputs: {'✓' if results['identical'] else '✗'}")
+        print(f"  read-back mismatches: {results['read_back_mismatches']}")
+    elif args.benchmark == 'phases':
+        results = benchmark_phases(args.data_dir, args.fuzz)
+        print(f"\n{results['tables']} cleaned tables, {results['cells']:,} cells (all columns), "
+              f"{results['fuzz_cells']:,} random cells")
+        print(f"  per cell:       {results['per_cell_ms']:>8.1f} ms ({results['per_cell_cells_per_s']:>10,.0f} cells/s)")
+        print(f"  phase profile:  {results['split_ms']:>8.1f} ms ({results['split_cells_per_s']:>10,.0f} cells/s)")
+        print(f"  mismatches: {results['mismatches']}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,16 +8,23 @@ import pandas as pd
 from pathlib import Path
 import argparse
 import json
-from typing import Dict, List
-from utils import advanced_clean, ensure_directory, count_numeric_values
+from contextlib import closing
+from typing import Dict, List, Optional
+from utils import ensure_directory, file_hash
+from numeric_profile import NumericProfile
+from ocr_cleaner import OcrCleaner, DEFAULT_CLEANER, load_cleaning_config
+from fingerprint import FingerprintManifest, config_hash, code_version
+from table_pool import TablePool
+from value_cache import reset_cache_stats
 
 
-def clean_table(csv_path: Path) -> tuple[pd.DataFrame, Dict]:
+def clean_table(csv_path: Path, cleaner: Optional[OcrCleaner] = None) -> tuple[pd.DataFrame, Dict]:
     """
     Clean a single table by applying OCR artifact fixes
 
     Args:
         csv_path: Path to CSV file
+        cleaner: Compiled cleaning settings (default: built-in settings)
 
     Returns:
         Tuple of (cleaned DataFrame, metadata dict)
@@ -25,15 +32,14 @@ def clean_table(csv_path: Path) -> tuple[pd.DataFrame, Dict]:
     df = pd.read_csv(csv_path)
 
     # Count before cleaning
-    original_numeric = count_numeric_values(df)
+    profile = NumericProfile.from_frame(df)
+    original_numeric = profile.numeric_count
 
-    # Apply cleaning to all columns
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].map(advanced_clean)
+    # Apply cleaning to all text columns
+    df = (cleaner or DEFAULT_CLEANER).clean_frame(df)
 
-    # Count after cleaning
-    cleaned_numeric = count_numeric_values(df)
+    # Count after cleaning (only the text columns can have changed)
+    cleaned_numeric = profile.refresh(df).numeric_count
 
     metadata = {
         'file': csv_path.name,
@@ -46,13 +52,38 @@ def clean_table(csv_path: Path) -> tuple[pd.DataFrame, Dict]:
     return df, metadata
 
 
-def clean_all_tables(input_dir: Path, output_dir: Path) -> Dict:
+def clean_and_save(csv_path: Path, output_dir: Path, cleaner: Optional[OcrCleaner] = None) -> Dict:
+    """
+    Clean a table and save it under output_dir (one task of clean_all_tables)
+
+    Returns:
+        Metadata dict of the table
+    """
+    df_clean, metadata = clean_table(csv_path, cleaner)
+    df_clean.to_csv(output_dir / csv_path.name, index=False)
+    return metadata
+
+
+def clean_all_tables(
+    input_dir: Path,
+    output_dir: Path,
+    incremental: bool = False,
+    cleaning: Optional[Dict] = None,
+    workers: int = 1
+) -> Dict:
     """
     Clean all tables in input directory
 
     Args:
         input_dir: Directory with raw extracted CSVs
         output_dir: Directory to save cleaned CSVs
+        incremental: Only re-clean tables whose input changed and delete
+            cleaned tables whose source disappeared
+        cleaning: `cleaning` section of config.yaml (OCR fixes and number
+            fixes; default: built-in settings)
+        workers: Number of worker processes (1 = serial); results and
+            progress output are the same as in a serial run, apart from
+            the value_cache statistics
 
     Returns:
         Summary dict with cleaning results
@@ -72,17 +103,41 @@ def clean_all_tables(input_dir: Path, output_dir: Path) -> Dict:
     print(f"CLEANING {len(csv_files)} TABLES")
     print("="*80)
 
+    # Compiled once for all tables
+    cleaner = OcrCleaner.from_config(cleaning)
+    reset_cache_stats()
+
+    fingerprints = FingerprintManifest.load(
+        output_dir, config_hash(cleaner.settings),
+        code_version('clean', 'utils', 'ocr_cleaner', 'distinct_values', 'value_cache', 'numeric_profile')
+    )
+    inputs = {}
+    reused = {}
+    for csv_path in csv_files:
+        inputs[csv_path] = {'table': file_hash(csv_path)}
+        if incremental and fingerprints.is_current(csv_path.name, inputs[csv_path]):
+            reused[csv_path] = fingerprints.reuse(csv_path.name)
+
+    # Cleaned in order, in worker processes if workers > 1
+    pending = [csv_path for csv_path in csv_files if csv_path not in reused]
+    pool = TablePool(workers)
+    if workers > 1 and pending:
+        print(f"Using {workers} worker processes")
+
     results = []
     total_numeric_before = 0
     total_numeric_after = 0
 
-    for csv_path in csv_files:
-        try:
-            df_clean, metadata = clean_table(csv_path)
-
-            # Save cleaned table
-            output_path = output_dir / csv_path.name
-            df_clean.to_csv(output_path, index=False)
+    with closing(pool.map(clean_and_save, pending, output_dir, cleaner)) as cleaned:
+        for csv_path in csv_files:
+            if csv_path in reused:
+                metadata = reused[csv_path]
+            else:
+                metadata, error = next(cleaned)
+                if error is not None:
+                    print(f"  ✗ Error cleaning {csv_path.name}: {error}")
+                    continue
+                fingerprints.record(csv_path.name, inputs[csv_path], [output_dir / csv_path.name], metadata)
 
             results.append(metadata)
             total_numeric_before += metadata['original_numeric']
@@ -91,8 +146,11 @@ def clean_all_tables(input_dir: Path, output_dir: Path) -> Dict:
             if (len(results)) % 50 == 0:
                 print(f"  Processed {len(results)}/{len(csv_files)} files...")
 
-        except Exception as e:
-            print(f"  ✗ Error cleaning {csv_path.name}: {e}")
+    if incremental:
+        print(f"Incremental: {len(reused)} unchanged tables reused")
+        for removed in fingerprints.prune():
+            print(f"  ✗ Removed stale output {removed}")
+    fingerprints.save()
 
     # Summary
     print("\n" + "="*80)
@@ -102,6 +160,9 @@ def clean_all_tables(input_dir: Path, output_dir: Path) -> Dict:
     print(f"Numeric values before: {total_numeric_before:,}")
     print(f"Numeric values after: {total_numeric_after:,}")
     print(f"Improvement: {total_numeric_after - total_numeric_before:+,} values")
+    memo_stats = pool.cache_stats()
+    for name, stats in memo_stats.items():
+        print(f"Memoized {name}: {stats['hit_rate']:.0%} hits ({stats['hits']:,}/{stats['lookups']:,})")
     print(f"Output directory: {output_dir}")
 
     summary = {
@@ -109,6 +170,9 @@ def clean_all_tables(input_dir: Path, output_dir: Path) -> Dict:
         'files_processed': len(results),
         'total_numeric_before': total_numeric_before,
         'total_numeric_after': total_numeric_after,
+        'settings': cleaner.settings,
+        # Merged over the workers; hit counts depend on how the tables were split
+        'value_cache': memo_stats,
         'results': results,
     }
 
@@ -138,6 +202,22 @@ def main():
         default=Path('output/02_cleaned'),
         help='Output directory for cleaned CSVs (default: output/02_cleaned/)'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-clean tables that changed since the last run'
+    )
+    parser.add_argument(
+        '--config',
+        type=Path,
+        help='Configuration YAML whose cleaning section sets the OCR fixes (default: built-in fixes)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Clean tables in N worker processes (default: 1, serial)'
+    )
 
     args = parser.parse_args()
 
@@ -145,7 +225,9 @@ def main():
         print(f"Error: Input directory not found: {args.input}")
         return
 
-    summary = clean_all_tables(args.input, args.output)
+    cleaning = load_cleaning_config(args.config) if args.config else None
+    summary = clean_all_tables(args.input, args.output, incremental=args.incremental, cleaning=cleaning,
+                               workers=args.workers)
 
     if summary['success']:
         print(f"\n✓ Cleaning complete: {summary['files_processed']} files processed")
@@ -0,0 +1,39 @@
+"""
+Distinct cell texts of an array
+
+The column-wise cleaning steps (ocr_cleaner, phase_extractor) work on each
+distinct cell text once and map the results back to the cells. Cells are
+taken as str(value), like the per-cell functions they replace, so values
+that are equal but print differently stay apart: factorizing the raw
+values would merge 1, 1.0 and True.
+
+Usage:
+    from distinct_values import distinct_text
+
+    present, codes, uniques = distinct_text(values)
+    results = np.array([f(text) for text in uniques], dtype=object)
+    out[present] = results[codes]
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def distinct_text(values: np.ndarray):
+    """
+    Factorize the text of the non-missing values of a 1-D array
+
+    Args:
+        values: Raw values (any types; non-strings are taken as str(value))
+
+    Returns:
+        Tuple of (present mask, codes, distinct texts); codes index the
+        texts and have one entry per present value
+    """
+    values = np.asarray(values, dtype=object)
+    present = pd.notna(values)
+    text = values[present]
+    if pd.api.types.infer_dtype(text, skipna=False) != 'string':
+        text = np.array([str(value) for value in text], dtype=object)
+    codes, uniques = pd.factorize(text)
+    return present, codes, uniques
@@ -12,12 +12,18 @@ import pandas as pd
 from pathlib import Path
 import argparse
 import json
-from typing import Dict, List, Tuple
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
 
 # Import our enhancement modules
-from utils import advanced_clean, ensure_directory, count_numeric_values
+from utils import ensure_directory, file_hash
+from numeric_profile import NumericProfile
+from ocr_cleaner import OcrCleaner, DEFAULT_CLEANER, load_cleaning_config
+from fingerprint import FingerprintManifest, config_hash, code_version
 from phase_extractor import PhaseExtractor
 from column_standardizer import ColumnStandardizer
+from table_pool import TablePool
+from value_cache import reset_cache_stats
 
 
 def load_chemical_systems(systems_file: Path) -> Dict:
@@ -32,7 +38,8 @@ def enhanced_clean_table(
     csv_path: Path,
     chemical_systems: Dict = None,
     extract_phases: bool = True,
-    standardize_columns: bool = True
+    standardize_columns: bool = True,
+    cleaner: Optional[OcrCleaner] = None
 ) -> Tuple[pd.DataFrame, Dict]:
     """
     Perform enhanced cleaning on a table.
@@ -42,14 +49,44 @@ def enhanced_clean_table(
         chemical_systems: Dict mapping filenames to chemical systems
         extract_phases: Whether to extract phase markers
         standardize_columns: Whether to standardize column names
+        cleaner: Compiled OCR cleaning settings (default: built-in settings)
 
     Returns:
         Tuple of (cleaned DataFrame, metadata dict)
     """
     # Step 1: Load data
     df = pd.read_csv(csv_path)
-    filename = csv_path.name
 
+    return enhance_frame(
+        df,
+        csv_path.name,
+        chemical_systems=chemical_systems,
+        extract_phases=extract_phases,
+        standardize_columns=standardize_columns,
+        cleaner=cleaner
+    )
+
+
+def enhance_frame(
+    df: pd.DataFrame,
+    filename: str,
+    chemical_systems: Dict = None,
+    extract_phases: bool = True,
+    standardize_columns: bool = True,
+    cleaner: Optional[OcrCleaner] = None,
+    stages: Optional[Dict[str, pd.DataFrame]] = None
+) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Enhanced cleaning of a table already in memory (see enhanced_clean_table)
+
+    Args:
+        df: Table as read from its CSV
+        filename: Name of the table's CSV (looked up in chemical_systems)
+        stages: If given, receives the table after OCR cleaning ('ocr_cleaned')
+
+    Returns:
+        Tuple of (cleaned DataFrame, metadata dict)
+    """
     metadata = {
         'file': filename,
         'original_rows': len(df),
@@ -57,13 +94,15 @@ def enhanced_clean_table(
     }
 
     # Step 2: OCR cleaning (existing functionality)
-    original_numeric = count_numeric_values(df)
+    profile = NumericProfile.from_frame(df)
+    original_numeric = profile.numeric_count
 
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].map(advanced_clean)
+    df = (cleaner or DEFAULT_CLEANER).clean_frame(df)
 
-    cleaned_numeric = count_numeric_values(df)
+    # Only the text columns can have changed
+    cleaned_numeric = profile.refresh(df).numeric_count
+    if stages is not None:
+        stages['ocr_cleaned'] = df
 
     metadata['ocr_cleaning'] = {
         'original_numeric': original_numeric,
@@ -73,12 +112,12 @@ def enhanced_clean_table(
 
     # Step 3: Phase extraction
     if extract_phases:
-        extractor = PhaseExtractor()
-        df = extractor.process_dataframe(df, numeric_only=True)
-        unique_phases = extractor.get_unique_phases(df)
+        # One pass selects, splits and collects the labels
+        phase_profile = PhaseExtractor().profile(df, numeric_only=True)
+        df = phase_profile.apply(df)
 
         metadata['phase_extraction'] = {
-            'phases_found': list(unique_phases),
+            'phases_found': sorted(phase_profile.unique_phases),
             'phase_columns_added': sum(1 for col in df.columns if '_phase' in col)
         }
 
@@ -117,12 +156,50 @@ def enhanced_clean_table(
     return df, metadata
 
 
+def _json_default(obj):
+    """Convert numpy types to Python types for JSON"""
+    if hasattr(obj, 'item'):  # numpy types
+        return obj.item()
+    return obj
+
+
+def enhanced_clean_and_save(csv_path: Path, output_dir: Path, **options) -> Dict:
+    """
+    Enhance a table and save its CSV and metadata JSON (one task of enhanced_clean_all)
+
+    Args:
+        **options: Passed on to enhanced_clean_table
+
+    Returns:
+        Metadata dict of the table
+    """
+    df_clean, metadata = enhanced_clean_table(csv_path, **options)
+
+    # Save cleaned CSV
+    df_clean.to_csv(output_dir / csv_path.name, index=False)
+
+    # Save metadata
+    with open(output_dir / 'metadata' / f"{csv_path.stem}_metadata.json", 'w') as f:
+        json.dump(metadata, f, indent=2, default=_json_default)
+
+    return metadata
+
+
+def _enhance_task(task: Tuple[Path, Dict], output_dir: Path, options: Dict) -> Dict:
+    """A TablePool task of enhanced_clean_all: (CSV path, its chemical system mapping)"""
+    csv_path, chemical_systems = task
+    return enhanced_clean_and_save(csv_path, output_dir, chemical_systems=chemical_systems, **options)
+
+
 def enhanced_clean_all(
     input_dir: Path,
     output_dir: Path,
     systems_file: Path = None,
     extract_phases: bool = True,
-    standardize_columns: bool = True
+    standardize_columns: bool = True,
+    incremental: bool = False,
+    cleaning: Optional[Dict] = None,
+    workers: int = 1
 ) -> Dict:
     """
     Enhanced cleaning for all tables.
@@ -133,6 +210,13 @@ def enhanced_clean_all(
         systems_file: Path to chemical systems JSON
         extract_phases: Whether to extract phase markers
         standardize_columns: Whether to standardize columns
+        incremental: Only re-process tables whose inputs changed and delete
+            outputs whose source disappeared
+        cleaning: `cleaning` section of config.yaml (OCR fixes and number
+            fixes; default: built-in settings)
+        workers: Number of worker processes (1 = serial); results and
+            progress output are the same as in a serial run, apart from
+            the value_cache statistics
 
     Returns:
         Summary dict with cleaning results
@@ -163,47 +247,85 @@ def enhanced_clean_all(
     print(f"  • Chemical systems: {'✓' if chemical_systems else '✗'}")
     print()
 
+    # Compiled once for all tables
+    cleaner = OcrCleaner.from_config(cleaning)
+    reset_cache_stats()
+
+    fingerprints = FingerprintManifest.load(
+        output_dir,
+        config_hash({
+            'extract_phases': extract_phases,
+            'standardize_columns': standardize_columns,
+            'cleaning': cleaner.settings,
+        }),
+        code_version('enhanced_clean', 'utils', 'ocr_cleaner', 'phase_extractor', 'column_standardizer',
+                     'distinct_values', 'value_cache', 'numeric_profile')
+    )
+
+    inputs = {}
+    for csv_path in csv_files:
+        # A table depends on its CSV and on its chemical system mapping
+        inputs[csv_path] = {
+            'table': file_hash(csv_path),
+            'system': config_hash(chemical_systems.get(csv_path.name)),
+        }
+    pending = [csv_path for csv_path in csv_files
+               if not (incremental and fingerprints.is_current(csv_path.name, inputs[csv_path]))]
+
+    # Enhanced in order, in worker processes if workers > 1; each worker only
+    # gets the system mappings of the tables it handles
+    pool = TablePool(workers)
+    if workers > 1 and pending:
+        print(f"Using {workers} worker processes")
+        print()
+    options = {
+        'extract_phases': extract_phases,
+        'standardize_columns': standardize_columns,
+        'cleaner': cleaner,
+    }
+    tasks = [(csv_path, {csv_path.name: chemical_systems[csv_path.name]} if csv_path.name in chemical_systems else {})
+             for csv_path in pending]
+    pending = set(pending)
+
     results = []
     systems_found = {}
 
-    for i, csv_path in enumerate(csv_files, 1):
-        try:
-            print(f"[{i}/{len(csv_files)}] {csv_path.name}...", end=" ")
-
-            # Enhanced cleaning
-            df_clean, metadata = enhanced_clean_table(
-                csv_path,
-                chemical_systems=chemical_systems,
-                extract_phases=extract_phases,
-                standardize_columns=standardize_columns
-            )
-
-            # Save cleaned CSV
-            output_path = output_dir / csv_path.name
-            df_clean.to_csv(output_path, index=False)
-
-            # Save metadata
-            metadata_path = output_dir / 'metadata' / f"{csv_path.stem}_metadata.json"
-            with open(metadata_path, 'w') as f:
-                # Convert numpy types to Python types for JSON
-                def convert_types(obj):
-                    if hasattr(obj, 'item'):  # numpy types
-                        return obj.item()
-                    return obj
-
-                json.dump(metadata, f, indent=2, default=convert_types)
-
-            # Track systems
-            if metadata.get('chemical_system') != 'Unknown':
-                system = metadata['chemical_system']
-                systems_found[system] = systems_found.get(system, 0) + 1
-
-            results.append(metadata)
-            print(f"✓ (system: {metadata.get('chemical_system', 'Unknown')})")
-
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            results.append({'file': csv_path.name, 'error': str(e)})
+    with closing(pool.map(_enhance_task, tasks, output_dir, options)) as enhanced:
+        for i, csv_path in enumerate(csv_files, 1):
+            try:
+                print(f"[{i}/{len(csv_files)}] {csv_path.name}...", end=" ")
+
+                output_path = output_dir / csv_path.name
+                metadata_path = output_dir / 'metadata' / f"{csv_path.stem}_metadata.json"
+
+                if csv_path not in pending:
+                    with open(metadata_path) as f:
+                        metadata = json.load(f)
+                    fingerprints.reuse(csv_path.name)
+                else:
+                    metadata, error = next(enhanced)
+                    if error is not None:
+                        raise RuntimeError(error)
+
+                    # The metadata JSON is the stored result
+                    fingerprints.record(csv_path.name, inputs[csv_path], [output_path, metadata_path], None)
+
+                # Track systems
+                if metadata.get('chemical_system') != 'Unknown':
+                    system = metadata['chemical_system']
+                    systems_found[system] = systems_found.get(system, 0) + 1
+
+                results.append(metadata)
+                print(f"✓ (system: {metadata.get('chemical_system', 'Unknown')})")
+
+            except Exception as e:
+                print(f"✗ Error: {e}")
+                results.append({'file': csv_path.name, 'error': str(e)})
+
+    if incremental:
+        for removed in fingerprints.prune():
+            print(f"  ✗ Removed stale output {removed}")
+    fingerprints.save()
 
     # Create summary
     print()
@@ -218,6 +340,10 @@ def enhanced_clean_all(
     print(f"Successfully processed: {successful}/{len(csv_files)} files")
     print(f"Total unique phase labels: {total_phases}")
 
+    memo_stats = pool.cache_stats()
+    for name, stats in memo_stats.items():
+        print(f"Memoized {name}: {stats['hit_rate']:.0%} hits ({stats['hits']:,}/{stats['lookups']:,})")
+
     if systems_found:
         print(f"\nChemical systems identified: {len(systems_found)}")
         for system, count in sorted(systems_found.items(), key=lambda x: -x[1])[:10]:
@@ -229,6 +355,8 @@ def enhanced_clean_all(
         'successful': successful,
         'systems_identified': len(systems_found),
         'total_phase_labels': total_phases,
+        # Merged over the workers; hit counts depend on how the tables were split
+        'value_cache': memo_stats,
         'output_dir': str(output_dir),
     }
 
@@ -256,6 +384,12 @@ def main():
                       help='Disable phase extraction')
     parser.add_argument('--no-standardize', action='store_true',
                       help='Disable column standardization')
+    parser.add_argument('--incremental', action='store_true',
+                      help='Only re-process tables that changed since the last run')
+    parser.add_argument('--config', type=Path,
+                      help='Configuration YAML whose cleaning section sets the OCR fixes (default: built-in fixes)')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Enhance tables in N worker processes (default: 1, serial)')
 
     args = parser.parse_args()
 
@@ -264,7 +398,10 @@ def main():
         args.output_dir,
         systems_file=args.systems_file,
         extract_phases=not args.no_phases,
-        standardize_columns=not args.no_standardize
+        standardize_columns=not args.no_standardize,
+        incremental=args.incremental,
+        cleaning=load_cleaning_config(args.config) if args.config else None,
+        workers=args.workers
     )
 
     if result['success']:
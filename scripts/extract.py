@@ -4,40 +4,259 @@ Step 1: Extract tables from PDF files using tabula-py
 This script extracts all tables from PDF files and saves them as CSV files.
 """
 
-import tabula
 import pandas as pd
 from pathlib import Path
 import argparse
 import json
-from typing import List, Dict
-from utils import parse_pdf_filename, ensure_directory
+import math
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Iterator, List, Dict, Optional, Tuple, Union
+import tabula
+from utils import (parse_pdf_filename, ensure_directory, count_pdf_pages,
+                   parse_page_spec, available_cores, file_hash)
+from tabula_session import read_pdf, close_session
+from extraction_cache import ExtractionCache, get_cache, configure_cache, read_page
+from fingerprint import FingerprintManifest, config_hash, code_version
+from page_index import DEFAULT_INDEX_DIR, cached_page_count, table_areas
+from table_prefilter import DEFAULT_THRESHOLD, select_pages
+from page_watchdog import PageWatchdog
+
+# Smallest shard worth a separate tabula call (document load is per call)
+MIN_SHARD_PAGES = 4
+
+# Per-PDF extraction times of the last batch run (kept out of the manifest,
+# which must not change between runs that extract the same tables)
+TIMINGS_FILE = 'extraction_timings.json'
+
+
+def auto_shard_size(page_count: int, cores: int = None) -> int:
+    """
+    Pick a shard size (pages per tabula call) for a PDF
+
+    Aims for about two shards per core so a shard of slow pages does not
+    leave the other cores idle, without going below MIN_SHARD_PAGES.
+
+    Args:
+        page_count: Number of pages to extract
+        cores: Cores available to this PDF (default: all available)
+
+    Returns:
+        Pages per shard
+    """
+    cores = cores or available_cores()
+    return max(MIN_SHARD_PAGES, math.ceil(page_count / (cores * 2)))
+
 
+def shard_pages(page_list: List[int], shard_size: int) -> List[List[int]]:
+    """
+    Split pages into consecutive shards
+
+    Args:
+        page_list: Page numbers in extraction order
+        shard_size: Pages per shard
+
+    Returns:
+        List of page lists, one per shard, in page order
+    """
+    return [page_list[i:i + shard_size] for i in range(0, len(page_list), shard_size)]
+
+
+# Tabula options for pipeline extraction (also part of the cache key)
+TABULA_OPTIONS = {
+    'multiple_tables': True,
+    'pandas_options': {'header': None},
+}
+
+
+def _read_page(
+    pdf_path: Path,
+    page: int,
+    cache: ExtractionCache,
+    watchdog: Optional[PageWatchdog] = None,
+    area: Optional[List] = None
+) -> List[pd.DataFrame]:
+    """Extract one page (served from the cache when enabled), optionally only within area"""
+    if watchdog is not None:
+        return watchdog.read_page(pdf_path, page, area)
+    if not cache.enabled:
+        if area is not None:
+            return read_pdf(pdf_path, pages=int(page), area=area, **TABULA_OPTIONS)
+        return read_pdf(pdf_path, pages=int(page), **TABULA_OPTIONS)
+    return read_page(pdf_path, page, area=area, cache=cache, **TABULA_OPTIONS)
+
+
+def _read_shard(
+    pdf_path: Path,
+    shard: List[int],
+    cache: ExtractionCache,
+    watchdog: Optional[PageWatchdog] = None,
+    areas: Optional[Dict[int, List]] = None
+) -> List[Tuple[int, List[pd.DataFrame]]]:
+    """Extract a run of pages, keeping each page's tables separate"""
+    areas = areas or {}
+    return [(page, _read_page(pdf_path, page, cache, watchdog, areas.get(page))) for page in shard]
+
+
+def iter_tables(
+    pdf_path: Path,
+    pages: str = 'all',
+    shard_size: Optional[Union[int, str]] = None,
+    cores: int = None,
+    cache: Optional[ExtractionCache] = None,
+    watchdog: Optional[PageWatchdog] = None,
+    use_table_areas: bool = False,
+    index_dir: Path = DEFAULT_INDEX_DIR
+) -> Iterator[Tuple[int, int, pd.DataFrame]]:
+    """
+    Stream the tables of a PDF page by page
 
-def extract_tables_from_pdf(pdf_path: Path, pages: str = 'all') -> List[pd.DataFrame]:
+    Only the page being parsed (or, with shards, at most one shard per core)
+    is held in memory, so memory use does not grow with booklet size.
+
+    Args:
+        pdf_path: Path to PDF file
+        pages: Pages to extract (default: 'all')
+        shard_size: Pages per concurrent shard, 'auto', or None for serial pages
+        cores: Cores available for shards (default: all available)
+        cache: Extraction cache (default: process-wide cache)
+        watchdog: Run pages in killable workers with a time budget (default:
+            in this process, without a time limit)
+        use_table_areas: Read pages with recorded table boxes (page index)
+            only within those boxes; other pages are read whole
+        index_dir: Directory holding page index files
+
+    Yields:
+        (page, table_index, DataFrame) in page order; table_index is
+        1-based within the page
     """
-    Extract all tables from a PDF file
+    cache = cache if cache is not None else get_cache()
+    # Page count from the page index when one exists, else a quick pypdf read
+    page_count = cached_page_count(pdf_path, index_dir) or count_pdf_pages(pdf_path)
+    page_list = parse_page_spec(pages, page_count)
+    # Looked up here, so shard threads and watchdog workers get each page's area with the page
+    areas = None
+    if use_table_areas:
+        try:
+            areas = table_areas(pdf_path, index_dir)
+        except Exception as e:
+            print(f"  ⚠ No table areas for {pdf_path.name} ({e}), reading whole pages")
+
+    if shard_size is None:
+        shards = [[page] for page in page_list]
+        workers = 1
+    else:
+        cores = cores or available_cores()
+        if shard_size == 'auto':
+            shard_size = auto_shard_size(len(page_list), cores)
+        shards = shard_pages(page_list, int(shard_size))
+        workers = min(cores, len(shards))
+        if workers > 1:
+            print(f"  {len(page_list)} pages in {len(shards)} shards of {shard_size}")
+
+    if workers <= 1:
+        for shard in shards:
+            for page, tables in _read_shard(pdf_path, shard, cache, watchdog, areas):
+                for table_index, df in enumerate(tables, 1):
+                    yield page, table_index, df
+        return
+
+    # Shards share the warm JVM. At most one shard per worker is in flight
+    # and shards are yielded in order, so table numbering matches a serial run.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        remaining = iter(shards)
+        for shard in islice(remaining, workers):
+            in_flight.append(executor.submit(_read_shard, pdf_path, shard, cache, watchdog, areas))
+
+        while in_flight:
+            shard_result = in_flight.popleft().result()
+            for shard in islice(remaining, 1):
+                in_flight.append(executor.submit(_read_shard, pdf_path, shard, cache, watchdog, areas))
+            for page, tables in shard_result:
+                for table_index, df in enumerate(tables, 1):
+                    yield page, table_index, df
+            del shard_result
+
+
+def extract_tables_from_pdf(
+    pdf_path: Path,
+    pages: str = 'all',
+    shard_size: Optional[Union[int, str]] = None,
+    cores: int = None,
+    cache: Optional[ExtractionCache] = None,
+    page_timeout: Optional[float] = None
+) -> List[pd.DataFrame]:
+    """
+    Extract all tables from a PDF file into memory
+
+    Prefer iter_tables (or extract_pdf, which streams to disk) for whole
+    booklets.
 
     Args:
         pdf_path: Path to PDF file
         pages: Pages to extract (default: 'all')
+        shard_size: Pages per concurrent shard, 'auto', or None for serial pages
+        cores: Cores available for shards (default: all available)
+        cache: Extraction cache (default: process-wide cache)
+        page_timeout: Seconds each page may take before its worker is killed
+            and the page retried in another mode (None = no limit)
 
     Returns:
-        List of DataFrames, one per table
+        List of DataFrames, one per table, in page order
     """
     print(f"Extracting tables from {pdf_path.name}...")
 
+    watchdog = PageWatchdog(page_timeout, TABULA_OPTIONS, cache) if page_timeout else None
     try:
-        tables = tabula.read_pdf(
-            str(pdf_path),
-            pages=pages,
-            multiple_tables=True,
-            pandas_options={'header': None}
-        )
-        return tables
-
+        return [df for _, _, df in iter_tables(pdf_path, pages, shard_size, cores, cache, watchdog)]
     except Exception as e:
         print(f"  ✗ Error extracting from {pdf_path.name}: {e}")
         return []
+    finally:
+        if watchdog is not None:
+            watchdog.close()
+
+
+def save_table(df: pd.DataFrame, idx: int, output_dir: Path, pdf_metadata: Dict, page: Optional[int] = None) -> Dict:
+    """
+    Save one extracted table as a CSV file
+
+    Args:
+        df: Table to save
+        idx: 1-based table number within the PDF
+        output_dir: Directory to save CSV files
+        pdf_metadata: Metadata about source PDF
+        page: Page the table was found on (recorded in the metadata if given)
+
+    Returns:
+        Table metadata dict
+    """
+    # Generate filename
+    table_num = f"{idx:03d}"
+    csv_filename = f"{pdf_metadata['stem']}_table_{table_num}.csv"
+    csv_path = output_dir / csv_filename
+
+    # Save CSV
+    df.to_csv(csv_path, index=False)
+
+    # Collect metadata
+    table_info = {
+        'file': csv_filename,
+        'source_pdf': pdf_metadata['filename'],
+        'series': pdf_metadata['series'],
+        'part': pdf_metadata['part'],
+        'table_num': idx,
+        'rows': len(df),
+        'cols': len(df.columns),
+    }
+    if page is not None:
+        table_info['page'] = page
+    return table_info
 
 
 def save_tables(tables: List[pd.DataFrame], output_dir: Path, pdf_metadata: Dict) -> List[Dict]:
@@ -54,40 +273,42 @@ def save_tables(tables: List[pd.DataFrame], output_dir: Path, pdf_metadata: Dict
     """
     ensure_directory(output_dir)
 
-    table_info_list = []
-
-    for idx, df in enumerate(tables, 1):
-        # Generate filename
-        table_num = f"{idx:03d}"
-        csv_filename = f"{pdf_metadata['stem']}_table_{table_num}.csv"
-        csv_path = output_dir / csv_filename
-
-        # Save CSV
-        df.to_csv(csv_path, index=False)
-
-        # Collect metadata
-        table_info = {
-            'file': csv_filename,
-            'source_pdf': pdf_metadata['filename'],
-            'series': pdf_metadata['series'],
-            'part': pdf_metadata['part'],
-            'table_num': idx,
-            'rows': len(df),
-            'cols': len(df.columns),
-        }
-        table_info_list.append(table_info)
-
-    return table_info_list
-
-
-def extract_pdf(pdf_path: Path, output_dir: Path, pages: str = 'all') -> Dict:
+    return [save_table(df, idx, output_dir, pdf_metadata) for idx, df in enumerate(tables, 1)]
+
+
+def extract_pdf(
+    pdf_path: Path,
+    output_dir: Path,
+    pages: str = 'all',
+    shard_size: Optional[Union[int, str]] = None,
+    cores: int = None,
+    cache: Optional[ExtractionCache] = None,
+    prefilter: Optional[float] = None,
+    page_timeout: Optional[float] = None,
+    use_table_areas: bool = False,
+    index_dir: Path = DEFAULT_INDEX_DIR
+) -> Dict:
     """
     Extract all tables from a PDF and save results
 
+    Tables are written as soon as their page is parsed. If extraction fails
+    part-way, the CSVs already written for this PDF are removed again.
+
     Args:
         pdf_path: Path to PDF file
         output_dir: Output directory for CSV files
         pages: Pages to extract
+        shard_size: Pages per concurrent shard, 'auto', or None for serial pages
+        cores: Cores available for shards (default: all available)
+        cache: Extraction cache (default: process-wide cache)
+        prefilter: Skip pages whose table score (see table_prefilter) is
+            below this threshold; None sends every page to tabula
+        page_timeout: Seconds each page may take before its worker is killed
+            and the page retried in another mode; pages failing in every
+            mode are quarantined (None = extract in this process, no limit)
+        use_table_areas: Restrict tabula to the table boxes recorded in the
+            page index (pages without boxes are read whole)
+        index_dir: Directory holding page index files
 
     Returns:
         Summary dict with extraction results
@@ -95,43 +316,157 @@ def extract_pdf(pdf_path: Path, output_dir: Path, pages: str = 'all') -> Dict:
     # Parse PDF metadata
     pdf_metadata = parse_pdf_filename(pdf_path)
 
-    # Extract tables
-    tables = extract_tables_from_pdf(pdf_path, pages)
+    print(f"Extracting tables from {pdf_path.name}...")
+    ensure_directory(output_dir)
+    start = time.perf_counter()
+
+    page_list = parse_page_spec(pages, cached_page_count(pdf_path, index_dir) or count_pdf_pages(pdf_path))
+    skipped = []
+    if prefilter is not None:
+        # A page pypdf cannot score is no reason to fail a PDF tabula can read
+        try:
+            page_list, skipped = select_pages(pdf_path, page_list, prefilter)
+            print(f"  Prefilter: skipping {len(skipped)} of {len(page_list) + len(skipped)} pages")
+        except Exception as e:
+            print(f"  ⚠ Prefilter failed on {pdf_path.name}, extracting every page: {e}")
+            skipped = []
+
+    # Extract and save tables page by page
+    table_info_list = []
+    watchdog = PageWatchdog(page_timeout, TABULA_OPTIONS, cache) if page_timeout else None
+    try:
+        tables = iter_tables(pdf_path, page_list, shard_size, cores, cache, watchdog, use_table_areas, index_dir)
+        for idx, (page, _, df) in enumerate(tables, 1):
+            table_info_list.append(save_table(df, idx, output_dir, pdf_metadata, page))
+    except Exception as e:
+        print(f"  ✗ Error extracting from {pdf_path.name}: {e}")
+        for table_info in table_info_list:
+            (output_dir / table_info['file']).unlink(missing_ok=True)
+        table_info_list = []
+    finally:
+        if watchdog is not None:
+            watchdog.close()
 
-    if not tables:
-        print(f"  ✗ No tables extracted from {pdf_path.name}")
-        return {
-            'pdf': pdf_path.name,
-            'success': False,
-            'tables': 0,
-            'rows': 0,
-        }
+    quarantined = watchdog.quarantined if watchdog is not None else []
+    retried = watchdog.retried if watchdog is not None else []
 
-    # Save tables
-    table_info_list = save_tables(tables, output_dir, pdf_metadata)
+    if not table_info_list:
+        print(f"  ✗ No tables extracted from {pdf_path.name}")
+        return {**failed_result(pdf_path), 'quarantined': quarantined, 'retried': retried}
 
     # Calculate summary stats
     total_rows = sum(t['rows'] for t in table_info_list)
+    seconds = round(time.perf_counter() - start, 3)
 
-    print(f"  ✓ Extracted {len(tables)} tables, {total_rows} rows")
+    print(f"  ✓ Extracted {len(table_info_list)} tables, {total_rows} rows in {seconds:.1f}s")
 
     return {
         'pdf': pdf_path.name,
         'success': True,
-        'tables': len(tables),
+        'tables': len(table_info_list),
         'rows': total_rows,
+        'pages': len(page_list),
+        'pages_skipped': skipped,
+        'seconds': seconds,
+        'quarantined': quarantined,
+        'retried': retried,
         'metadata': pdf_metadata,
         'table_info': table_info_list,
     }
 
 
-def extract_all_pdfs(pdf_dir: Path, output_dir: Path) -> Dict:
+def failed_result(pdf_path: Path) -> Dict:
+    """Result dict for a PDF that produced no tables"""
+    return {
+        'pdf': pdf_path.name,
+        'success': False,
+        'tables': 0,
+        'rows': 0,
+    }
+
+
+def extract_pdf_isolated(pdf_path: Path, output_dir: Path, **options) -> Dict:
+    """
+    Extract one PDF without letting its failure abort the batch
+
+    Used by both the serial and the process-pool path so that a failing
+    PDF is recorded the same way in the manifest.
+
+    Args:
+        **options: Passed on to extract_pdf
+    """
+    try:
+        return extract_pdf(pdf_path, output_dir, **options)
+    except Exception as e:
+        print(f"  ✗ Error extracting from {pdf_path.name}: {e}")
+        return failed_result(pdf_path)
+
+
+def _extract_in_pool(pdf_files: List[Path], output_dir: Path, workers: int, **options) -> Dict[Path, Dict]:
+    """
+    Extract PDFs in a process pool (one warm JVM per worker)
+
+    If a worker dies hard (e.g. the JVM crashes) the pool breaks; every PDF
+    that had not finished is then retried in its own single-worker pool so
+    only the PDF that actually crashes is recorded as failed.
+
+    Returns:
+        Dict mapping PDF path -> result dict
+    """
+    # Spawn rather than fork: a forked child must not inherit a running JVM
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    unfinished = []
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {pdf_path: executor.submit(extract_pdf_isolated, pdf_path, output_dir, **options)
+                   for pdf_path in pdf_files}
+        for pdf_path, future in futures.items():
+            try:
+                results[pdf_path] = future.result()
+            except BrokenProcessPool:
+                unfinished.append(pdf_path)
+
+    for pdf_path in unfinished:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                results[pdf_path] = executor.submit(extract_pdf_isolated, pdf_path, output_dir, **options).result()
+            except BrokenProcessPool:
+                print(f"  ✗ Worker crashed while extracting {pdf_path.name}")
+                results[pdf_path] = failed_result(pdf_path)
+
+    return results
+
+
+def extract_all_pdfs(
+    pdf_dir: Path,
+    output_dir: Path,
+    workers: int = 1,
+    shard_size: Optional[Union[int, str]] = None,
+    cache: Optional[ExtractionCache] = None,
+    incremental: bool = False,
+    prefilter: Optional[float] = None,
+    page_timeout: Optional[float] = None,
+    use_table_areas: bool = False,
+    index_dir: Path = DEFAULT_INDEX_DIR
+) -> Dict:
     """
     Extract tables from all PDFs in a directory
 
     Args:
         pdf_dir: Directory containing PDF files
         output_dir: Output directory for extracted CSVs
+        workers: Number of worker processes (1 = serial)
+        shard_size: Pages per concurrent shard within a PDF, 'auto', or None
+        cache: Extraction cache (default: process-wide cache)
+        incremental: Only re-extract PDFs whose fingerprint changed and delete
+            tables of PDFs that disappeared
+        prefilter: Table-score threshold below which pages are not sent to
+            tabula (None = extract every page)
+        page_timeout: Per-page time budget in seconds; stalled or failing pages
+            are retried in another mode, then quarantined (None = no limit)
+        use_table_areas: Restrict tabula to the table boxes in the page index
+        index_dir: Directory holding page index files (passed on to the workers)
 
     Returns:
         Summary dict with all extraction results
@@ -142,21 +477,80 @@ def extract_all_pdfs(pdf_dir: Path, output_dir: Path) -> Dict:
         print(f"No PDF files found in {pdf_dir}")
         return {'success': False, 'pdfs': 0}
 
+    ensure_directory(output_dir)
+
     print("="*80)
     print(f"EXTRACTING TABLES FROM {len(pdf_files)} PDF FILES")
     print("="*80)
 
-    results = []
+    # Split the cores between worker processes for page sharding; pass the
+    # cache explicitly since spawned workers do not share our settings
+    options = {
+        'shard_size': shard_size,
+        'cores': max(1, available_cores() // max(1, workers)),
+        'cache': cache if cache is not None else get_cache(),
+        'prefilter': prefilter,
+        'page_timeout': page_timeout,
+        'use_table_areas': use_table_areas,
+        'index_dir': index_dir,
+    }
+
+    # Shard size only changes how pages are split, not what is extracted
+    fingerprints = FingerprintManifest.load(
+        output_dir,
+        config_hash({'pages': 'all', 'tabula': TABULA_OPTIONS, 'tabula_version': tabula.__version__,
+                     'prefilter': prefilter, 'page_timeout': page_timeout, 'table_areas': use_table_areas}),
+        code_version('extract', 'utils', 'table_prefilter', 'page_watchdog', 'extraction_cache', 'tabula_session',
+                     'page_index')
+    )
+    inputs = {pdf_path: {'pdf': file_hash(pdf_path)} for pdf_path in pdf_files}
+
+    results_by_pdf = {}
+    if incremental:
+        for pdf_path in pdf_files:
+            if fingerprints.is_current(pdf_path.name, inputs[pdf_path]):
+                results_by_pdf[pdf_path] = fingerprints.reuse(pdf_path.name)
+        print(f"Incremental: {len(results_by_pdf)} unchanged, "
+              f"{len(pdf_files) - len(results_by_pdf)} to extract")
+
+    pending = [pdf_path for pdf_path in pdf_files if pdf_path not in results_by_pdf]
+    if workers > 1 and pending:
+        print(f"Using {workers} worker processes")
+        pool_results = _extract_in_pool(pending, output_dir, workers, **options)
+    else:
+        pool_results = {pdf_path: extract_pdf_isolated(pdf_path, output_dir, **options) for pdf_path in pending}
+
+    timings = {}
+    for pdf_path, result in pool_results.items():
+        # Timings differ from run to run: saved apart from the manifest and fingerprints
+        if 'seconds' in result:
+            timings[pdf_path.name] = result.pop('seconds')
+        outputs = [output_dir / t['file'] for t in result.get('table_info', [])]
+        # Failed PDFs and PDFs with quarantined pages are retried next run
+        if result['success'] and not result.get('quarantined'):
+            fingerprints.record(pdf_path.name, inputs[pdf_path], outputs, result)
+        else:
+            fingerprints.keep(outputs)
+        results_by_pdf[pdf_path] = result
+
+    results = [results_by_pdf[pdf_path] for pdf_path in pdf_files]
+
+    if incremental:
+        for removed in fingerprints.prune():
+            print(f"  ✗ Removed stale output {removed}")
+    fingerprints.save()
+
     total_tables = 0
     total_rows = 0
+    pages_skipped = 0
+    quarantine = []
 
-    for pdf_path in pdf_files:
-        result = extract_pdf(pdf_path, output_dir)
-        results.append(result)
-
+    for result in results:
         if result['success']:
             total_tables += result['tables']
             total_rows += result['rows']
+            pages_skipped += len(result.get('pages_skipped', []))
+        quarantine.extend({'pdf': result['pdf'], **entry} for entry in result.get('quarantined', []))
 
     # Summary
     print("\n" + "="*80)
@@ -165,6 +559,10 @@ def extract_all_pdfs(pdf_dir: Path, output_dir: Path) -> Dict:
     print(f"PDFs processed: {len(pdf_files)}")
     print(f"Tables extracted: {total_tables}")
     print(f"Total rows: {total_rows:,}")
+    if prefilter is not None:
+        print(f"Pages skipped by prefilter: {pages_skipped}")
+    if page_timeout is not None:
+        print(f"Pages quarantined: {len(quarantine)}")
     print(f"Output directory: {output_dir}")
 
     summary = {
@@ -172,6 +570,9 @@ def extract_all_pdfs(pdf_dir: Path, output_dir: Path) -> Dict:
         'pdfs_processed': len(pdf_files),
         'total_tables': total_tables,
         'total_rows': total_rows,
+        'prefilter': prefilter,
+        'pages_skipped': pages_skipped,
+        'quarantine': quarantine,
         'results': results,
     }
 
@@ -181,9 +582,21 @@ def extract_all_pdfs(pdf_dir: Path, output_dir: Path) -> Dict:
         json.dump(summary, f, indent=2)
     print(f"\n✓ Extraction manifest saved: {manifest_path}")
 
+    # Seconds per PDF extracted in this run (not for PDFs reused by --incremental)
+    timings_path = output_dir / TIMINGS_FILE
+    with open(timings_path, 'w') as f:
+        json.dump({pdf_path.name: timings[pdf_path.name] for pdf_path in pdf_files if pdf_path.name in timings},
+                  f, indent=2)
+    print(f"✓ Extraction timings saved: {timings_path}")
+
     return summary
 
 
+def parse_shard_size(value: str) -> Union[int, str]:
+    """Parse --shard-size: a page count or 'auto'"""
+    return value if value == 'auto' else int(value)
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -211,22 +624,84 @@ def main():
         default='all',
         help='Pages to extract (default: all)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Extract PDFs in N worker processes (default: 1, serial)'
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=parse_shard_size,
+        help="Split each PDF into page shards extracted concurrently: pages per shard or 'auto'"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the extraction cache'
+    )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Re-extract every page and overwrite cached results'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-extract PDFs that changed since the last run'
+    )
+    parser.add_argument(
+        '--page-timeout',
+        type=float,
+        metavar='SECONDS',
+        help='Run tabula in worker processes and give each page this long; stalled pages '
+             'are retried in stream, then lattice mode, then quarantined'
+    )
+    parser.add_argument(
+        '--table-areas',
+        action='store_true',
+        help='Only read the table boxes recorded in the page index (see page_index.py)'
+    )
+    parser.add_argument(
+        '--index-dir',
+        type=Path,
+        default=DEFAULT_INDEX_DIR,
+        help=f'Page index directory (default: {DEFAULT_INDEX_DIR}/)'
+    )
+    parser.add_argument(
+        '--prefilter',
+        type=float,
+        nargs='?',
+        const=DEFAULT_THRESHOLD,
+        metavar='THRESHOLD',
+        help=f'Skip pages that score below THRESHOLD as table pages (default: {DEFAULT_THRESHOLD}; '
+             'lower keeps more pages)'
+    )
 
     args = parser.parse_args()
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh_cache)
 
     # Single PDF or batch processing
-    if args.pdf:
-        if not args.pdf.exists():
-            print(f"Error: PDF file not found: {args.pdf}")
-            return
-        result = extract_pdf(args.pdf, args.output, args.pages)
-        if result['success']:
-            print(f"\n✓ Extraction complete: {result['tables']} tables, {result['rows']} rows")
-    else:
-        if not args.pdf_dir.exists():
-            print(f"Error: PDF directory not found: {args.pdf_dir}")
-            return
-        summary = extract_all_pdfs(args.pdf_dir, args.output)
+    try:
+        if args.pdf:
+            if not args.pdf.exists():
+                print(f"Error: PDF file not found: {args.pdf}")
+                return
+            result = extract_pdf(args.pdf, args.output, args.pages, args.shard_size, prefilter=args.prefilter,
+                                 page_timeout=args.page_timeout, use_table_areas=args.table_areas,
+                                 index_dir=args.index_dir)
+            if result['success']:
+                print(f"\n✓ Extraction complete: {result['tables']} tables, {result['rows']} rows")
+        else:
+            if not args.pdf_dir.exists():
+                print(f"Error: PDF directory not found: {args.pdf_dir}")
+                return
+            summary = extract_all_pdfs(args.pdf_dir, args.output, args.workers, args.shard_size,
+                                       incremental=args.incremental, prefilter=args.prefilter,
+                                       page_timeout=args.page_timeout, use_table_areas=args.table_areas,
+                                       index_dir=args.index_dir)
+    finally:
+        close_session()
 
 
 if __name__ == "__main__":
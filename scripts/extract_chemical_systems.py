@@ -10,28 +10,24 @@ import re
 import json
 from pathlib import Path
 from typing import Dict, List, Tuple
-import pdfplumber
 
+from formula_scanner import CHEMICAL_SYSTEM_SCANNER
+from page_index import DEFAULT_INDEX_DIR, load_page_index
 
-def extract_text_with_tables(pdf_path: Path) -> List[Dict]:
+
+def extract_text_with_tables(pdf_path: Path, index_dir: Path = DEFAULT_INDEX_DIR) -> List[Dict]:
     """
-    Extract text and table positions from PDF.
-    Returns list of {page, text, tables} dictionaries.
+    Extract text and table positions from PDF (via the page index).
+    Returns list of {page, text, num_tables} dictionaries.
     """
-    pages_data = []
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, 1):
-            text = page.extract_text() or ""
-            tables = page.find_tables()
-
-            pages_data.append({
-                'page': page_num,
-                'text': text,
-                'num_tables': len(tables)
-            })
-
-    return pages_data
+    return [
+        {
+            'page': page['page'],
+            'text': page['text'],
+            'num_tables': page['num_tables']
+        }
+        for page in load_page_index(pdf_path, index_dir)
+    ]
 
 
 def find_chemical_systems(text: str) -> List[str]:
@@ -44,40 +40,17 @@ def find_chemical_systems(text: str) -> List[str]:
     - "K2HPO4-KH2PO4-H2O"
     etc.
     """
-    patterns = [
-        # Pattern 1: Chemical formula with hyphens (most common)
-        r'([A-Z][a-z]?\d*[A-Z][A-Za-z0-9]*(?:-[A-Z][a-z]?\d*[A-Z][A-Za-z0-9]*)+)',
-
-        # Pattern 2: System with "system" keyword
-        r'([A-Z][a-z]?\d*[A-Z][A-Za-z0-9]*(?:\s*[-–]\s*[A-Z][a-z]?\d*[A-Z][A-Za-z0-9]*)+)\s+system',
+    return CHEMICAL_SYSTEM_SCANNER.scan(text)
 
-        # Pattern 3: Phosphate systems (specific to SDS-31)
-        r'((?:Na|K|Mg|Ca|NH4)\d*(?:H|HP)?(?:PO4|P2O7)(?:\s*[-–]\s*(?:Na|K|Mg|Ca|NH4|H)\d*(?:H|HP)?(?:PO4|P2O7|O))*\s*[-–]\s*H\s*2?\s*O)',
-    ]
 
-    systems = set()
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            system = match.group(1).strip()
-            # Clean up spaces in system name
-            system = re.sub(r'\s+', '', system)
-            # Ensure ends with H2O
-            if 'H2O' in system or 'H O' in system:
-                system = system.replace('H O', 'H2O')
-                systems.add(system)
-
-    return list(systems)
-
-
-def map_tables_to_systems(pdf_path: Path, part_name: str) -> Dict[str, str]:
+def map_tables_to_systems(pdf_path: Path, part_name: str, index_dir: Path = DEFAULT_INDEX_DIR) -> Dict[str, str]:
     """
     Create mapping of table filenames to chemical systems.
 
     Returns:
         Dict mapping "SDS-31_Part1_table_001.csv" -> "Na3PO4-H2O"
     """
-    pages_data = extract_text_with_tables(pdf_path)
+    pages_data = extract_text_with_tables(pdf_path, index_dir)
 
     mapping = {}
     current_system = "Unknown"
@@ -102,10 +75,13 @@ def map_tables_to_systems(pdf_path: Path, part_name: str) -> Dict[str, str]:
     return mapping
 
 
-def create_full_mapping() -> Dict[str, Dict]:
+def create_full_mapping(index_dir: Path = DEFAULT_INDEX_DIR) -> Dict[str, Dict]:
     """
     Create full mapping for all PDFs.
 
+    Args:
+        index_dir: Directory holding page index files
+
     Returns:
         Dict mapping filename -> {system, part, table_num, page_hint}
     """
@@ -125,7 +101,7 @@ def create_full_mapping() -> Dict[str, Dict]:
         print(f"Processing {pdf_file.name}...")
 
         try:
-            part_mapping = map_tables_to_systems(pdf_file, part_name)
+            part_mapping = map_tables_to_systems(pdf_file, part_name, index_dir)
 
             for filename, system in part_mapping.items():
                 # Parse table number
@@ -149,10 +125,17 @@ def create_full_mapping() -> Dict[str, Dict]:
 
 def main():
     """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Map extracted tables to the chemical systems named in the PDFs')
+    parser.add_argument('--index-dir', type=Path, default=DEFAULT_INDEX_DIR,
+                      help=f'Page index directory (default: {DEFAULT_INDEX_DIR}/)')
+    args = parser.parse_args()
+
     print("Extracting chemical system information from PDFs...\n")
 
     # Create mapping
-    mapping = create_full_mapping()
+    mapping = create_full_mapping(args.index_dir)
 
     # Save to JSON
     output_file = Path("web-interface/public/data/chemical_systems.json")
@@ -2,18 +2,125 @@
 Extract tables from filtered booklet PDFs.
 
 These are cleaned PDFs containing only data tables.
+
+With --batch, the whole booklet directory is converted to JSON in a single
+tabula-java call and the tables are written to CSV straight from the JSON
+cells, without building DataFrames.
 """
 
-import tabula
+import argparse
+import csv
+import shutil
+import tempfile
 import pandas as pd
+from collections import defaultdict
 from pathlib import Path
 import json
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from tabula_session import read_pdf, convert_into_by_batch, close_session
+
+
+def _column_names(header: List[str]) -> List[str]:
+    """
+    Column names the way tabula-py builds them from a table's first row:
+    blank cells become 'Unnamed: N', repeated names get '.N' suffixes
+    """
+    columns = []
+    unnamed = 0
+    for name in header:
+        if not name:
+            name = f"Unnamed: {unnamed}"
+            unnamed += 1
+        columns.append(name)
+
+    counts = defaultdict(int)
+    for idx, name in enumerate(columns):
+        count = counts[name]
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts[name]
+        columns[idx] = name
+        counts[name] = count + 1
+    return columns
+
+
+def save_json_table(table: Dict, output_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Write one table of tabula-java's JSON output as CSV
+
+    The first row is the header, as with read_pdf. Cell text is written
+    as tabula read it (no numeric conversion).
+
+    Args:
+        table: Table from tabula-java's JSON output ({'data': [[{'text': ...}]]})
+        output_path: CSV file to write
+
+    Returns:
+        (rows, cols), or None if the table has no data rows (nothing written)
+    """
+    rows = [[cell['text'] for cell in row] for row in table['data']]
+    if len(rows) < 2 or not rows[0]:
+        return None
+
+    columns = _column_names(rows[0])
+    width = len(columns)
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+        for row in rows[1:]:
+            writer.writerow(row + [''] * (width - len(row)))
+    return len(rows) - 1, width
+
+
+def _save_table(table: Union[pd.DataFrame, Dict], output_path: Path) -> Optional[Tuple[int, int]]:
+    """Save a DataFrame or a JSON table; None if it is empty"""
+    if isinstance(table, dict):
+        return save_json_table(table, output_path)
+    if table.empty:
+        return None
+    table.to_csv(output_path, index=False)
+    return int(table.shape[0]), int(table.shape[1])
+
+
+def convert_booklets_batch(pdf_files: List[Path], work_dir: Path) -> Dict[str, Path]:
+    """
+    Convert all booklets to tabula JSON in one tabula-java call
+
+    tabula-java writes its output next to the PDFs, so the booklets are
+    linked into work_dir first and the source directory stays untouched.
+
+    Args:
+        pdf_files: Booklet PDFs
+        work_dir: Scratch directory
+
+    Returns:
+        Dict mapping PDF filename -> JSON output path (booklets that
+        tabula-java could not convert are missing)
+    """
+    for pdf_file in pdf_files:
+        link = work_dir / pdf_file.name
+        try:
+            link.symlink_to(pdf_file.resolve())
+        except OSError:
+            shutil.copy2(pdf_file, link)
+
+    convert_into_by_batch(work_dir, output_format='json', pages='all')
+
+    outputs = {}
+    for pdf_file in pdf_files:
+        json_path = work_dir / f"{pdf_file.stem}.json"
+        if json_path.exists():
+            outputs[pdf_file.name] = json_path
+    return outputs
 
 
 def extract_from_filtered_booklets(
     booklet_dir: Path,
-    output_dir: Path
+    output_dir: Path,
+    batch: bool = False
 ) -> dict:
     """
     Extract all tables from filtered booklet PDFs.
@@ -21,6 +128,8 @@ def extract_from_filtered_booklets(
     Args:
         booklet_dir: Directory containing filtered PDF files
         output_dir: Where to save extracted CSV tables
+        batch: Convert the whole directory in one tabula-java call and write
+            CSVs straight from its JSON output
 
     Returns:
         dict with extraction statistics
@@ -42,59 +151,74 @@ def extract_from_filtered_booklets(
     print(f"Found {len(pdf_files)} filtered booklet PDFs")
     print("=" * 70)
 
-    for pdf_file in pdf_files:
-        booklet_name = pdf_file.stem  # e.g., "SDS-31_filtered"
-        booklet_num = booklet_name.split('-')[1].split('_')[0]  # e.g., "31"
-
-        print(f"\nProcessing {booklet_name}...")
-
-        try:
-            # Extract all tables from PDF
-            tables = tabula.read_pdf(
-                str(pdf_file),
-                pages='all',
-                multiple_tables=True
-            )
-
-            print(f"  Found {len(tables)} tables")
-
-            booklet_results = {
-                'booklet': booklet_name,
-                'pdf_file': pdf_file.name,
-                'tables_extracted': len(tables),
-                'tables': []
-            }
-
-            # Save each table
-            for idx, df in enumerate(tables, 1):
-                if df.empty:
-                    print(f"    Table {idx}: Empty - skipped")
-                    continue
-
-                # Generate filename
-                table_filename = f"SDS-{booklet_num}_table_{idx:03d}.csv"
-                output_path = output_dir / table_filename
-
-                # Save raw extracted table
-                df.to_csv(output_path, index=False)
-
-                print(f"    Table {idx}: {df.shape[0]} rows × {df.shape[1]} cols → {table_filename}")
-
-                booklet_results['tables'].append({
-                    'filename': table_filename,
-                    'table_number': idx,
-                    'rows': int(df.shape[0]),
-                    'cols': int(df.shape[1])
-                })
-
-                results['total_tables'] += 1
-
-            results['booklets_processed'] += 1
-            results['booklets'].append(booklet_results)
-
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            continue
+    with tempfile.TemporaryDirectory() as work_dir:
+        batch_outputs = {}
+        if batch:
+            try:
+                batch_outputs = convert_booklets_batch(pdf_files, Path(work_dir))
+                print(f"Converted {len(batch_outputs)} booklets in one tabula call")
+            except Exception as e:
+                print(f"  ⚠ Batch conversion failed ({e}), extracting booklets one by one")
+
+        for pdf_file in pdf_files:
+            booklet_name = pdf_file.stem  # e.g., "SDS-31_filtered"
+            booklet_num = booklet_name.split('-')[1].split('_')[0]  # e.g., "31"
+
+            print(f"\nProcessing {booklet_name}...")
+
+            try:
+                if pdf_file.name in batch_outputs:
+                    # Tables as tabula-java emitted them (read_pdf drops the empty ones too)
+                    with open(batch_outputs[pdf_file.name], encoding='utf-8') as f:
+                        tables = [table for table in json.load(f) if table['data']]
+                else:
+                    if batch:
+                        print("  ⚠ No batch output, extracting this booklet on its own")
+                    # Extract all tables from PDF
+                    tables = read_pdf(
+                        pdf_file,
+                        pages='all',
+                        multiple_tables=True
+                    )
+
+                print(f"  Found {len(tables)} tables")
+
+                booklet_results = {
+                    'booklet': booklet_name,
+                    'pdf_file': pdf_file.name,
+                    'tables_extracted': len(tables),
+                    'tables': []
+                }
+
+                # Save each table
+                for idx, table in enumerate(tables, 1):
+                    # Generate filename
+                    table_filename = f"SDS-{booklet_num}_table_{idx:03d}.csv"
+                    output_path = output_dir / table_filename
+
+                    # Save raw extracted table
+                    shape = _save_table(table, output_path)
+                    if shape is None:
+                        print(f"    Table {idx}: Empty - skipped")
+                        continue
+
+                    print(f"    Table {idx}: {shape[0]} rows × {shape[1]} cols → {table_filename}")
+
+                    booklet_results['tables'].append({
+                        'filename': table_filename,
+                        'table_number': idx,
+                        'rows': shape[0],
+                        'cols': shape[1]
+                    })
+
+                    results['total_tables'] += 1
+
+                results['booklets_processed'] += 1
+                results['booklets'].append(booklet_results)
+
+            except Exception as e:
+                print(f"  ❌ Error: {e}")
+                continue
 
     # Save extraction report
     report_file = output_dir / '_extraction_report.json'
@@ -106,19 +230,31 @@ def extract_from_filtered_booklets(
 
 def main():
     """Extract tables from all filtered booklets."""
+    parser = argparse.ArgumentParser(description='Extract tables from filtered booklet PDFs')
+    parser.add_argument('--booklet-dir', type=Path, default=Path('filtered_booklet'),
+                        help='Directory containing filtered PDF files (default: filtered_booklet/)')
+    parser.add_argument('--output', type=Path, default=Path('output/filtered_extracted'),
+                        help='Output directory for CSV tables (default: output/filtered_extracted/)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Convert all booklets in one tabula call, writing CSVs from its JSON output')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("FILTERED BOOKLET TABLE EXTRACTION")
     print("=" * 70)
 
-    booklet_dir = Path('filtered_booklet')
-    output_dir = Path('output/filtered_extracted')
+    booklet_dir = args.booklet_dir
+    output_dir = args.output
 
     if not booklet_dir.exists():
         print(f"Error: Booklet directory not found: {booklet_dir}")
         return
 
     # Extract tables
-    results = extract_from_filtered_booklets(booklet_dir, output_dir)
+    try:
+        results = extract_from_filtered_booklets(booklet_dir, output_dir, args.batch)
+    finally:
+        close_session()
 
     # Print summary
     print(f"\n{'=' * 70}")
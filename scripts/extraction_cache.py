@@ -0,0 +1,243 @@
+"""
+Content-addressed extraction cache
+
+Tabula results are stored on disk per page, keyed by
+(PDF content hash, page, extraction mode, area, tabula options, tabula version),
+so re-running the pipeline on unchanged PDFs skips tabula entirely.
+Entries are evicted least-recently-used once the cache exceeds its size budget.
+
+Usage:
+    from extraction_cache import read_page
+
+    tables = read_page(pdf_path, 12, mode='lattice', lattice=True)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import tabula
+
+from tabula_session import read_pdf
+from utils import file_hash
+
+DEFAULT_CACHE_DIR = Path('output/.extraction_cache')
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+
+class ExtractionCache:
+    """Size-bounded on-disk cache of per-page tabula results."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+        refresh: bool = False
+    ):
+        """
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Size budget before least-recently-used entries are evicted
+            enabled: If False, every lookup is a miss and nothing is stored
+            refresh: Ignore existing entries and overwrite them with fresh results
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.refresh = refresh
+        self.stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+        self._size = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Picklable for process pools (locks are not)
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def make_key(self, pdf_path: Path, page: int, mode: str, area: Optional[List], options: Dict) -> str:
+        """Cache key for one page extraction"""
+        payload = json.dumps({
+            'pdf': file_hash(pdf_path),
+            'page': int(page),
+            'mode': mode,
+            'area': area,
+            'options': options,
+            'tabula': tabula.__version__,
+            'tabula_java': tabula.backend.TABULA_JAVA_VERSION,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[List[pd.DataFrame]]:
+        """Return cached tables, or None on a miss"""
+        if not self.enabled or self.refresh:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                tables = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return tables
+
+    def put(self, key: str, tables: List[pd.DataFrame]):
+        """Store tables under key, evicting old entries if over budget"""
+        if not self.enabled:
+            return
+
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename so concurrent readers never see partial entries
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += path.stat().st_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for subdir in os.scandir(self.cache_dir):
+            if subdir.is_dir():
+                entries.extend(e for e in os.scandir(subdir.path) if e.name.endswith('.pkl'))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self):
+        """Delete least-recently-used entries until within budget"""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        size = sum(e[1] for e in entries)
+        for _, entry_size, entry_path in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+                self.stats['evicted'] += 1
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def fetch(
+        self,
+        pdf_path: Path,
+        page: int,
+        mode: str,
+        area: Optional[List],
+        options: Dict,
+        extract_func: Callable[[], List[pd.DataFrame]]
+    ) -> List[pd.DataFrame]:
+        """
+        Serve a page extraction from the cache, running extract_func on a miss
+
+        Returns:
+            List of DataFrames for the page
+        """
+        if not self.enabled:
+            return extract_func()
+
+        key = self.make_key(pdf_path, page, mode, area, options)
+        tables = self.get(key)
+        if tables is not None:
+            self.stats['hits'] += 1
+            return tables
+
+        self.stats['misses'] += 1
+        tables = extract_func()
+        self.put(key, tables)
+        return tables
+
+
+# Process-wide cache shared by all modules
+_cache: Optional[ExtractionCache] = None
+
+
+def configure_cache(
+    enabled: bool = True,
+    refresh: bool = False,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES
+) -> ExtractionCache:
+    """Set up the process-wide cache (e.g. from --no-cache / --refresh-cache)"""
+    global _cache
+    _cache = ExtractionCache(cache_dir, max_bytes, enabled=enabled, refresh=refresh)
+    return _cache
+
+
+def get_cache() -> ExtractionCache:
+    """Return the process-wide cache, creating the default one on first use"""
+    global _cache
+    if _cache is None:
+        _cache = ExtractionCache()
+    return _cache
+
+
+def read_page(
+    pdf_path: Path,
+    page: int,
+    mode: str = 'default',
+    area: Optional[List] = None,
+    cache: Optional[ExtractionCache] = None,
+    **kwargs
+) -> List[pd.DataFrame]:
+    """
+    Extract one page with tabula, served from the cache when possible
+
+    Args:
+        pdf_path: Path to PDF file
+        page: 1-based page number
+        mode: Extraction mode label (part of the cache key)
+        area: Optional area [top, left, bottom, right]
+        cache: Cache to use (default: process-wide cache)
+        **kwargs: Options forwarded to tabula.read_pdf
+
+    Returns:
+        List of DataFrames found on the page
+    """
+    cache = cache if cache is not None else get_cache()
+    if area is not None:
+        kwargs['area'] = area
+
+    return cache.fetch(
+        pdf_path, page, mode, area, {k: v for k, v in kwargs.items() if k != 'area'},
+        lambda: read_pdf(pdf_path, pages=int(page), **kwargs)
+    )
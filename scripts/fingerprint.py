@@ -0,0 +1,175 @@
+"""
+Input fingerprints for incremental pipeline runs
+
+Each stage keeps a fingerprint manifest next to its outputs recording, per
+unit of work (a PDF for extraction, a table for cleaning), the hashes of its
+inputs, the stage configuration and the code version that produced it.
+On an incremental run a stage only recomputes units whose fingerprint
+changed, and deletes outputs whose sources disappeared.
+
+Usage:
+    from fingerprint import FingerprintManifest, config_hash, code_version
+
+    fingerprints = FingerprintManifest.load(
+        output_dir, config_hash({'pages': 'all'}), code_version('extract', 'utils')
+    )
+    inputs = {'pdf': file_hash(pdf_path)}
+    if fingerprints.is_current(pdf_path.name, inputs):
+        result = fingerprints.reuse(pdf_path.name)
+    else:
+        result = ...
+        if result['success']:
+            fingerprints.record(pdf_path.name, inputs, output_files, result)
+    fingerprints.prune()
+    fingerprints.save()
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils import file_hash
+
+FINGERPRINT_FILE = '_fingerprints.json'
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def config_hash(config: Dict) -> str:
+    """Stable hash of the configuration options that affect a stage's outputs"""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def code_version(*modules: str) -> str:
+    """
+    Hash of the source of the modules a stage runs
+
+    Args:
+        *modules: Module names in scripts/ (e.g. 'clean', 'utils')
+
+    Returns:
+        Short hex digest; changes whenever any of the modules is edited
+    """
+    digest = hashlib.sha256()
+    for module in sorted(modules):
+        digest.update(module.encode('utf-8'))
+        digest.update(file_hash(SCRIPTS_DIR / f"{module}.py").encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class FingerprintManifest:
+    """Per-stage record of which inputs produced which outputs."""
+
+    def __init__(self, output_dir: Path, config: str, code: str, previous: Optional[Dict] = None):
+        """
+        Args:
+            output_dir: Stage output directory (outputs are recorded relative to it)
+            config: Hash of the stage configuration (see config_hash)
+            code: Code version of the stage (see code_version)
+            previous: Contents of the fingerprint file from the last run
+        """
+        self.output_dir = Path(output_dir)
+        self.config = config
+        self.code = code
+
+        # Entries from the last run only count if config and code are unchanged
+        previous = previous or {}
+        if previous.get('config_hash') == config and previous.get('code_version') == code:
+            self.previous = previous.get('entries', {})
+        else:
+            self.previous = {}
+        self.stale_outputs = {
+            output
+            for entry in previous.get('entries', {}).values()
+            for output in entry['outputs']
+        }
+        self.entries = {}
+        self.kept_outputs = set()
+
+    @classmethod
+    def load(cls, output_dir: Path, config: str, code: str) -> 'FingerprintManifest':
+        """Read the fingerprint file of a stage output directory (if any)"""
+        path = Path(output_dir) / FINGERPRINT_FILE
+        previous = None
+        if path.exists():
+            try:
+                with open(path) as f:
+                    previous = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                previous = None
+        return cls(output_dir, config, code, previous)
+
+    def is_current(self, key: str, inputs: Dict[str, str]) -> bool:
+        """
+        Check whether a unit can be reused from the last run
+
+        Args:
+            key: Unit name (PDF or table filename)
+            inputs: Input name → content hash
+
+        Returns:
+            True if inputs, config and code match and all outputs still exist
+        """
+        entry = self.previous.get(key)
+        if entry is None or entry['inputs'] != inputs:
+            return False
+        return all((self.output_dir / output).exists() for output in entry['outputs'])
+
+    def result(self, key: str) -> Dict:
+        """Stored result of a unit from the last run"""
+        return self.previous[key]['result']
+
+    def reuse(self, key: str) -> Dict:
+        """Carry a current unit over to this run and return its stored result"""
+        self.entries[key] = self.previous[key]
+        return self.result(key)
+
+    def record(self, key: str, inputs: Dict[str, str], outputs: Iterable[Path], result: Dict):
+        """
+        Record a freshly computed unit
+
+        Only record units that succeeded: a recorded unit is reused by later
+        incremental runs, so a failed one would never be retried.
+
+        Args:
+            key: Unit name
+            inputs: Input name → content hash
+            outputs: Files written for this unit
+            result: Per-unit result to replay on later runs (JSON-serializable)
+        """
+        outputs = sorted(str(Path(output).relative_to(self.output_dir)) for output in outputs)
+        self.entries[key] = {'inputs': inputs, 'outputs': outputs, 'result': result}
+
+    def keep(self, outputs: Iterable[Path]):
+        """
+        Keep files written this run by a unit that is not recorded (e.g. a
+        partial result to retry next time), so prune() does not delete them
+        """
+        self.kept_outputs.update(str(Path(output).relative_to(self.output_dir)) for output in outputs)
+
+    def prune(self) -> List[str]:
+        """
+        Delete outputs from the last run that no current unit produced
+        (sources that disappeared, or tables a PDF no longer yields)
+
+        Returns:
+            Relative paths of deleted files
+        """
+        current = {output for entry in self.entries.values() for output in entry['outputs']} | self.kept_outputs
+        removed = []
+        for output in sorted(self.stale_outputs - current):
+            path = self.output_dir / output
+            if path.exists():
+                path.unlink()
+                removed.append(output)
+        return removed
+
+    def save(self):
+        """Write the fingerprint file"""
+        with open(self.output_dir / FINGERPRINT_FILE, 'w') as f:
+            json.dump({
+                'config_hash': self.config,
+                'code_version': self.code,
+                'entries': self.entries,
+            }, f, indent=2)
@@ -0,0 +1,230 @@
+"""
+Compiled chemical-system scanner
+
+Chemical systems are written as chains of formulas joined by dashes, usually
+ending in water: "Na3PO4-H2O", "MgHPO4 - Na2HPO4 - H2O". The original
+regexes described such a chain as one large pattern, which backtracks
+through every way of splitting the chain whenever the end does not match
+(exponential in the chain length).
+
+Here each pattern is split into its pieces (first formula, separator, next
+formula, final piece), each piece is a small precompiled regex, and the
+chain is walked once from left to right. The result at each formula end is
+memoized, so every position is resolved at most once. The matches are
+the same as re.finditer over the original pattern (see
+scan_with_regex, used by `benchmark.py formula` to check this).
+
+Usage:
+    from formula_scanner import SYSTEM_SCANNER
+
+    SYSTEM_SCANNER.scan("Solubility in the Na3PO4 - H2O system")  # ['Na3PO4-H2O']
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ChainPattern:
+    """
+    A pattern of the form  FIRST (SEP NEXT)* FINAL  (or + instead of *).
+
+    The regex equivalent is '(' + FIRST + '(?:' + SEP + NEXT + ')*' + FINAL + ')',
+    with FINAL outside the group when final_in_group is False.
+    """
+
+    def __init__(
+        self,
+        first: str,
+        sep: str,
+        next_formula: Optional[str] = None,
+        final: Optional[str] = None,
+        min_links: int = 0,
+        final_in_group: bool = True,
+        flags: int = re.IGNORECASE
+    ):
+        """
+        Args:
+            first: Regex of the first formula
+            sep: Regex of the separator between formulas
+            next_formula: Regex of the following formulas (default: same as first)
+            final: Regex that must follow the chain (None = chain ends the match)
+            min_links: Minimum number of SEP NEXT links (0 for *, 1 for +)
+            final_in_group: Whether the final piece is part of the reported system
+            flags: Regex flags, as passed to re.finditer originally
+        """
+        next_formula = next_formula or first
+        self.first_source = first
+        self.sep_source = sep
+        self.next_source = next_formula
+        self.final_source = final
+        self.min_links = min_links
+        self.final_in_group = final_in_group
+        self.flags = flags
+
+        self._first = re.compile(first, flags)
+        self._link = re.compile(f"{sep}(?:{next_formula})", flags)
+        self._final = re.compile(final, flags) if final else None
+
+        # Candidate starts: a first formula followed by a separator
+        # (both a link and, in every pattern here, the final piece start with one)
+        self._start = re.compile(f"(?:{first})(?={sep})", flags)
+
+    @property
+    def source(self) -> str:
+        """The equivalent single regex (what the scanner replaces)"""
+        links = f"(?:{self.sep_source}{self.next_source})" + ('+' if self.min_links else '*')
+        final = self.final_source or ''
+        if self.final_in_group:
+            return f"({self.first_source}{links}{final})"
+        return f"({self.first_source}{links}){final}"
+
+    def _end_at(self, text: str, end: int) -> Optional[Tuple[int, int]]:
+        """(group end, match end) if the final piece matches after a formula ending at end"""
+        if self._final is None:
+            return end, end
+        match = self._final.match(text, end)
+        if match is None:
+            return None
+        return (match.end() if self.final_in_group else end), match.end()
+
+    def _resolve(self, text: str, end: int, memo: Dict[int, Optional[Tuple[int, int]]]) -> Optional[Tuple[int, int]]:
+        """
+        Best match continuing from a formula that ends at end.
+
+        Greedy like the regex: take as many links as possible, then back off
+        one link at a time until the final piece matches.
+        """
+        chain = []
+        while end not in memo:
+            chain.append(end)
+            link = self._link.match(text, end)
+            if link is None:
+                break
+            end = link.end()
+
+        result = memo.get(end) if end in memo else None
+        for end in reversed(chain):
+            if result is None:
+                result = self._end_at(text, end)
+            memo[end] = result
+        return result
+
+    def finditer(self, text: str):
+        """
+        Yield (group start, group end) of every match, like re.finditer
+
+        Matches are non-overlapping and found left to right.
+        """
+        memo = {}
+        pos = 0
+        while True:
+            candidate = self._start.search(text, pos)
+            if candidate is None:
+                return
+            start = candidate.start()
+            first_end = self._first.match(text, start).end()
+
+            if self.min_links:
+                link = self._link.match(text, first_end)
+                result = self._resolve(text, link.end(), memo) if link else None
+            else:
+                result = self._resolve(text, first_end, memo)
+
+            if result is None:
+                pos = start + 1
+                continue
+
+            group_end, match_end = result
+            yield start, group_end
+            pos = match_end
+
+
+class FormulaScanner:
+    """Finds chemical systems in text with a set of chain patterns."""
+
+    def __init__(self, patterns: List[ChainPattern], normalize: Callable[[str], Optional[str]]):
+        """
+        Args:
+            patterns: Chain patterns, scanned in order
+            normalize: Maps a matched string to a system name, or None to drop it
+        """
+        self.patterns = patterns
+        self.normalize = normalize
+
+    def scan(self, text: str) -> List[str]:
+        """
+        Find chemical systems in text.
+
+        Returns:
+            Normalized systems, without duplicates, in the order found
+            (all matches of the first pattern, then the second, ...)
+        """
+        systems = {}
+        for pattern in self.patterns:
+            for start, end in pattern.finditer(text):
+                system = self.normalize(text[start:end])
+                if system:
+                    systems.setdefault(system, None)
+        return list(systems)
+
+    def scan_with_regex(self, text: str) -> List[str]:
+        """Reference implementation: re.finditer over each pattern's single regex"""
+        systems = {}
+        for pattern in self.patterns:
+            for match in re.finditer(pattern.source, text, pattern.flags):
+                system = self.normalize(match.group(1))
+                if system:
+                    systems.setdefault(system, None)
+        return list(systems)
+
+
+def _normalize_system(match_text: str) -> Optional[str]:
+    """Normalization of identify_systems: no spaces, 'H2O', plain hyphens"""
+    system = re.sub(r'\s+', '', match_text.strip())
+    system = re.sub(r'H\s*2?\s*O', 'H2O', system)
+    system = re.sub(r'[–—]', '-', system)
+    return system if 'H2O' in system else None
+
+
+def _normalize_chemical_system(match_text: str) -> Optional[str]:
+    """Normalization of extract_chemical_systems: no spaces, must contain water"""
+    system = re.sub(r'\s+', '', match_text.strip())
+    if 'H2O' in system or 'H O' in system:
+        return system.replace('H O', 'H2O')
+    return None
+
+
+_WATER = r'\s*[-–—]\s*H\s*2?\s*O'
+_FORMULA = r'[A-Z][a-z]?\d*(?:\([A-Z][a-z]?\d*\))?[A-Z][a-z0-9()]*'
+_SIMPLE_FORMULA = r'[A-Z][a-z]?\d*[A-Z][A-Za-z0-9]*'
+
+# Systems in page text and table text (identify_systems)
+SYSTEM_SCANNER = FormulaScanner([
+    # Full system pattern with H2O
+    ChainPattern(_FORMULA, r'\s*[-–—]\s*', final=_WATER),
+
+    # Phosphate-specific patterns
+    ChainPattern(
+        r'(?:Na|K|Mg|Ca|NH4|Li|Rb|Cs)\d*(?:H\d?)?\s*(?:PO4|P2O7|HPO4|H2PO4)',
+        r'\s*[-–—]\s*',
+        r'(?:Na|K|Mg|Ca|NH4|Li|Rb|Cs|H)\d*(?:H\d?)?\s*(?:PO4|P2O7|HPO4|H2PO4|O)',
+        final=_WATER
+    ),
+], _normalize_system)
+
+# Systems named in the PDF text (extract_chemical_systems)
+CHEMICAL_SYSTEM_SCANNER = FormulaScanner([
+    # Chemical formula with hyphens (most common)
+    ChainPattern(_SIMPLE_FORMULA, '-', min_links=1),
+
+    # System with "system" keyword
+    ChainPattern(_SIMPLE_FORMULA, r'\s*[-–]\s*', final=r'\s+system', min_links=1, final_in_group=False),
+
+    # Phosphate systems (specific to SDS-31)
+    ChainPattern(
+        r'(?:Na|K|Mg|Ca|NH4)\d*(?:H|HP)?(?:PO4|P2O7)',
+        r'\s*[-–]\s*',
+        r'(?:Na|K|Mg|Ca|NH4|H)\d*(?:H|HP)?(?:PO4|P2O7|O)',
+        final=r'\s*[-–]\s*H\s*2?\s*O'
+    ),
+], _normalize_chemical_system)
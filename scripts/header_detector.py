@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import json
 
+from value_cache import memoize_values
+
 
 class HeaderDetector:
     """Detects and corrects table headers using multiple strategies."""
@@ -302,8 +304,9 @@ class HeaderDetector:
 
         return new_df, 0.3  # Low confidence, but better than nothing
 
-    # Helper methods for type checking
+    # Helper methods for type checking (memoized by cell text, shared by all instances)
 
+    @memoize_values('header_is_temperature_range')
     def _is_temperature_range(self, value) -> bool:
         """Check if value looks like temperature (typically -50 to 500°C)."""
         try:
@@ -312,6 +315,7 @@ class HeaderDetector:
         except:
             return False
 
+    @memoize_values('header_is_percentage_range')
     def _is_percentage_range(self, value) -> bool:
         """Check if value is in 0-100 range (mass %)."""
         try:
@@ -320,6 +324,7 @@ class HeaderDetector:
         except:
             return False
 
+    @memoize_values('header_is_ph_range')
     def _is_ph_range(self, value) -> bool:
         """Check if value is in pH range (0-14)."""
         try:
@@ -328,11 +333,13 @@ class HeaderDetector:
         except:
             return False
 
+    @memoize_values('header_is_phase_label')
     def _is_phase_label(self, value) -> bool:
         """Check if value looks like phase label (A, B, II, etc.)."""
         value_str = str(value).strip()
         return bool(re.match(r'^([A-F]|I{1,4}|IV|V|VI)(\+[A-F])?$', value_str))
 
+    @memoize_values('header_is_small_decimal')
     def _is_small_decimal(self, value) -> bool:
         """Check if value is small decimal (< 10, typical for molality)."""
         try:
@@ -341,6 +348,7 @@ class HeaderDetector:
         except:
             return False
 
+    @memoize_values('header_is_numeric')
     def _is_numeric(self, value) -> bool:
         """Check if value is numeric."""
         try:
@@ -350,6 +358,53 @@ class HeaderDetector:
             return False
 
 
+def header_record(filename: str, original_headers: List, improved_df: pd.DataFrame, detection_info: Dict) -> Dict:
+    """
+    Report entry of one table (an element of the report's 'files')
+
+    Args:
+        filename: Name of the table's CSV
+        original_headers: Headers before detection
+        improved_df: Table returned by detect_headers
+        detection_info: Metadata returned by detect_headers
+    """
+    new_headers = list(improved_df.columns)
+    return {
+        'filename': filename,
+        'original_headers': [str(h) for h in original_headers[:5]],  # First 5, convert to str
+        'new_headers': [str(h) for h in new_headers[:5]],  # First 5, convert to str
+        'method': detection_info['method'],
+        'confidence': float(detection_info['confidence']),
+        # Check if headers actually improved
+        'improved': bool(new_headers != original_headers)
+    }
+
+
+def header_report(records: List[Dict]) -> Dict:
+    """
+    Header improvement report from the entries of all tables (see header_record)
+
+    Returns:
+        Dict with total_files, improved, methods_used, avg_confidence and files
+    """
+    results = {
+        'total_files': len(records),
+        'improved': sum(1 for record in records if record['improved']),
+        'methods_used': {},
+        'avg_confidence': 0.0,
+        'files': records
+    }
+
+    total_confidence = 0
+    for record in records:
+        method = record['method']
+        results['methods_used'][method] = results['methods_used'].get(method, 0) + 1
+        total_confidence += record['confidence']
+
+    results['avg_confidence'] = float(total_confidence / len(records)) if records else 0.0
+    return results
+
+
 def improve_headers_batch(
     input_dir: Path,
     output_dir: Path,
@@ -373,16 +428,8 @@ def improve_headers_batch(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    results = {
-        'total_files': 0,
-        'improved': 0,
-        'methods_used': {},
-        'avg_confidence': 0.0,
-        'files': []
-    }
-
+    records = []
     csv_files = sorted(input_dir.glob('*.csv'))
-    total_confidence = 0
 
     for csv_file in csv_files:
         try:
@@ -400,42 +447,22 @@ def improve_headers_batch(
 
             # Detect headers
             improved_df, detection_info = detector.detect_headers(df, column_types)
-            new_headers = list(improved_df.columns)
-
-            # Check if headers actually improved
-            improved = new_headers != original_headers
 
             # Save improved table
             output_file = output_dir / csv_file.name
             improved_df.to_csv(output_file, index=False)
 
             # Track results
-            method = detection_info['method']
-            confidence = detection_info['confidence']
-
-            results['total_files'] += 1
-            if improved:
-                results['improved'] += 1
-            results['methods_used'][method] = results['methods_used'].get(method, 0) + 1
-            total_confidence += confidence
-
-            results['files'].append({
-                'filename': csv_file.name,
-                'original_headers': [str(h) for h in original_headers[:5]],  # First 5, convert to str
-                'new_headers': [str(h) for h in new_headers[:5]],  # First 5, convert to str
-                'method': method,
-                'confidence': float(confidence),
-                'improved': bool(improved)
-            })
+            records.append(header_record(csv_file.name, original_headers, improved_df, detection_info))
 
-            if results['total_files'] % 50 == 0:
-                print(f"Processed {results['total_files']} files...")
+            if len(records) % 50 == 0:
+                print(f"Processed {len(records)} files...")
 
         except Exception as e:
             print(f"Error processing {csv_file.name}: {e}")
             continue
 
-    results['avg_confidence'] = float(total_confidence / results['total_files']) if results['total_files'] > 0 else 0.0
+    results = header_report(records)
 
     # Save summary report
     report_file = output_dir / '_header_improvement_report.json'
@@ -5,12 +5,14 @@ This script analyzes PDFs to extract chemical system information and creates
 a mapping of table files to chemical systems (e.g., "Na3PO4-H2O").
 """
 
+import csv
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple
-import tabula
-import pandas as pd
+from typing import Dict, Iterator, List, Tuple
+
+from formula_scanner import SYSTEM_SCANNER
+from page_index import DEFAULT_INDEX_DIR, load_page_index
 
 
 def extract_system_from_text(text: str) -> List[str]:
@@ -26,43 +28,17 @@ def extract_system_from_text(text: str) -> List[str]:
         text: Text to search for chemical systems
 
     Returns:
-        List of chemical system strings
+        List of chemical system strings, in the order found
     """
-    systems = set()
-
-    # Pattern for chemical formulas with components separated by hyphens
-    # Matches things like: Na3PO4-H2O, MgHPO4-Na2HPO4-H2O
-    patterns = [
-        # Full system pattern with H2O
-        r'([A-Z][a-z]?\d*(?:\([A-Z][a-z]?\d*\))?[A-Z][a-z0-9()]*(?:\s*[-–—]\s*[A-Z][a-z]?\d*(?:\([A-Z][a-z]?\d*\))?[A-Z][a-z0-9()]*)*\s*[-–—]\s*H\s*2?\s*O)',
-
-        # Phosphate-specific patterns
-        r'((?:Na|K|Mg|Ca|NH4|Li|Rb|Cs)\d*(?:H\d?)?\s*(?:PO4|P2O7|HPO4|H2PO4)(?:\s*[-–—]\s*(?:Na|K|Mg|Ca|NH4|Li|Rb|Cs|H)\d*(?:H\d?)?\s*(?:PO4|P2O7|HPO4|H2PO4|O))*\s*[-–—]\s*H\s*2?\s*O)',
-    ]
-
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            system = match.group(1).strip()
-            # Clean up spacing
-            system = re.sub(r'\s+', '', system)
-            # Normalize H2O
-            system = re.sub(r'H\s*2?\s*O', 'H2O', system)
-            # Normalize hyphens
-            system = re.sub(r'[–—]', '-', system)
-
-            if 'H2O' in system:
-                systems.add(system)
-
-    return list(systems)
+    return SYSTEM_SCANNER.scan(text)
 
 
-def identify_systems_in_pdf(pdf_path: Path, part_name: str) -> Dict[str, str]:
+def identify_systems_in_pdf(pdf_path: Path, part_name: str, index_dir: Path = DEFAULT_INDEX_DIR) -> Dict[str, str]:
     """
     Identify chemical systems for all tables in a PDF.
 
     Strategy:
-    1. Extract text from each page
+    1. Read each page's text from the page index
     2. Look for chemical system patterns
     3. Associate systems with tables on that page
     4. Track page-to-page context
@@ -70,12 +46,11 @@ def identify_systems_in_pdf(pdf_path: Path, part_name: str) -> Dict[str, str]:
     Args:
         pdf_path: Path to PDF file
         part_name: Part name (e.g., "Part1")
+        index_dir: Directory holding page index files
 
     Returns:
         Dict mapping filename -> chemical system
     """
-    import pdfplumber
-
     mapping = {}
     current_system = "Unknown"
     table_counter = 1
@@ -83,28 +58,25 @@ def identify_systems_in_pdf(pdf_path: Path, part_name: str) -> Dict[str, str]:
     print(f"\nProcessing {pdf_path.name}...")
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                # Extract text from page
-                text = page.extract_text() or ""
-
-                # Count tables on this page
-                tables = page.find_tables()
-                num_tables = len(tables)
-
-                # Look for chemical system in text
-                systems_found = extract_system_from_text(text)
-
-                if systems_found:
-                    # Use the first system found (usually the main one)
-                    current_system = systems_found[0]
-                    print(f"  Page {page_num}: Found system '{current_system}' ({num_tables} tables)")
-
-                # Assign current system to all tables on this page
-                for _ in range(num_tables):
-                    filename = f"SDS-31_{part_name}_table_{table_counter:03d}.csv"
-                    mapping[filename] = current_system
-                    table_counter += 1
+        # Text and table counts come from the page index (one scan per PDF)
+        for page in load_page_index(pdf_path, index_dir):
+            page_num = page['page']
+            text = page['text']
+            num_tables = page['num_tables']
+
+            # Look for chemical system in text
+            systems_found = extract_system_from_text(text)
+
+            if systems_found:
+                # Use the first system found (usually the main one)
+                current_system = systems_found[0]
+                print(f"  Page {page_num}: Found system '{current_system}' ({num_tables} tables)")
+
+            # Assign current system to all tables on this page
+            for _ in range(num_tables):
+                filename = f"SDS-31_{part_name}_table_{table_counter:03d}.csv"
+                mapping[filename] = current_system
+                table_counter += 1
 
     except Exception as e:
         print(f"  Warning: Could not process {pdf_path.name}: {e}")
@@ -114,15 +86,53 @@ def identify_systems_in_pdf(pdf_path: Path, part_name: str) -> Dict[str, str]:
     return mapping
 
 
-def create_system_mapping_tabula_fallback(data_dir: Path) -> Dict[str, Dict]:
+def render_table_text(csv_path: Path) -> str:
     """
-    Create system mapping using tabula-py (fallback method).
+    Plain-text rendering of an extracted table for system pattern matching.
+
+    Rows are read straight from the CSV, which is much cheaper than building
+    a DataFrame and calling to_string(). The layout keeps what matters to the
+    patterns in extract_system_from_text: a header line, each row starting
+    with its index, whitespace between cells and 'NaN' for empty cells.
+    """
+    with open(csv_path, newline='') as f:
+        rows = csv.reader(f)
+        lines = ["  ".join(next(rows, []))]
+        for i, row in enumerate(rows):
+            lines.append("  ".join([str(i)] + [cell if cell else "NaN" for cell in row]))
+    return "\n".join(lines)
+
+
+def iter_extracted_tables(extracted_dir: Path, part_name: str) -> Iterator[Tuple[int, Path]]:
+    """
+    Stream the extracted CSVs of one SDS-31 part in table order.
+
+    Yields:
+        (table_num, csv_path)
+    """
+    tables = []
+    for csv_path in extracted_dir.glob(f"SDS-31_{part_name}_table_*.csv"):
+        match = re.search(r'_table_(\d+)\.csv$', csv_path.name)
+        if match:
+            tables.append((int(match.group(1)), csv_path))
+    yield from sorted(tables)
+
+
+def create_system_mapping_tabula_fallback(
+    data_dir: Path,
+    extracted_dir: Path = Path('output/01_extracted')
+) -> Dict[str, Dict]:
+    """
+    Create system mapping from the tables tabula already extracted (fallback method).
 
     This analyzes the text content of extracted tables to infer systems.
     Less accurate than PDF text extraction but works without pdfplumber.
+    The PDFs themselves are not read again: tables come from the extraction
+    stage's CSVs.
 
     Args:
-        data_dir: Directory containing PDFs
+        data_dir: Directory containing PDFs (selects the SDS-31 parts)
+        extracted_dir: Directory with the extracted CSVs
 
     Returns:
         Dict mapping filename -> {system, part, confidence}
@@ -130,6 +140,10 @@ def create_system_mapping_tabula_fallback(data_dir: Path) -> Dict[str, Dict]:
     mapping = {}
     pdf_files = sorted(data_dir.glob("SDS-31_Part*.pdf"))
 
+    if not any(extracted_dir.glob("SDS-31_Part*_table_*.csv")):
+        print(f"Warning: No extracted SDS-31 tables in {extracted_dir}; run extraction first")
+        return mapping
+
     for pdf_file in pdf_files:
         # Extract part number
         match = re.search(r'Part(\d+)', pdf_file.name)
@@ -137,38 +151,25 @@ def create_system_mapping_tabula_fallback(data_dir: Path) -> Dict[str, Dict]:
             continue
 
         part_name = f"Part{match.group(1)}"
-        table_num = 1
-
-        try:
-            # Read PDF with tabula to get text context
-            tables = tabula.read_pdf(
-                str(pdf_file),
-                pages='all',
-                multiple_tables=True,
-                pandas_options={'header': None}
-            )
-
-            current_system = "Unknown"
-
-            for table in tables:
-                # Convert table to string and search for chemical formulas
-                table_text = table.to_string()
-                systems = extract_system_from_text(table_text)
-
-                if systems:
-                    current_system = systems[0]
-
-                filename = f"SDS-31_{part_name}_table_{table_num:03d}.csv"
-                mapping[filename] = {
-                    'system': current_system,
-                    'part': part_name,
-                    'table_num': table_num,
-                    'confidence': 'high' if systems else 'low'
-                }
-                table_num += 1
-
-        except Exception as e:
-            print(f"Warning: Could not process {pdf_file.name} with tabula: {e}")
+        current_system = "Unknown"
+
+        for table_num, csv_path in iter_extracted_tables(extracted_dir, part_name):
+            try:
+                # Search the table's text for chemical formulas
+                systems = extract_system_from_text(render_table_text(csv_path))
+            except Exception as e:
+                print(f"Warning: Could not read {csv_path.name}: {e}")
+                systems = []
+
+            if systems:
+                current_system = systems[0]
+
+            mapping[csv_path.name] = {
+                'system': current_system,
+                'part': part_name,
+                'table_num': table_num,
+                'confidence': 'high' if systems else 'low'
+            }
 
     return mapping
 
@@ -193,7 +194,13 @@ def save_system_mapping(mapping: Dict, output_path: Path):
         print(f"  {system}: {count} tables")
 
 
-def identify_all_systems(data_dir: Path, output_path: Path, use_pdfplumber: bool = True) -> Dict:
+def identify_all_systems(
+    data_dir: Path,
+    output_path: Path,
+    use_pdfplumber: bool = True,
+    extracted_dir: Path = Path('output/01_extracted'),
+    index_dir: Path = DEFAULT_INDEX_DIR
+) -> Dict:
     """
     Main function to identify chemical systems for all PDFs.
 
@@ -201,6 +208,8 @@ def identify_all_systems(data_dir: Path, output_path: Path, use_pdfplumber: bool
         data_dir: Directory containing PDF files
         output_path: Path to save mapping JSON
         use_pdfplumber: Whether to use pdfplumber (more accurate) or tabula (fallback)
+        extracted_dir: Extracted CSVs read by the tabula fallback
+        index_dir: Page index read by the pdfplumber method
 
     Returns:
         System mapping dict
@@ -220,7 +229,7 @@ def identify_all_systems(data_dir: Path, output_path: Path, use_pdfplumber: bool
                 match = re.search(r'Part(\d+)', pdf_file.name)
                 if match:
                     part_name = f"Part{match.group(1)}"
-                    part_mapping = identify_systems_in_pdf(pdf_file, part_name)
+                    part_mapping = identify_systems_in_pdf(pdf_file, part_name, index_dir)
                     all_mapping.update(part_mapping)
 
             # Convert to full format
@@ -239,9 +248,9 @@ def identify_all_systems(data_dir: Path, output_path: Path, use_pdfplumber: bool
 
         except ImportError:
             print("Warning: pdfplumber not available, using tabula fallback")
-            mapping = create_system_mapping_tabula_fallback(data_dir)
+            mapping = create_system_mapping_tabula_fallback(data_dir, extracted_dir)
     else:
-        mapping = create_system_mapping_tabula_fallback(data_dir)
+        mapping = create_system_mapping_tabula_fallback(data_dir, extracted_dir)
 
     save_system_mapping(mapping, output_path)
 
@@ -264,11 +273,15 @@ def main():
                       help='Output path for system mapping JSON')
     parser.add_argument('--method', choices=['pdfplumber', 'tabula'], default='tabula',
                       help='Method to use for system identification')
+    parser.add_argument('--extracted-dir', type=Path, default=Path('output/01_extracted'),
+                      help='Extracted CSVs used by the tabula method')
+    parser.add_argument('--index-dir', type=Path, default=DEFAULT_INDEX_DIR,
+                      help='Page index used by the pdfplumber method')
 
     args = parser.parse_args()
 
     use_pdfplumber = args.method == 'pdfplumber'
-    result = identify_all_systems(args.data_dir, args.output, use_pdfplumber)
+    result = identify_all_systems(args.data_dir, args.output, use_pdfplumber, args.extracted_dir, args.index_dir)
 
     if result['success']:
         print(f"\n✓ Successfully identified systems for {result['total_tables']} tables")
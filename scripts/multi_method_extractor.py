@@ -13,89 +13,318 @@ This approach is used by leading tools and can boost accuracy by 5-10%.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import json
-import tabula
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from difflib import SequenceMatcher
 
+from tabula_session import close_session
+from extraction_cache import read_page
+from page_index import DEFAULT_INDEX_DIR, table_areas
+
+
+def _try_float(value) -> Tuple[bool, float]:
+    try:
+        return True, float(value)
+    except (ValueError, TypeError):
+        return False, np.nan
+
+
+def _float_or_text(text: str):
+    """float(text), or text itself where it is not a number"""
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _area_key(area: Optional[List]) -> Optional[Tuple]:
+    """Hashable form of a tabula area (one [top, left, bottom, right] or a list of them)"""
+    if not area:
+        return None
+    return tuple(tuple(a) if isinstance(a, (list, tuple)) else a for a in area)
+
+
+_parse_floats = np.frompyfunc(_try_float, 1, 2)
+_normalize_strings = np.frompyfunc(lambda value: str(value).strip().lower(), 1, 1)
+_strip_strings = np.frompyfunc(lambda value: str(value).strip(), 1, 1)
+
+
+def _cell_values(df: pd.DataFrame) -> np.ndarray:
+    """
+    Object array of a DataFrame's cells, holding the same scalars df.iloc[i, j]
+    returns (e.g. np.float32 rather than float, which prints differently)
+    """
+    values = np.empty(df.shape, dtype=object)
+    for j in range(df.shape[1]):
+        column = df.iloc[:, j].to_numpy()
+        values[:, j] = column if column.dtype == object else list(column)
+    return values
+
+
+class _CellArrays:
+    """A DataFrame's cells parsed once into arrays for vectorized comparison."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.values = _cell_values(df)
+        self.na = pd.isna(self.values)
+
+        # float() per cell, as _values_match does
+        numeric, floats = _parse_floats(self.values) if self.values.size else (self.values, self.values)
+        self.numeric = numeric.astype(bool)
+        self.floats = floats.astype(float)
+
+    def normalized(self, mask: np.ndarray) -> np.ndarray:
+        """Stripped, lower-cased strings of the cells selected by mask"""
+        return _normalize_strings(self.values[mask]).astype(object)
+
 
 class MultiMethodExtractor:
     """Extract tables using multiple methods and find consensus."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        method_timeout: Optional[float] = None,
+        use_table_areas: bool = True,
+        index_dir: Path = DEFAULT_INDEX_DIR
+    ):
+        """
+        Args:
+            max_workers: Methods run concurrently per page (default: one thread
+                per method, 1 = sequential)
+            method_timeout: Seconds each method may take on a page before its
+                result is dropped, counted from when the method starts running
+                (default: no limit). A method still queued behind the others
+                waits for a free worker first; if none frees up within the
+                timeout (workers held by timed-out methods), it is reported
+                as timed out too. A timed-out method is abandoned, not
+                cancelled: a tabula (JVM) or pdfplumber call cannot be
+                interrupted, so it keeps running in its thread until it
+                finishes. Its result is not memoized, so the method is tried
+                again the next time the page is requested.
+            use_table_areas: When no area is given, restrict every method to the
+                table boxes recorded in the page index (pages without recorded
+                boxes are read whole)
+            index_dir: Directory holding page index files
+        """
+        self.max_workers = max_workers
+        self.method_timeout = method_timeout
+        self.use_table_areas = use_table_areas
+        self.index_dir = index_dir
+        self._areas = {}
+
+        # Each method extracts every table on a page: (pdf_path, page, area) -> List[DataFrame]
         self.methods = {
             'tabula_default': self._extract_tabula_default,
             'tabula_lattice': self._extract_tabula_lattice,
             'tabula_stream': self._extract_tabula_stream,
             # 'chemdataextractor': self._extract_chemdataextractor,  # Add when available
         }
+        # Page-level results per (pdf, page, area, method), shared by all tables on the page
+        self._page_results = {}
+        self.invocations = {}
+        self.memo_hits = 0
 
-    def extract_with_all_methods(
+    def register_method(self, name: str, method_func: Callable):
+        """
+        Add an extraction backend to the concurrent fan-out.
+
+        Example (pdfplumber, as in archive/extract_solubility_data.py):
+            def extract_pdfplumber(pdf_path, page, area=None):
+                with pdfplumber.open(pdf_path) as pdf:
+                    return [pd.DataFrame(t) for t in pdf.pages[page - 1].extract_tables()]
+
+            extractor.register_method('pdfplumber', extract_pdfplumber)
+
+        Args:
+            name: Method name (key in the results dicts)
+            method_func: (pdf_path, page, area) -> list of DataFrames on the
+                page (a single DataFrame is also accepted)
+        """
+        self.methods[name] = method_func
+
+    def page_area(self, pdf_path: Path, page: int) -> Optional[List[List[float]]]:
+        """
+        Recorded table areas of a page (loaded once per PDF)
+
+        Returns:
+            List of areas [top, left, bottom, right], or None to read the whole page
+        """
+        key = str(pdf_path)
+        if key not in self._areas:
+            try:
+                self._areas[key] = table_areas(pdf_path, self.index_dir)
+            except Exception as e:
+                print(f"  ⚠ No table areas for {Path(pdf_path).name} ({e}), reading whole pages")
+                self._areas[key] = {}
+        return self._areas[key].get(int(page))
+
+    def _run_methods(self, method_names: List[str], pdf_path: Path, page: int, area: Optional[List]) -> Dict:
+        """
+        Run methods on one page concurrently.
+
+        Returns:
+            dict mapping method name to its tables ([] on failure, None on timeout)
+        """
+        started = {name: threading.Event() for name in method_names}
+        start_times = {}
+
+        def run(method_name):
+            # Each method's timeout counts from here, not from when it was queued
+            start_times[method_name] = time.monotonic()
+            started[method_name].set()
+            tables = self.methods[method_name](pdf_path, page, area)
+            # Methods may return a single DataFrame for the whole page
+            if isinstance(tables, pd.DataFrame):
+                tables = [tables]
+            return [df for df in tables if df is not None]
+
+        workers = self.max_workers or len(method_names)
+        if not method_names or (workers <= 1 and not self.method_timeout):
+            futures = None
+        else:
+            executor = ThreadPoolExecutor(max_workers=max(1, workers))
+            futures = {name: executor.submit(run, name) for name in method_names}
+
+        results = {}
+        for method_name in method_names:
+            try:
+                if futures is None:
+                    results[method_name] = run(method_name)
+                elif not self.method_timeout:
+                    results[method_name] = futures[method_name].result()
+                elif not started[method_name].wait(self.method_timeout):
+                    print(f"  {method_name} did not start within {self.method_timeout}s "
+                          f"(workers busy with timed-out methods)")
+                    results[method_name] = None
+                else:
+                    remaining = start_times[method_name] + self.method_timeout - time.monotonic()
+                    results[method_name] = futures[method_name].result(timeout=max(0.0, remaining))
+            except FutureTimeout:
+                print(f"  {method_name} timed out after {self.method_timeout}s")
+                results[method_name] = None
+            except Exception as e:
+                print(f"  {method_name} failed: {e}")
+                results[method_name] = []
+
+        if futures is not None:
+            # Don't wait for timed-out methods: they are abandoned (still
+            # running in their threads), their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def extract_page_with_all_methods(
         self,
         pdf_path: Path,
         page: int,
         area: Optional[List] = None
+    ) -> Dict[str, List[pd.DataFrame]]:
+        """
+        Extract every table on a page with each method (memoized per page and method).
+
+        Args:
+            pdf_path: Path to PDF file
+            page: 1-based page number
+            area: Area [top, left, bottom, right] or list of areas (default:
+                the page's recorded table areas, see use_table_areas)
+
+        Returns:
+            dict mapping method name to the page's tables, in page order
+        """
+        if area is None and self.use_table_areas:
+            area = self.page_area(pdf_path, page)
+
+        keys = {
+            method_name: (str(pdf_path), int(page), _area_key(area), method_name)
+            for method_name in self.methods
+        }
+
+        pending = [method_name for method_name, key in keys.items() if key not in self._page_results]
+        self.memo_hits += len(keys) - len(pending)
+        for method_name in pending:
+            self.invocations[method_name] = self.invocations.get(method_name, 0) + 1
+
+        for method_name, tables in self._run_methods(pending, pdf_path, page, area).items():
+            # Timed-out methods are not memoized, so a later call retries them
+            if tables is not None:
+                self._page_results[keys[method_name]] = tables
+
+        # Registration order, regardless of which method finished first
+        return {
+            method_name: self._page_results[key]
+            for method_name, key in keys.items()
+            if self._page_results.get(key)
+        }
+
+    def extract_with_all_methods(
+        self,
+        pdf_path: Path,
+        page: int,
+        area: Optional[List] = None,
+        table_index: int = 0
     ) -> Dict[str, pd.DataFrame]:
         """
         Extract table using all available methods.
 
+        Args:
+            pdf_path: Path to PDF file
+            page: 1-based page number
+            area: Optional area [top, left, bottom, right] or list of areas
+                (default: the page's recorded table areas)
+            table_index: Which table on the page (0 = first)
+
         Returns:
             dict mapping method name to extracted DataFrame
         """
         results = {}
 
-        for method_name, method_func in self.methods.items():
-            try:
-                df = method_func(pdf_path, page, area)
-                if df is not None and not df.empty:
-                    results[method_name] = df
-            except Exception as e:
-                print(f"  {method_name} failed: {e}")
-                continue
+        for method_name, tables in self.extract_page_with_all_methods(pdf_path, page, area).items():
+            if table_index < len(tables) and not tables[table_index].empty:
+                results[method_name] = tables[table_index]
 
         return results
 
+    def invocation_stats(self) -> Dict:
+        """Extraction calls actually made per method, and calls served from the page memo"""
+        return {
+            'invocations': dict(self.invocations),
+            'total_invocations': sum(self.invocations.values()),
+            'memo_hits': self.memo_hits,
+        }
+
     def _extract_tabula_default(
         self,
         pdf_path: Path,
         page: int,
         area: Optional[List] = None
-    ) -> pd.DataFrame:
+    ) -> List[pd.DataFrame]:
         """Extract using tabula default settings (current method)."""
-        kwargs = {'pages': page, 'multiple_tables': False}
-        if area:
-            kwargs['area'] = area
-
-        tables = tabula.read_pdf(str(pdf_path), **kwargs)
-        return tables[0] if tables else pd.DataFrame()
+        return read_page(pdf_path, page, mode='tabula_default', area=area or None,
+                         multiple_tables=True)
 
     def _extract_tabula_lattice(
         self,
         pdf_path: Path,
         page: int,
         area: Optional[List] = None
-    ) -> pd.DataFrame:
+    ) -> List[pd.DataFrame]:
         """Extract using tabula lattice mode (better for gridded tables)."""
-        kwargs = {'pages': page, 'lattice': True, 'multiple_tables': False}
-        if area:
-            kwargs['area'] = area
-
-        tables = tabula.read_pdf(str(pdf_path), **kwargs)
-        return tables[0] if tables else pd.DataFrame()
+        return read_page(pdf_path, page, mode='tabula_lattice', area=area or None,
+                         lattice=True, multiple_tables=True)
 
     def _extract_tabula_stream(
         self,
         pdf_path: Path,
         page: int,
         area: Optional[List] = None
-    ) -> pd.DataFrame:
+    ) -> List[pd.DataFrame]:
         """Extract using tabula stream mode (better for non-gridded tables)."""
-        kwargs = {'pages': page, 'stream': True, 'multiple_tables': False}
-        if area:
-            kwargs['area'] = area
-
-        tables = tabula.read_pdf(str(pdf_path), **kwargs)
-        return tables[0] if tables else pd.DataFrame()
+        return read_page(pdf_path, page, mode='tabula_stream', area=area or None,
+                         stream=True, multiple_tables=True)
 
     def _extract_chemdataextractor(
         self,
@@ -179,10 +408,11 @@ class MultiMethodExtractor:
         df_a: pd.DataFrame,
         df_b: pd.DataFrame,
         name_a: str,
-        name_b: str
+        name_b: str,
+        tolerance: float = 1e-6
     ) -> Tuple[float, List[Dict]]:
         """
-        Compare two DataFrames cell-by-cell.
+        Compare two DataFrames cell-by-cell (vectorized; same rules as _values_match).
 
         Returns:
             (agreement_score, list_of_discrepancies)
@@ -198,29 +428,44 @@ class MultiMethodExtractor:
             }]
 
         total_cells = df_a.shape[0] * df_a.shape[1]
-        matching_cells = 0
-        discrepancies = []
+        if total_cells == 0:
+            return 0.0, []
 
-        for i in range(df_a.shape[0]):
-            for j in range(df_a.shape[1]):
-                val_a = df_a.iloc[i, j]
-                val_b = df_b.iloc[i, j]
+        cells_a = _CellArrays(df_a)
+        cells_b = _CellArrays(df_b)
 
-                if self._values_match(val_a, val_b):
-                    matching_cells += 1
-                else:
-                    discrepancies.append({
-                        'type': 'value_mismatch',
-                        'row': i,
-                        'col': j,
-                        'method_a': name_a,
-                        'value_a': str(val_a),
-                        'method_b': name_b,
-                        'value_b': str(val_b),
-                        'similarity': self._string_similarity(str(val_a), str(val_b))
-                    })
-
-        agreement = matching_cells / total_cells if total_cells > 0 else 0.0
+        # Same rules as _values_match, evaluated for all cells at once
+        both_na = cells_a.na & cells_b.na
+        either_na = cells_a.na | cells_b.na
+        both_numeric = cells_a.numeric & cells_b.numeric & ~either_na
+        with np.errstate(invalid='ignore'):
+            numeric_match = both_numeric & (np.abs(cells_a.floats - cells_b.floats) < tolerance)
+
+        # Strings are only normalized where neither rule above decides
+        string_cells = ~either_na & ~both_numeric
+        string_match = np.zeros_like(string_cells)
+        string_match[string_cells] = cells_a.normalized(string_cells) == cells_b.normalized(string_cells)
+
+        matches = both_na | numeric_match | string_match
+        matching_cells = int(matches.sum())
+
+        # Similarity only for the mismatching cells (row-major order)
+        discrepancies = []
+        for i, j in zip(*np.nonzero(~matches)):
+            str_a = str(cells_a.values[i, j])
+            str_b = str(cells_b.values[i, j])
+            discrepancies.append({
+                'type': 'value_mismatch',
+                'row': int(i),
+                'col': int(j),
+                'method_a': name_a,
+                'value_a': str_a,
+                'method_b': name_b,
+                'value_b': str_b,
+                'similarity': self._string_similarity(str_a, str_b)
+            })
+
+        agreement = matching_cells / total_cells
         return agreement, discrepancies
 
     def _values_match(self, val_a, val_b, tolerance: float = 1e-6) -> bool:
@@ -255,7 +500,9 @@ class MultiMethodExtractor:
         Build consensus DataFrame using majority voting.
 
         For each cell, use the value that appears most frequently
-        across all extraction methods.
+        across all extraction methods (same result as _most_common_value,
+        ties going to the value seen first). The method outputs are stacked
+        into a padded (methods, rows, cols) array and all cells vote at once.
         """
         if not extractions:
             return pd.DataFrame()
@@ -263,25 +510,38 @@ class MultiMethodExtractor:
         # Find maximum shape (some methods may extract more rows/cols)
         max_rows = max(df.shape[0] for df in extractions.values())
         max_cols = max(df.shape[1] for df in extractions.values())
-
-        # Initialize consensus DataFrame
-        consensus = pd.DataFrame(index=range(max_rows), columns=range(max_cols))
-
-        # For each cell, find consensus value
-        for i in range(max_rows):
-            for j in range(max_cols):
-                values = []
-                for df in extractions.values():
-                    if i < df.shape[0] and j < df.shape[1]:
-                        val = df.iloc[i, j]
-                        if pd.notna(val):
-                            values.append(val)
-
-                if values:
-                    # Use most common value (majority voting)
-                    consensus.iloc[i, j] = self._most_common_value(values)
-
-        return consensus
+        shape = (len(extractions), max_rows, max_cols)
+
+        # Stripped string of every present cell; padding and NaN don't vote
+        votes = np.full(shape, None, dtype=object)
+        present = np.zeros(shape, dtype=bool)
+        for m, df in enumerate(extractions.values()):
+            values = _cell_values(df)
+            notna = ~pd.isna(values)
+            rows, cols = df.shape
+            present[m, :rows, :cols] = notna
+            votes[m, :rows, :cols][notna] = _strip_strings(values[notna])
+
+        # counts[k] = how many methods agree with method k's value
+        counts = np.zeros(shape, dtype=int)
+        for k in range(shape[0]):
+            for l in range(shape[0]):
+                counts[k] += present[l] & (votes[l] == votes[k])
+        counts[~present] = -1
+
+        # First method holding a most common value (= Counter's tie-break)
+        winner = counts.argmax(axis=0)
+        has_value = present.any(axis=0)
+        rows, cols = np.nonzero(has_value)
+
+        consensus = np.full((max_rows, max_cols), np.nan, dtype=object)
+        winning = votes[winner[rows, cols], rows, cols]
+
+        # Convert back to number where possible, once per distinct value
+        parsed = {text: _float_or_text(text) for text in set(winning)}
+        consensus[rows, cols] = [parsed[text] for text in winning]
+
+        return pd.DataFrame(consensus, index=range(max_rows), columns=range(max_cols))
 
     def _most_common_value(self, values: List):
         """Find most common value in a list."""
@@ -297,16 +557,17 @@ class MultiMethodExtractor:
         most_common = counts.most_common(1)[0][0]
 
         # Try to convert back to original type
-        try:
-            return float(most_common)
-        except ValueError:
-            return most_common
+        return _float_or_text(most_common)
 
 
 def validate_with_multiple_methods(
     pdf_path: Path,
     page_table_mapping: Dict[int, List[str]],
-    output_dir: Path
+    output_dir: Path,
+    max_workers: Optional[int] = None,
+    method_timeout: Optional[float] = None,
+    use_table_areas: bool = True,
+    index_dir: Path = DEFAULT_INDEX_DIR
 ) -> Dict:
     """
     Extract all tables using multiple methods and compare results.
@@ -315,11 +576,17 @@ def validate_with_multiple_methods(
         pdf_path: Path to PDF file
         page_table_mapping: Dict mapping page number to list of table names
         output_dir: Where to save consensus results
+        max_workers: Methods run concurrently per page (default: all at once)
+        method_timeout: Per-method time limit in seconds; timed-out methods are
+            abandoned (left running), not cancelled (default: none)
+        use_table_areas: Restrict methods to the table boxes in the page index
+        index_dir: Directory holding page index files
 
     Returns:
         dict with validation results
     """
-    extractor = MultiMethodExtractor()
+    extractor = MultiMethodExtractor(max_workers=max_workers, method_timeout=method_timeout,
+                                     use_table_areas=use_table_areas, index_dir=index_dir)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -337,12 +604,12 @@ def validate_with_multiple_methods(
     for page, table_names in page_table_mapping.items():
         print(f"\nProcessing page {page} ({len(table_names)} tables)...")
 
-        for table_name in table_names:
+        for table_index, table_name in enumerate(table_names):
             try:
                 print(f"  Extracting {table_name}...")
 
-                # Extract with all methods
-                extractions = extractor.extract_with_all_methods(pdf_path, page)
+                # Extract with all methods (each method reads the page once)
+                extractions = extractor.extract_with_all_methods(pdf_path, page, table_index=table_index)
 
                 if not extractions:
                     print(f"    ❌ No methods succeeded")
@@ -375,9 +642,10 @@ def validate_with_multiple_methods(
                 results['tables'].append({
                     'filename': table_name,
                     'page': page,
+                    'area': extractor.page_area(pdf_path, page) if use_table_areas else None,
                     'methods_used': comparison['methods'],
                     'agreement': float(agreement),
-                    'needs_review': comparison['needs_review'],
+                    'needs_review': bool(comparison['needs_review']),
                     'discrepancies': len(comparison['discrepancies']),
                     'consensus_file': str(consensus_file)
                 })
@@ -387,6 +655,7 @@ def validate_with_multiple_methods(
                 continue
 
     results['avg_agreement'] = total_agreement / results['total_tables'] if results['total_tables'] > 0 else 0
+    results['extraction_calls'] = extractor.invocation_stats()
 
     # Save detailed report
     report_file = output_dir / 'multi_method_validation_report.json'
@@ -425,7 +694,10 @@ def main():
         # Add more as needed
     }
 
-    results = validate_with_multiple_methods(pdf_path, page_table_mapping, output_dir)
+    try:
+        results = validate_with_multiple_methods(pdf_path, page_table_mapping, output_dir)
+    finally:
+        close_session()
 
     print(f"\n{'=' * 70}")
     print("RESULTS")
@@ -437,6 +709,12 @@ def main():
     print(f"  Medium (80-95%): {results['medium_agreement']} tables")
     print(f"  Low (<80%):      {results['low_agreement']} tables - ⚠️ needs review")
 
+    calls = results['extraction_calls']
+    print(f"\nExtraction calls: {calls['total_invocations']} "
+          f"({calls['memo_hits']} served from the page memo)")
+    for method_name, count in calls['invocations'].items():
+        print(f"  {method_name}: {count}")
+
     print(f"\n✓ Consensus tables saved to: {output_dir}")
     print(f"✓ Validation report saved to: {output_dir}/multi_method_validation_report.json")
 
@@ -0,0 +1,147 @@
+"""
+Numeric profile of a table
+
+The cleaning stages count numeric cells before and after cleaning.
+utils.count_numeric_values did this with a regex search on str(value) for
+every cell. NumericProfile computes, in one pass per table:
+
+- which cells hold a number (a digit in their text, as before),
+- the per-column share of non-missing cells that do (a Series indexed
+  like the table's columns),
+- the numeric cells parsed as floats (NaN where float() cannot parse
+  them, and for all other cells), computed on first use.
+
+All cells are taken as one object array and checked with one compiled
+search each; parsing factorizes the numeric cells, so each distinct number
+is parsed once. A profile can be refreshed for the columns a stage changed
+(e.g. the text columns after OCR cleaning) while the other columns are
+reused.
+
+`benchmark.py numeric` checks that the counts equal the per-cell regex on
+a corpus, and times both.
+
+Usage:
+    from numeric_profile import NumericProfile
+
+    profile = NumericProfile.from_frame(df)
+    profile.numeric_count, profile.column_ratios, profile.values
+    profile = profile.refresh(cleaned_df)
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from distinct_values import distinct_text
+
+_DIGIT = re.compile(r'\d')
+
+
+def _numeric_cells(values: np.ndarray):
+    """
+    (present, has-digit) masks of a 1-D object array
+
+    Non-strings are examined as str(value), like the per-cell regex did.
+    The tables are small, so one compiled search per cell is cheaper than
+    factorizing first.
+    """
+    present = pd.notna(values)
+    has_digit = np.zeros(len(values), dtype=bool)
+    search = _DIGIT.search
+    has_digit[present] = [search(value if type(value) is str else str(value)) is not None
+                          for value in values[present]]
+    return present, has_digit
+
+
+def _parse_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def _parsed_cells(values: np.ndarray, numeric: np.ndarray) -> np.ndarray:
+    """Floats of the numeric cells of a 1-D object array (NaN elsewhere)"""
+    parsed = np.full(len(values), np.nan)
+    if numeric.any():
+        _, codes, uniques = distinct_text(values[numeric])
+        parsed[numeric] = np.array([_parse_float(value) for value in uniques], dtype=float)[codes]
+    return parsed
+
+
+class NumericProfile:
+    """Numeric cells, per-column numeric ratios and parsed floats of a table."""
+
+    def __init__(self, cells: np.ndarray, numeric_mask: np.ndarray, present: np.ndarray, columns: List):
+        """
+        Args:
+            cells: (rows, cols) object array of the table's cells
+            numeric_mask: (rows, cols) bool array, True where a cell holds a number
+            present: (rows, cols) bool array, True where a cell is not missing
+            columns: Column labels
+        """
+        self.cells = cells
+        self.numeric_mask = numeric_mask
+        self.present = present
+        self.columns = list(columns)
+        self._values = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'NumericProfile':
+        """Profile every column of a table"""
+        cells = df.to_numpy(dtype=object)
+        present, has_digit = _numeric_cells(cells.ravel())
+        return cls(cells, has_digit.reshape(cells.shape), present.reshape(cells.shape), df.columns)
+
+    def refresh(self, df: pd.DataFrame, positions: Optional[Sequence[int]] = None) -> 'NumericProfile':
+        """
+        Profile of a changed table, reusing the columns that did not change
+
+        Args:
+            df: The table after the change (same shape and column order)
+            positions: Column positions that changed (default: object columns)
+
+        Returns:
+            New profile; this one is left as it is
+        """
+        if df.shape != self.cells.shape:
+            return NumericProfile.from_frame(df)
+        if positions is None:
+            positions = [i for i, dtype in enumerate(df.dtypes) if dtype == 'object']
+        positions = list(positions)
+
+        cells = df.to_numpy(dtype=object)
+        profile = NumericProfile(cells, self.numeric_mask.copy(), self.present.copy(), df.columns)
+        if positions:
+            block = cells[:, positions]
+            present, has_digit = _numeric_cells(block.ravel())
+            profile.numeric_mask[:, positions] = has_digit.reshape(block.shape)
+            profile.present[:, positions] = present.reshape(block.shape)
+        return profile
+
+    @property
+    def values(self) -> np.ndarray:
+        """(rows, cols) floats of the numeric cells as float() parses them, NaN elsewhere (computed on first use)"""
+        if self._values is None:
+            flat = _parsed_cells(self.cells.ravel(), self.numeric_mask.ravel())
+            self._values = flat.reshape(self.cells.shape)
+        return self._values
+
+    @property
+    def numeric_count(self) -> int:
+        """Cells holding a number (what count_numeric_values returns)"""
+        return int(self.numeric_mask.sum())
+
+    @property
+    def column_ratios(self) -> pd.Series:
+        """Share of each column's non-missing cells that hold a number (0.0 if all missing), indexed like df.columns"""
+        numeric = self.numeric_mask.sum(axis=0)
+        present = self.present.sum(axis=0)
+        ratios = np.divide(numeric, present, out=np.zeros(len(present)), where=present > 0)
+        return pd.Series(ratios, index=self.columns)
+
+    def column_values(self, position: int) -> np.ndarray:
+        """Parsed floats of one column (NaN where a cell is not a plain number)"""
+        return self.values[:, position]
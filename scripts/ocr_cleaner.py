@@ -0,0 +1,244 @@
+"""
+Column-wise OCR cleaning
+
+utils.advanced_clean cleans one cell at a time: about ten regexes and six
+str.replace calls per cell. This module cleans whole tables at once:
+
+- all object columns are stacked into one array and factorized, so each
+  distinct string is cleaned once, however often it repeats;
+- one precompiled search finds the strings that any step could change
+  (most cells are plain numbers or dashes); the others are passed through
+  untouched;
+- only the remaining strings go through the rewrite steps, with patterns
+  compiled once; their results are memoized across tables (value_cache).
+
+Pandas .str operations were tried first, but the extracted tables are small
+(a few hundred cells), and a dozen vectorized passes per table cost more in
+per-call overhead than they save.
+
+The steps come from the `cleaning` section of config.yaml (ocr_fixes,
+fix_number_spaces, fix_decimal_comma, apply_ocr_fixes), compiled once into
+an OcrCleaner. The OCR fix table is compiled into one alternation of its
+`from` strings: a cell is scanned once for all fixes, and only cells
+containing one replay the fixes in order (fixes can cascade, e.g.
+"Q . so" -> "0. so" -> "0.50", so they are not applied in a single
+substitution). Adding fixes thus costs nothing for the other cells.
+
+With the default settings the output is identical to mapping advanced_clean
+over the object columns, None for missing values included
+(`benchmark.py ocr --fuzz N` checks this on random OCR-like strings and on
+every table in web-interface/public/data).
+
+Usage:
+    from ocr_cleaner import OcrCleaner, clean_frame
+
+    df = clean_frame(pd.read_csv(csv_path))
+
+    cleaner = OcrCleaner.from_config(config['cleaning'])
+    df = cleaner.clean_frame(pd.read_csv(csv_path))
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from distinct_values import distinct_text
+from utils import OCR_FIXES
+from value_cache import get_value_cache
+
+# "0.026 (D)" -> "0.026"
+_REFERENCE_MARKER = re.compile(r'([0-9.]+)\s*[\(\[]([A-Z][\w.]*?)[\)\]]')
+
+_DECIMAL_COMMA = [
+    (re.compile(r'(\d),(\d)'), r'\1.\2'),
+]
+
+_NUMBER_SPACES = [
+    (re.compile(r'(\d)\s+\.'), r'\1.'),
+    (re.compile(r'(\d)\s+(\d)'), r'\1\2'),
+    (re.compile(r'\.\s+(\d)'), r'.\1'),
+]
+
+_PATTERN_FIXES = [
+    (re.compile(r'\bs\s*o\b'), '50'),                # "s o" -> "50"
+    (re.compile(r'\b0\s*\.\s*s\s*o\b'), '0.50'),
+]
+
+# Rewritten strings, keyed by (cleaner settings, raw string)
+_REWRITE_CACHE = get_value_cache('ocr_clean')
+
+
+class OcrCleaner:
+    """The cleaning steps of advanced_clean, compiled from the cleaning settings."""
+
+    def __init__(
+        self,
+        ocr_fixes: Optional[List[Tuple[str, str]]] = None,
+        apply_ocr_fixes: bool = True,
+        fix_number_spaces: bool = True,
+        fix_decimal_comma: bool = True
+    ):
+        """
+        Args:
+            ocr_fixes: (from, to) literal replacements, applied in order
+                (default: utils.OCR_FIXES)
+            apply_ocr_fixes: Apply the literal fixes and the "s o" -> "50" patterns
+            fix_number_spaces: Remove spaces inside numbers ("0 . 5 3" -> "0.53")
+            fix_decimal_comma: Read a comma between digits as a decimal point
+        """
+        self.ocr_fixes = [(str(old), str(new)) for old, new in (OCR_FIXES if ocr_fixes is None else ocr_fixes)]
+        self.apply_ocr_fixes = apply_ocr_fixes
+        self.fix_number_spaces = fix_number_spaces
+        self.fix_decimal_comma = fix_decimal_comma
+
+        self._number_fixes = ((_DECIMAL_COMMA if fix_decimal_comma else [])
+                              + (_NUMBER_SPACES if fix_number_spaces else []))
+        self._pattern_fixes = _PATTERN_FIXES if apply_ocr_fixes else []
+        self._literal_fixes = [(old, new) for old, new in self.ocr_fixes if old] if apply_ocr_fixes else []
+
+        # One scan for all literal fixes
+        fix_sources = sorted({old for old, _ in self._literal_fixes})
+        self._fix_trigger = re.compile('|'.join(map(re.escape, fix_sources))) if fix_sources else None
+
+        # Strings matching none of these are left unchanged by every step:
+        # the marker needs a bracket, the number fixes a comma or whitespace,
+        # the patterns an 's', the literal fixes their own text, and strip()
+        # only removes whitespace
+        triggers = [r'[\s(\[' + (',' if fix_decimal_comma else '') + ('s' if apply_ocr_fixes else '') + ']']
+        self._needs_cleaning = re.compile('|'.join(triggers + [re.escape(old) for old in fix_sources]))
+
+        self._cache_key = json.dumps(self.settings, sort_keys=True)
+
+    @classmethod
+    def from_config(cls, cleaning: Optional[Dict] = None) -> 'OcrCleaner':
+        """
+        Compile the `cleaning` section of config.yaml
+
+        Args:
+            cleaning: Dict with ocr_fixes ([{from, to}, ...]), apply_ocr_fixes,
+                fix_number_spaces and fix_decimal_comma; missing keys use the defaults
+        """
+        cleaning = cleaning or {}
+        ocr_fixes = cleaning.get('ocr_fixes')
+        if ocr_fixes is not None:
+            ocr_fixes = [(fix['from'], fix['to']) for fix in ocr_fixes]
+        return cls(
+            ocr_fixes=ocr_fixes,
+            apply_ocr_fixes=cleaning.get('apply_ocr_fixes', True),
+            fix_number_spaces=cleaning.get('fix_number_spaces', True),
+            fix_decimal_comma=cleaning.get('fix_decimal_comma', True),
+        )
+
+    @property
+    def settings(self) -> Dict:
+        """The settings compiled into this cleaner (for fingerprints and manifests)"""
+        return {
+            'ocr_fixes': [list(fix) for fix in self.ocr_fixes],
+            'apply_ocr_fixes': self.apply_ocr_fixes,
+            'fix_number_spaces': self.fix_number_spaces,
+            'fix_decimal_comma': self.fix_decimal_comma,
+        }
+
+    def clean_text(self, text: str) -> str:
+        """Clean one string (advanced_clean with these settings)"""
+        if not self._needs_cleaning.search(text):
+            return text
+        return _REWRITE_CACHE.get((self._cache_key, text), lambda: self._rewrite(text))
+
+    def _rewrite(self, text: str) -> str:
+        """The cleaning steps, for a string that may change"""
+        match = _REFERENCE_MARKER.match(text)
+        if match:
+            return match.group(1)
+
+        for pattern, replacement in self._number_fixes:
+            text = pattern.sub(replacement, text)
+        if self._fix_trigger is not None and self._fix_trigger.search(text):
+            for old, new in self._literal_fixes:
+                text = text.replace(old, new)
+        for pattern, replacement in self._pattern_fixes:
+            text = pattern.sub(replacement, text)
+        return text.strip()
+
+    def clean_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Clean a 1-D array of raw values, each distinct value once
+
+        Args:
+            values: Raw values (any types; non-strings are cleaned as str(value))
+
+        Returns:
+            Object array of the same length: cleaned strings, None for missing values
+        """
+        present, codes, uniques = distinct_text(values)
+        cleaned = np.full(len(present), None, dtype=object)
+        if not len(uniques):
+            return cleaned
+
+        uniques = np.array([self.clean_text(value) for value in uniques], dtype=object)
+        cleaned[present] = uniques[codes]
+        return cleaned
+
+    def clean_series(self, values: pd.Series) -> pd.Series:
+        """
+        Equivalent of values.map(advanced_clean)
+
+        Returns:
+            Object Series with the same index
+        """
+        return pd.Series(self.clean_values(values.to_numpy(dtype=object)), index=values.index, dtype=object)
+
+    def clean_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean every object column of a table at once
+
+        Equivalent to `df[col] = df[col].map(advanced_clean)` for each object
+        column; other columns are left as they are.
+
+        Args:
+            df: Table as read from CSV
+
+        Returns:
+            New DataFrame with cleaned object columns
+        """
+        result = df.copy()
+        positions = [i for i, dtype in enumerate(df.dtypes) if dtype == 'object']
+        if not positions:
+            return result
+
+        # Column-major stack, so each column is a contiguous slice of the array
+        if len(positions) == df.shape[1]:
+            block = df.to_numpy(dtype=object)
+        else:
+            block = df.iloc[:, positions].to_numpy(dtype=object)
+        cleaned = self.clean_values(block.ravel(order='F')).reshape(block.shape, order='F')
+
+        for n, i in enumerate(positions):
+            result.isetitem(i, cleaned[:, n])
+        return result
+
+
+def load_cleaning_config(config_path: Path) -> Dict:
+    """The cleaning section of a configuration YAML (e.g. config.yaml)"""
+    import yaml
+
+    with open(config_path) as f:
+        return (yaml.safe_load(f) or {}).get('cleaning') or {}
+
+
+# Cleaner with the built-in settings (those of advanced_clean)
+DEFAULT_CLEANER = OcrCleaner()
+
+
+def clean_series(values: pd.Series, cleaner: Optional[OcrCleaner] = None) -> pd.Series:
+    """values.map(advanced_clean), table-wise (see OcrCleaner.clean_series)"""
+    return (cleaner or DEFAULT_CLEANER).clean_series(values)
+
+
+def clean_frame(df: pd.DataFrame, cleaner: Optional[OcrCleaner] = None) -> pd.DataFrame:
+    """Clean every object column of a table (see OcrCleaner.clean_frame)"""
+    return (cleaner or DEFAULT_CLEANER).clean_frame(df)
@@ -0,0 +1,241 @@
+"""
+Page index: one pdfplumber pass per PDF
+
+Scans every page once for its text, table bounding boxes, table count and
+a hash of its content, and stores the result as a compact JSON file per PDF.
+System identification and extraction read the index instead of re-parsing
+the PDFs; an index is rebuilt only when its PDF changes.
+
+Usage:
+    python scripts/page_index.py --pdf-dir Data
+
+    from page_index import load_page_index
+
+    for page in load_page_index(pdf_path):
+        print(page['page'], page['num_tables'], page['table_bboxes'])
+
+    # Tabula areas of the detected tables, for region-targeted extraction
+    areas = table_areas(pdf_path)   # {page: [[top, left, bottom, right], ...]}
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from utils import ensure_directory, file_hash
+
+DEFAULT_INDEX_DIR = Path('output/.page_index')
+
+# Bump when the entry format changes so old indexes are rebuilt
+INDEX_VERSION = 1
+
+# Margin in PDF points around detected boxes, so tabula still sees the
+# ruling lines and glyphs on the edge of a table
+AREA_PADDING = 2.0
+
+
+def _page_hash(page) -> str:
+    """Hash of a page's content streams"""
+    from pdfminer.pdftypes import resolve1
+
+    digest = hashlib.sha256()
+    contents = page.page_obj.contents or []
+    for stream in contents if isinstance(contents, list) else [contents]:
+        digest.update(resolve1(stream).get_data())
+    return digest.hexdigest()[:16]
+
+
+def scan_pdf(pdf_path: Path) -> List[Dict]:
+    """
+    Scan every page of a PDF with pdfplumber
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        List of page entries: {page, text, num_tables, table_bboxes, hash}
+        with bounding boxes as [x0, top, x1, bottom] in PDF points
+    """
+    import pdfplumber
+
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num, page in enumerate(pdf.pages, 1):
+            tables = page.find_tables()
+            pages.append({
+                'page': page_num,
+                'text': page.extract_text() or "",
+                'num_tables': len(tables),
+                'table_bboxes': [[round(v, 2) for v in table.bbox] for table in tables],
+                'hash': _page_hash(page),
+            })
+            page.close()
+    return pages
+
+
+def index_path(pdf_path: Path, index_dir: Path = DEFAULT_INDEX_DIR) -> Path:
+    """Location of a PDF's index file"""
+    return Path(index_dir) / f"{Path(pdf_path).stem}.json"
+
+
+def load_page_index(pdf_path: Path, index_dir: Path = DEFAULT_INDEX_DIR, refresh: bool = False) -> List[Dict]:
+    """
+    Page entries of a PDF, scanning it only if its index is missing or stale
+
+    Args:
+        pdf_path: Path to PDF file
+        index_dir: Directory holding index files
+        refresh: Rescan even if the index is current
+
+    Returns:
+        List of page entries (see scan_pdf)
+    """
+    path = index_path(pdf_path, index_dir)
+    pdf_hash = file_hash(pdf_path)
+
+    if not refresh and path.exists():
+        try:
+            with open(path) as f:
+                index = json.load(f)
+            if index.get('pdf_hash') == pdf_hash and index.get('version') == INDEX_VERSION:
+                return index['pages']
+        except (json.JSONDecodeError, OSError, KeyError):
+            pass
+
+    pages = scan_pdf(pdf_path)
+
+    # Write then rename so concurrent readers never see a partial index
+    ensure_directory(path.parent)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'version': INDEX_VERSION,
+            'pdf': Path(pdf_path).name,
+            'pdf_hash': pdf_hash,
+            'pages': pages,
+        }, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+    return pages
+
+
+def cached_page_count(pdf_path: Path, index_dir: Path = DEFAULT_INDEX_DIR) -> int:
+    """
+    Page count from a current index, without scanning
+
+    Returns:
+        Number of pages, or 0 if there is no current index
+    """
+    path = index_path(pdf_path, index_dir)
+    if not path.exists():
+        return 0
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return 0
+    if index.get('pdf_hash') != file_hash(pdf_path) or index.get('version') != INDEX_VERSION:
+        return 0
+    return len(index['pages'])
+
+
+def bbox_to_area(bbox: List[float], padding: float = AREA_PADDING) -> List[float]:
+    """pdfplumber box [x0, top, x1, bottom] -> tabula area [top, left, bottom, right]"""
+    x0, top, x1, bottom = bbox
+    return [
+        round(max(0.0, top - padding), 2),
+        round(max(0.0, x0 - padding), 2),
+        round(bottom + padding, 2),
+        round(x1 + padding, 2),
+    ]
+
+
+def table_areas(pdf_path: Path, index_dir: Path = DEFAULT_INDEX_DIR) -> Dict[int, List[List[float]]]:
+    """
+    Tabula areas of the tables detected on each page
+
+    Args:
+        pdf_path: Path to PDF file
+        index_dir: Directory holding index files
+
+    Returns:
+        Dict mapping page number -> list of areas [top, left, bottom, right];
+        pages without detected tables are left out (extract them whole)
+    """
+    return {
+        page['page']: [bbox_to_area(bbox) for bbox in page['table_bboxes']]
+        for page in load_page_index(pdf_path, index_dir)
+        if page['table_bboxes']
+    }
+
+
+def index_all_pdfs(pdf_dir: Path, index_dir: Path = DEFAULT_INDEX_DIR, refresh: bool = False) -> Dict:
+    """
+    Build (or refresh) the page index of every PDF in a directory
+
+    Args:
+        pdf_dir: Directory containing PDF files
+        index_dir: Directory for index files
+        refresh: Rescan PDFs whose index is current
+
+    Returns:
+        Summary dict
+    """
+    pdf_files = sorted(Path(pdf_dir).glob("*.pdf"))
+
+    print("="*80)
+    print(f"INDEXING PAGES OF {len(pdf_files)} PDF FILES")
+    print("="*80)
+
+    total_pages = 0
+    total_tables = 0
+    failed = []
+    for pdf_path in pdf_files:
+        try:
+            pages = load_page_index(pdf_path, index_dir, refresh)
+        except Exception as e:
+            print(f"  ✗ Could not index {pdf_path.name}: {e}")
+            failed.append(pdf_path.name)
+            continue
+        tables = sum(page['num_tables'] for page in pages)
+        total_pages += len(pages)
+        total_tables += tables
+        print(f"  ✓ {pdf_path.name}: {len(pages)} pages, {tables} tables")
+
+    return {
+        'success': True,
+        'pdfs_indexed': len(pdf_files) - len(failed),
+        'failed': failed,
+        'total_pages': total_pages,
+        'total_tables': total_tables,
+        'index_dir': str(index_dir),
+    }
+
+
+def main():
+    """Command-line interface"""
+    parser = argparse.ArgumentParser(description='Build the per-page index (text, table boxes) of PDFs')
+    parser.add_argument('--pdf-dir', type=Path, default=Path('Data'),
+                        help='Directory containing PDF files (default: Data/)')
+    parser.add_argument('--index-dir', type=Path, default=DEFAULT_INDEX_DIR,
+                        help=f'Directory for index files (default: {DEFAULT_INDEX_DIR}/)')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Rescan PDFs even if their index is current')
+
+    args = parser.parse_args()
+
+    if not args.pdf_dir.exists():
+        print(f"Error: PDF directory not found: {args.pdf_dir}")
+        return 1
+
+    summary = index_all_pdfs(args.pdf_dir, args.index_dir, args.refresh)
+    print(f"\n✓ Indexed {summary['total_pages']} pages ({summary['total_tables']} tables) "
+          f"into {summary['index_dir']}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,242 @@
+"""
+Per-page extraction watchdog
+
+A malformed page can keep tabula busy for minutes, and a call into the JVM
+cannot be interrupted from Python. The watchdog therefore runs tabula in
+child processes (each with its own warm JVM) and gives every page a time
+budget. A worker that overruns it is killed and replaced; the page is
+retried in the next mode (stream, then lattice), and a page that fails in
+every mode is quarantined instead of failing or stalling the whole PDF.
+
+Results still go through the extraction cache, so cached pages never start
+a worker.
+
+Usage:
+    from page_watchdog import PageWatchdog
+
+    with PageWatchdog(page_timeout=60, options={'multiple_tables': True}) as watchdog:
+        tables = watchdog.read_page(pdf_path, 12)
+    print(watchdog.quarantined)   # [{'page': ..., 'attempts': [...]}]
+"""
+
+import multiprocessing
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from extraction_cache import ExtractionCache, get_cache
+
+# Modes tried in order: the caller's options first, then forced stream and lattice
+RETRY_MODES = [
+    ('default', {}),
+    ('stream', {'stream': True}),
+    ('lattice', {'lattice': True}),
+]
+
+# Time allowed for a worker to boot its JVM (not counted against the page)
+STARTUP_TIMEOUT = 120
+
+
+class PageTimeout(Exception):
+    """A page took longer than the time budget"""
+
+
+class PageExtractionError(Exception):
+    """Tabula failed on a page, or its worker died"""
+
+
+def _worker_main(conn, java_options: Optional[List[str]]):
+    """Child process loop: boot the JVM, then extract pages on request"""
+    from tabula_session import TabulaSession
+
+    session = TabulaSession(java_options)
+    try:
+        session.start()
+        conn.send(('ready', None))
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            pdf_path, page, options = request
+            try:
+                conn.send(('ok', session.read_pdf(pdf_path, pages=int(page), **options)))
+            except Exception as e:
+                conn.send(('error', f"{type(e).__name__}: {e}"))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        session.close()
+
+
+class PageWorker:
+    """One child process running tabula, killed when a page overruns its budget."""
+
+    def __init__(self, page_timeout: float, java_options: Optional[List[str]] = None):
+        """
+        Args:
+            page_timeout: Seconds a single page may take
+            java_options: Extra JVM options for the worker's session
+        """
+        self.page_timeout = page_timeout
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, java_options), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+        if not self._conn.poll(STARTUP_TIMEOUT):
+            self.kill()
+            raise PageExtractionError(f"worker did not start within {STARTUP_TIMEOUT}s")
+        try:
+            self._conn.recv()
+        except EOFError:
+            self.kill()
+            raise PageExtractionError("worker exited during startup")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def read_page(self, pdf_path: Path, page: int, options: Dict) -> List[pd.DataFrame]:
+        """
+        Extract one page in the worker
+
+        Raises:
+            PageTimeout: The page overran the budget (the worker is killed)
+            PageExtractionError: Tabula raised, or the worker died
+        """
+        try:
+            self._conn.send((str(pdf_path), int(page), options))
+            if not self._conn.poll(self.page_timeout):
+                self.kill()
+                raise PageTimeout(f"timed out after {self.page_timeout:g}s")
+            status, payload = self._conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            self.kill()
+            raise PageExtractionError("worker died")
+
+        if status == 'error':
+            raise PageExtractionError(payload)
+        return payload
+
+    def close(self):
+        """Stop the worker (politely if it is idle)"""
+        if self.alive:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=10)
+        self.kill()
+
+    def kill(self):
+        """Stop the worker immediately"""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self._conn.close()
+
+
+class PageWatchdog:
+    """Extracts pages in killable workers with a per-page time budget and mode retries."""
+
+    def __init__(
+        self,
+        page_timeout: float,
+        options: Optional[Dict] = None,
+        cache: Optional[ExtractionCache] = None,
+        retry_modes: Optional[List[Tuple[str, Dict]]] = None,
+        java_options: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            page_timeout: Seconds a single page may take in one mode
+            options: tabula.read_pdf options for every attempt
+            cache: Extraction cache (default: process-wide cache)
+            retry_modes: (mode label, extra options) tried in order (default: RETRY_MODES)
+            java_options: Extra JVM options for the workers
+        """
+        self.page_timeout = page_timeout
+        self.options = dict(options or {})
+        self.cache = cache if cache is not None else get_cache()
+        self.retry_modes = retry_modes or RETRY_MODES
+        self.java_options = java_options
+
+        self.quarantined = []
+        self.retried = []
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def _checkout(self) -> PageWorker:
+        """An idle worker, or a new one (workers are started on demand)"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            worker = PageWorker(self.page_timeout, self.java_options)
+            with self._lock:
+                self._workers.append(worker)
+            return worker
+
+    def _extract(self, pdf_path: Path, page: int, options: Dict) -> List[pd.DataFrame]:
+        """Run one attempt in a worker; dead workers are not returned to the pool"""
+        worker = self._checkout()
+        try:
+            return worker.read_page(pdf_path, page, options)
+        finally:
+            if worker.alive:
+                self._idle.put(worker)
+
+    def read_page(self, pdf_path: Path, page: int, area: Optional[List] = None) -> List[pd.DataFrame]:
+        """
+        Extract one page, retrying in the other modes if it stalls or fails
+
+        Safe to call from several threads; each call uses its own worker.
+
+        Args:
+            pdf_path: Path to PDF file
+            page: 1-based page number
+            area: Optional area [top, left, bottom, right] or list of areas
+
+        Returns:
+            Tables of the page, or [] if it was quarantined
+        """
+        attempts = []
+        for mode, mode_options in self.retry_modes:
+            options = {**self.options, **mode_options}
+            tabula_options = {**options, 'area': area} if area is not None else options
+            try:
+                tables = self.cache.fetch(
+                    pdf_path, page, mode, area, options,
+                    lambda: self._extract(pdf_path, page, tabula_options)
+                )
+            except (PageTimeout, PageExtractionError) as e:
+                attempts.append({'mode': mode, 'error': str(e)})
+                print(f"  ⚠ {Path(pdf_path).name} page {page} ({mode}): {e}")
+                continue
+
+            if attempts:
+                with self._lock:
+                    self.retried.append({'page': int(page), 'mode': mode, 'attempts': attempts})
+            return tables
+
+        print(f"  ✗ Quarantined {Path(pdf_path).name} page {page}")
+        with self._lock:
+            self.quarantined.append({'page': int(page), 'attempts': attempts})
+        return []
+
+    def close(self):
+        """Stop all workers"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self) -> 'PageWatchdog':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
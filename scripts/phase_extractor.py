@@ -3,11 +3,34 @@ Phase Marker Extraction Module
 
 Extracts phase labels from data values and separates them into dedicated columns.
 Handles patterns like: "0.026 (D)", "1.35 (A+B)", "7.5 II", etc.
+
+Tables are split with one compiled pattern (SPLIT_PATTERN: named groups
+for the value and each kind of phase label), all selected columns of a
+table at once and each distinct string once. Series.str.extract was tried
+first, but the tables are small (a few hundred cells) and its per-call
+overhead cost more than the per-cell loop. extract_phase is the per-cell
+definition the split follows; `benchmark.py phases` checks that both give
+the same tables.
+
+PhaseProfile does all the work for a table in that one pass: the same
+match tells which columns carry phase markers (no separate sample scan),
+splits them and collects the unique phase labels.
+
+Usage:
+    from phase_extractor import PhaseExtractor
+
+    profile = PhaseExtractor().profile(df)
+    df = profile.apply(df)
+    profile.unique_phases, profile.phase_columns
 """
 
+import numpy as np
 import pandas as pd
 import re
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List
+
+from distinct_values import distinct_text
+from value_cache import memoize_values
 
 
 class PhaseExtractor:
@@ -23,9 +46,34 @@ class PhaseExtractor:
         r'\s+([A-F]\+[A-F])\s*$',
     ]
 
+    # A value with nothing but its phase label ("A", "A+B", "II")
+    LABEL_PATTERN = r'[A-F](?:\+[A-F])?|I{1,3}'
+
+    # extract_phase in one pattern: a bare label, or the value followed by a
+    # label of one of PHASE_PATTERNS. A string can only end in one kind of
+    # label, so the shortest value is the text before the pattern's match.
+    SPLIT_PATTERN = (
+        r'(?s)^(?:(?P<label>' + LABEL_PATTERN + r')'
+        r'|(?P<value>.*?)(?:'
+        r'\s*\((?P<parenthetical>[A-F](?:\+[A-F])?|[A-F]\d+\.?\d*)\)'
+        r'|\s+(?P<spaced>[A-F]|I{1,3}|IV|V|VI)'
+        r'|\s+(?P<combined>[A-F]\+[A-F])'
+        r')\s*)$'
+    )
+
+    # Values left empty by the split (None); a value without a phase keeps '---'
+    EMPTY_VALUES = frozenset(['', '-', '--', '----', '---'])
+    EMPTY_VALUES_WITHOUT_PHASE = frozenset(['', '-', '--', '----'])
+
+    # Labels the spaced and combined patterns find after whitespace
+    SPACED_LABEL_PATTERN = r'[A-F]|I{1,3}|IV|V|VI|[A-F]\+[A-F]'
+
     def __init__(self):
         self.combined_pattern = '|'.join(f'({p})' for p in self.PHASE_PATTERNS)
+        self.split_pattern = re.compile(self.SPLIT_PATTERN)
+        self.spaced_label = re.compile(self.SPACED_LABEL_PATTERN)
 
+    @memoize_values('extract_phase')
     def extract_phase(self, value: any) -> Tuple[Optional[str], Optional[str]]:
         """
         Extract phase marker from a value.
@@ -65,23 +113,81 @@ class PhaseExtractor:
         # No phase found
         return value_str if value_str not in ['', '-', '--', '----'] else None, None
 
+    def split_values(self, texts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        extract_phase for distinct strings, one match of split_pattern each
+
+        Args:
+            texts: 1-D object array of strings, as str(value) gives them
+
+        Returns:
+            Tuple of arrays (cleaned values, phase labels, marked): values and
+            labels are None where empty; marked is True where the string
+            contains a phase marker, i.e. combined_pattern finds one (a bare
+            label counts only after whitespace)
+        """
+        values = np.full(len(texts), None, dtype=object)
+        phases = np.full(len(texts), None, dtype=object)
+        marked = np.zeros(len(texts), dtype=bool)
+        match = self.split_pattern.match
+        for i, raw in enumerate(texts):
+            text = raw.strip()
+            parts = match(text)
+            if parts is None:
+                value, empty = text, self.EMPTY_VALUES_WITHOUT_PHASE
+            else:
+                label, value, parenthetical, spaced, combined = parts.groups()
+                phases[i] = label or parenthetical or spaced or combined
+                # A bare label has no value
+                value, empty = (value or '').strip(), self.EMPTY_VALUES
+            if value not in empty:
+                values[i] = value
+
+            # combined_pattern needs a label after the value, or whitespace
+            # before a bare spaced label (" IV")
+            marked[i] = ((parts is not None and parts.group('value') is not None)
+                         or (raw[:1].isspace() and self.spaced_label.fullmatch(text) is not None))
+        return values, phases, marked
+
+    def extract_values(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        extract_phase for a 1-D array of raw values, each distinct value once
+
+        Args:
+            values: Raw values (any types; non-strings are split as str(value))
+
+        Returns:
+            Tuple of object arrays of the same length (cleaned values, phase
+            labels), None where empty or missing
+        """
+        present, codes, uniques = distinct_text(values)
+        cleaned = np.full(len(present), None, dtype=object)
+        phases = np.full(len(present), None, dtype=object)
+        if len(uniques):
+            unique_values, unique_phases, _ = self.split_values(uniques)
+            cleaned[present] = unique_values[codes]
+            phases[present] = unique_phases[codes]
+        return cleaned, phases
+
     def extract_from_series(self, series: pd.Series) -> Tuple[pd.Series, pd.Series]:
         """
         Extract phases from an entire pandas Series.
 
+        Same results as applying extract_phase to every value.
+
         Args:
             series: Pandas Series with potential phase markers
 
         Returns:
             Tuple of (cleaned_values_series, phase_series)
         """
-        results = series.apply(self.extract_phase)
-
-        # Unpack tuples into two series
-        values = results.apply(lambda x: x[0])
-        phases = results.apply(lambda x: x[1])
+        values, phases = self.extract_values(series.to_numpy(dtype=object))
+        return (pd.Series(values, index=series.index, dtype=object),
+                pd.Series(phases, index=series.index, dtype=object))
 
-        return values, phases
+    def profile(self, df: pd.DataFrame, numeric_only: bool = True) -> 'PhaseProfile':
+        """Phase markers of a table, in one pass (see PhaseProfile)"""
+        return PhaseProfile.from_frame(df, numeric_only, self)
 
     def process_dataframe(self, df: pd.DataFrame, numeric_only: bool = True) -> pd.DataFrame:
         """
@@ -94,43 +200,7 @@ class PhaseExtractor:
         Returns:
             DataFrame with phase columns added
         """
-        df_processed = df.copy()
-        phase_columns = {}
-
-        for col in df.columns:
-            # Skip if explicitly a phase column already
-            if 'phase' in str(col).lower():
-                continue
-
-            # Check if column should be processed
-            if numeric_only:
-                # Sample first few non-null values
-                sample = df[col].dropna().head(10)
-                if len(sample) == 0:
-                    continue
-
-                # Check if any values contain phase markers
-                has_phase = any(
-                    re.search(self.combined_pattern, str(v))
-                    for v in sample
-                )
-
-                if not has_phase:
-                    continue
-
-            # Extract phases
-            cleaned_values, phases = self.extract_from_series(df[col])
-
-            # Update the column with cleaned values
-            df_processed[col] = cleaned_values
-
-            # If we found any phases, add a phase column
-            if phases.notna().any():
-                phase_col_name = f"{col}_phase"
-                df_processed[phase_col_name] = phases
-                phase_columns[col] = phase_col_name
-
-        return df_processed
+        return self.profile(df, numeric_only).apply(df)
 
     def get_unique_phases(self, df: pd.DataFrame) -> set:
         """
@@ -152,6 +222,115 @@ class PhaseExtractor:
         return phases
 
 
+class PhaseProfile:
+    """Phase markers of a table: the columns to split, their split values and phase labels."""
+
+    def __init__(self, columns: List, positions: List[int], values: np.ndarray, phases: np.ndarray,
+                 unique_phases: set):
+        """
+        Args:
+            columns: Column labels of the table
+            positions: Positions of the columns that are split
+            values: (rows, len(positions)) object array of cleaned values
+            phases: (rows, len(positions)) object array of phase labels (None where none)
+            unique_phases: Phase labels in the processed table's phase columns
+        """
+        self.columns = list(columns)
+        self.positions = positions
+        self.values = values
+        self.phases = phases
+        self.unique_phases = unique_phases
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, numeric_only: bool = True,
+                   extractor: Optional[PhaseExtractor] = None) -> 'PhaseProfile':
+        """
+        Profile a table: select, split and collect phase labels in one pass
+
+        All columns that could be split are stacked and each distinct string
+        is matched once. A column is selected as process_dataframe always
+        did: with numeric_only, if one of its first 10 non-missing values
+        contains a phase marker.
+
+        Args:
+            df: Input DataFrame
+            numeric_only: If True, only split columns that look numeric
+            extractor: Extractor whose patterns to use (default: a new one)
+        """
+        extractor = extractor or PhaseExtractor()
+        candidates = [i for i, col in enumerate(df.columns) if 'phase' not in str(col).lower()]
+
+        # Column-major stack, so each column is a contiguous slice
+        block = df.iloc[:, candidates].to_numpy(dtype=object)
+        present, codes, uniques = distinct_text(block.ravel(order='F'))
+        values = np.full(block.size, None, dtype=object)
+        phases = np.full(block.size, None, dtype=object)
+        marked = np.zeros(block.size, dtype=bool)
+        if len(uniques):
+            unique_values, unique_phases, unique_marked = extractor.split_values(uniques)
+            values[present] = unique_values[codes]
+            phases[present] = unique_phases[codes]
+            marked[present] = unique_marked[codes]
+        values = values.reshape(block.shape, order='F')
+        phases = phases.reshape(block.shape, order='F')
+        marked = marked.reshape(block.shape, order='F')
+        present = present.reshape(block.shape, order='F')
+
+        selected = []
+        for n in range(len(candidates)):
+            if numeric_only:
+                # Sample first few non-null values
+                sample = marked[:, n][present[:, n]][:10]
+                if not sample.any():
+                    continue
+            selected.append(n)
+
+        profile = cls(df.columns, [candidates[n] for n in selected], values[:, selected], phases[:, selected], set())
+
+        # Phase labels as get_unique_phases finds them in the processed
+        # table: existing phase columns, then the added ones
+        added = {}
+        for n, i in enumerate(profile.positions):
+            column = profile.phases[:, n]
+            column = column[pd.notna(column)]
+            if len(column):
+                added[f"{profile.columns[i]}_phase"] = pd.unique(column)
+        labels = [col for col in df.columns if 'phase' in str(col).lower()]
+        labels += [label for label in added if label not in labels]
+        for label in labels:
+            profile.unique_phases.update(added[label] if label in added else df[label].dropna().unique())
+        return profile
+
+    @property
+    def phase_columns(self) -> Dict:
+        """Split column label -> label of the phase column added for it (columns with phases only)"""
+        return {
+            self.columns[i]: f"{self.columns[i]}_phase"
+            for n, i in enumerate(self.positions)
+            if pd.notna(self.phases[:, n]).any()
+        }
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        The processed table: split columns replaced by their values, phase columns added
+
+        Args:
+            df: The profiled table
+
+        Returns:
+            New DataFrame (what process_dataframe returns)
+        """
+        df_processed = df.copy()
+        for n, i in enumerate(self.positions):
+            # Update the column with cleaned values
+            df_processed.isetitem(i, self.values[:, n])
+
+            # If we found any phases, add a phase column
+            if pd.notna(self.phases[:, n]).any():
+                df_processed[f"{self.columns[i]}_phase"] = pd.Series(self.phases[:, n], index=df.index, dtype=object)
+        return df_processed
+
+
 def extract_phases_from_table(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
     """
     Convenience function to extract phases from a table.
@@ -162,10 +341,10 @@ def extract_phases_from_table(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
     Returns:
         Tuple of (processed DataFrame, metadata dict)
     """
-    extractor = PhaseExtractor()
-    df_processed = extractor.process_dataframe(df)
+    profile = PhaseExtractor().profile(df)
+    df_processed = profile.apply(df)
 
-    unique_phases = extractor.get_unique_phases(df_processed)
+    unique_phases = profile.unique_phases
 
     metadata = {
         'phases_found': list(unique_phases),
@@ -402,6 +402,68 @@ def _convert_flags_to_serializable(flags: Dict) -> Dict:
     return result
 
 
+def validation_record(filename: str, validation: Dict) -> Dict:
+    """
+    Report entry of one table (an element of the report's 'tables')
+
+    Args:
+        filename: Name of the table's CSV
+        validation: Result of ScientificValidator.validate_table
+    """
+    return {
+        'filename': filename,
+        'validation_score': float(validation['validation_score']),
+        'priority': validation['priority'],
+        'needs_review': bool(validation['needs_review']),
+        'critical_flags': len(validation['flags']['critical']),
+        'warning_flags': len(validation['flags']['warning']),
+        'info_flags': len(validation['flags']['info']),
+        'flags': _convert_flags_to_serializable(validation['flags'])
+    }
+
+
+def validation_report(records: List[Dict]) -> Dict:
+    """
+    Validation report from the entries of all tables (see validation_record)
+
+    Returns:
+        dict with counts per outcome and priority, the average score and the tables
+    """
+    results = {
+        'total_tables': len(records),
+        'passed': 0,
+        'needs_review': 0,
+        'critical_priority': 0,
+        'high_priority': 0,
+        'medium_priority': 0,
+        'low_priority': 0,
+        'avg_validation_score': 0.0,
+        'tables': records
+    }
+    total_score = 0
+
+    for record in records:
+        if record['needs_review']:
+            results['needs_review'] += 1
+        else:
+            results['passed'] += 1
+
+        priority = record['priority']
+        if 'CRITICAL' in priority:
+            results['critical_priority'] += 1
+        elif 'HIGH' in priority:
+            results['high_priority'] += 1
+        elif 'MEDIUM' in priority:
+            results['medium_priority'] += 1
+        elif 'LOW' in priority:
+            results['low_priority'] += 1
+
+        total_score += record['validation_score']
+
+    results['avg_validation_score'] = float(total_score / len(records)) if records else 0.0
+    return results
+
+
 def validate_all_tables(
     data_dir: Path,
     metadata_dir: Path = None,
@@ -417,20 +479,8 @@ def validate_all_tables(
     data_dir = Path(data_dir)
     metadata_dir = Path(metadata_dir) if metadata_dir else data_dir
 
-    results = {
-        'total_tables': 0,
-        'passed': 0,
-        'needs_review': 0,
-        'critical_priority': 0,
-        'high_priority': 0,
-        'medium_priority': 0,
-        'low_priority': 0,
-        'avg_validation_score': 0.0,
-        'tables': []
-    }
-
+    records = []
     csv_files = sorted(data_dir.glob('*.csv'))
-    total_score = 0
 
     print(f"Validating {len(csv_files)} tables...")
 
@@ -452,43 +502,16 @@ def validate_all_tables(
             validation = validator.validate_table(df, metadata, chemical_system)
 
             # Track results
-            results['total_tables'] += 1
-            if validation['needs_review']:
-                results['needs_review'] += 1
-            else:
-                results['passed'] += 1
-
-            priority = validation['priority']
-            if 'CRITICAL' in priority:
-                results['critical_priority'] += 1
-            elif 'HIGH' in priority:
-                results['high_priority'] += 1
-            elif 'MEDIUM' in priority:
-                results['medium_priority'] += 1
-            elif 'LOW' in priority:
-                results['low_priority'] += 1
-
-            total_score += validation['validation_score']
-
-            results['tables'].append({
-                'filename': csv_file.name,
-                'validation_score': float(validation['validation_score']),
-                'priority': priority,
-                'needs_review': bool(validation['needs_review']),
-                'critical_flags': len(validation['flags']['critical']),
-                'warning_flags': len(validation['flags']['warning']),
-                'info_flags': len(validation['flags']['info']),
-                'flags': _convert_flags_to_serializable(validation['flags'])
-            })
+            records.append(validation_record(csv_file.name, validation))
 
-            if results['total_tables'] % 50 == 0:
-                print(f"  Validated {results['total_tables']} tables...")
+            if len(records) % 50 == 0:
+                print(f"  Validated {len(records)} tables...")
 
         except Exception as e:
             print(f"Error validating {csv_file.name}: {e}")
             continue
 
-    results['avg_validation_score'] = float(total_score / results['total_tables']) if results['total_tables'] > 0 else 0.0
+    results = validation_report(records)
 
     # Save detailed report
     if output_file:
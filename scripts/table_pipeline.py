@@ -0,0 +1,497 @@
+"""
+Fused per-table pipeline
+
+The staged scripts hand every table from one step to the next as a CSV:
+
+    enhanced_clean.py      -> output/02_cleaned_enhanced/
+    header_detector.py     -> output/03_improved_headers/
+    quality_validator.py   -> output/validation_report.json
+
+and every hop pays to_csv formatting and read_csv type inference. This
+script runs OCR cleaning, phase extraction, column standardization, header
+detection and validation on one in-memory DataFrame per table and writes
+only the final artifacts:
+
+    <output>/<table>.csv                      tables with improved headers
+    <output>/metadata/<table>_metadata.json   enhanced cleaning metadata
+    <output>/_header_improvement_report.json
+    validation report (default: output/validation_report.json)
+
+Each step still sees the table as the next script would have read it.
+The tables are passed on as DataFrames. as_read_back() re-types the text
+columns (object or string dtype), which OCR cleaning and phase splitting
+leave holding numbers, under read_csv's rules. It re-parses float64
+columns from their CSV text: read_csv does not parse long decimals to the
+nearest double, so floats can change on a round trip. int64 and bool
+columns read back unchanged, and columns of any other dtype go through
+to_csv and read_csv. `benchmark.py fused` checks every intermediate table
+against a real CSV round trip.
+
+The header and validation reports are the ones improve_headers_batch and
+validate_all_tables produce from the staged outputs. As in the staged
+run, header detection does not use the detected column types unless asked
+to (improve_headers_batch only finds them when pointed at the metadata/
+directory).
+
+With --debug-dir the intermediate tables are written as well, one directory
+per step (ocr_cleaned/, enhanced/).
+
+Usage:
+    python scripts/table_pipeline.py --input-dir output/01_extracted --output-dir output/03_improved_headers
+
+    python scripts/table_pipeline.py --workers 4 --debug-dir output/stages
+"""
+
+import argparse
+import io
+import json
+from contextlib import closing
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import ensure_directory
+from enhanced_clean import enhance_frame, load_chemical_systems, _json_default
+from header_detector import HeaderDetector, header_record, header_report
+from quality_validator import ScientificValidator, validation_record, validation_report
+from ocr_cleaner import OcrCleaner, load_cleaning_config
+from table_pool import TablePool
+
+
+# read_csv's default na_values and true_values/false_values
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+BOOL_STRINGS = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+
+def _label_text(label) -> str:
+    """The text to_csv writes for a column label"""
+    if type(label) is str:
+        return label
+    if label is None or (isinstance(label, float) and np.isnan(label)):
+        return ''
+    return str(label)
+
+
+def _read_back_labels(columns) -> List[str]:
+    """Column names read_csv gives the header row written by to_csv"""
+    labels = [_label_text(label) for label in columns]
+    if any('"' in text or '\n' in text or '\r' in text for text in labels):
+        return list(pd.read_csv(io.StringIO(pd.DataFrame(columns=columns).to_csv(index=False))).columns)
+
+    # Duplicates are renamed "a.1", "a.2", ... skipping names in use, named
+    # columns first; empty names become "Unnamed: i"
+    unnamed = [i for i, text in enumerate(labels) if not text]
+    for i in unnamed:
+        labels[i] = f"Unnamed: {i}"
+    counts = {}
+    for i in [i for i in range(len(labels)) if i not in unnamed] + unnamed:
+        label = base = labels[i]
+        count = counts.get(label, 0)
+        while count > 0:
+            counts[base] = count + 1
+            label = f"{base}.{count}"
+            count = count + 1 if label in labels else counts.get(label, 0)
+        labels[i] = label
+        counts[label] = count + 1
+    return labels
+
+
+@lru_cache(maxsize=None)
+def _text_dtype():
+    """The dtype read_csv gives text columns (object, or str with pandas' string inference)"""
+    return pd.read_csv(io.StringIO('text\nx\n')).dtypes.iloc[0]
+
+
+def _read_back_text(values: np.ndarray, dtype):
+    """
+    read_csv's result for a text column written by to_csv
+
+    Args:
+        values: The column's cells as an object array
+        dtype: The column's dtype
+
+    Returns:
+        New values, or None if the column reads back as it is
+    """
+    # Strings and NaN read back as they are; NA strings, None and other values change
+    unchanged = True
+    texts = np.empty(len(values), dtype=object)
+    present = np.empty(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if type(value) is str:
+            texts[i] = value
+            present[i] = value not in NA_STRINGS
+            unchanged = unchanged and present[i]
+        elif type(value) is float and value != value:
+            texts[i] = value
+            present[i] = False
+        else:
+            missing = value is None or pd.isna(value)
+            texts[i] = np.nan if missing else str(value)
+            present[i] = not missing
+            unchanged = False
+    if not present.any():
+        return np.full(len(values), np.nan)
+    texts[~present] = np.nan
+
+    try:
+        # int64 without gaps, float64 otherwise, as read_csv infers
+        return pd.to_numeric(texts)
+    except (ValueError, TypeError):
+        pass
+    if all(text in BOOL_STRINGS for text in texts[present]):
+        flags = np.array([BOOL_STRINGS.get(text, np.nan) for text in texts], dtype=object)
+        return flags.astype(bool) if present.all() else flags
+    if unchanged and dtype == _text_dtype():
+        return None
+    return texts if _text_dtype() == object else pd.array(texts, dtype=_text_dtype())
+
+
+def _read_back_float(values: np.ndarray) -> np.ndarray:
+    """
+    read_csv's result for a float64 column written by to_csv
+
+    read_csv does not parse every decimal to the nearest double, so a value
+    can change on its way through a CSV. The text to_csv writes is parsed
+    again with pd.to_numeric, which uses read_csv's number parser.
+    """
+    parsed = values.copy()
+    present = ~np.isnan(values)
+    if present.any():
+        parsed[present] = pd.to_numeric(values[present].astype(str).astype(object))
+    return parsed
+
+
+def _read_back_parsed(df: pd.DataFrame) -> pd.DataFrame:
+    """read_csv's result for the cells of df written by to_csv (columns by position)"""
+    csv = df.to_csv(index=False, header=False)
+    return pd.read_csv(io.StringIO(csv), header=None, skip_blank_lines=False)
+
+
+def as_read_back(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The DataFrame pd.read_csv returns for df.to_csv(index=False)
+
+    Text columns are re-typed under read_csv's rules: NA strings become
+    missing, and columns whose remaining cells are all numbers (or all
+    booleans) are converted. float64 columns are re-parsed from the text
+    to_csv writes, and int64 and bool columns are copied as they are.
+    Columns of any other dtype are written and read back by to_csv and
+    read_csv.
+
+    Args:
+        df: Table as a pipeline step returns it
+
+    Returns:
+        New DataFrame with a default index
+    """
+    if len(df) == 0 or df.shape[1] < 2:
+        # Empty tables read back as object columns, and read_csv drops the
+        # blank lines of a one-column table: take the real round trip
+        return pd.read_csv(io.StringIO(df.to_csv(index=False)))
+
+    result = df.copy()
+    result.index = pd.RangeIndex(len(df))
+    text, floats, parsed = [], [], []
+    for position, dtype in enumerate(df.dtypes):
+        if dtype == object or isinstance(dtype, pd.StringDtype):
+            text.append(position)
+        elif dtype == np.float64:
+            floats.append(position)
+        elif dtype != np.int64 and dtype != np.bool_:
+            parsed.append(position)
+
+    if text:
+        cells = df.to_numpy(dtype=object)
+        for position in text:
+            values = _read_back_text(cells[:, position], df.dtypes.iloc[position])
+            if values is not None:
+                result.isetitem(position, values)
+    for position in floats:
+        result.isetitem(position, _read_back_float(df.iloc[:, position].to_numpy()))
+    if parsed:
+        read = _read_back_parsed(df.iloc[:, parsed])
+        for column, position in enumerate(parsed):
+            result.isetitem(position, read.iloc[:, column].to_numpy())
+
+    result.columns = _read_back_labels(df.columns)
+    return result
+
+
+def fuse_table(
+    csv_path: Path,
+    chemical_systems: Dict = None,
+    extract_phases: bool = True,
+    standardize_columns: bool = True,
+    cleaner: Optional[OcrCleaner] = None,
+    use_column_types: bool = False,
+    stages: Optional[Dict[str, pd.DataFrame]] = None
+) -> Tuple[pd.DataFrame, Dict, Dict, Dict]:
+    """
+    Run every step on one table in memory
+
+    Args:
+        csv_path: Path to the extracted CSV
+        chemical_systems: Dict mapping filenames to chemical systems
+        extract_phases: Whether to extract phase markers
+        standardize_columns: Whether to analyze column types
+        cleaner: Compiled OCR cleaning settings (default: built-in settings)
+        use_column_types: Let header detection use the detected column types
+        stages: If given, receives the intermediate tables ('ocr_cleaned', 'enhanced')
+
+    Returns:
+        Tuple of (table with improved headers, enhanced cleaning metadata,
+        header report entry, validation report entry)
+    """
+    df, metadata = enhance_frame(
+        pd.read_csv(csv_path),
+        csv_path.name,
+        chemical_systems=chemical_systems,
+        extract_phases=extract_phases,
+        standardize_columns=standardize_columns,
+        cleaner=cleaner,
+        stages=stages
+    )
+    if stages is not None:
+        stages['enhanced'] = df
+
+    # Header detection sees the enhanced table as header_detector.py reads it
+    df = as_read_back(df)
+    column_types = None
+    if use_column_types:
+        column_types = metadata.get('column_analysis', {}).get('types_detected', {})
+    improved_df, detection_info = HeaderDetector().detect_headers(df, column_types)
+    header = header_record(csv_path.name, list(df.columns), improved_df, detection_info)
+
+    # ... and validation the improved table as quality_validator.py reads it
+    validation = ScientificValidator().validate_table(
+        as_read_back(improved_df), metadata, metadata.get('chemical_system', 'Unknown')
+    )
+
+    return improved_df, metadata, header, validation_record(csv_path.name, validation)
+
+
+def fuse_and_save(
+    csv_path: Path,
+    output_dir: Path,
+    debug_dir: Optional[Path] = None,
+    **options
+) -> Tuple[Dict, Dict, Dict]:
+    """
+    Run every step on a table and write its final CSV and metadata (one task of fused_clean_all)
+
+    Args:
+        debug_dir: If given, the intermediate tables are written to debug_dir/<step>/
+        **options: Passed on to fuse_table
+
+    Returns:
+        Tuple of (metadata, header report entry, validation report entry)
+    """
+    stages = {} if debug_dir is not None else None
+    improved_df, metadata, header, validation = fuse_table(csv_path, stages=stages, **options)
+
+    improved_df.to_csv(output_dir / csv_path.name, index=False)
+    with open(output_dir / 'metadata' / f"{csv_path.stem}_metadata.json", 'w') as f:
+        json.dump(metadata, f, indent=2, default=_json_default)
+
+    for stage, df in (stages or {}).items():
+        df.to_csv(debug_dir / stage / csv_path.name, index=False)
+
+    return metadata, header, validation
+
+
+def _fuse_task(task: Tuple[Path, Dict], output_dir: Path, debug_dir: Optional[Path], options: Dict) -> Tuple:
+    """A TablePool task of fused_clean_all: (CSV path, its chemical system mapping)"""
+    csv_path, chemical_systems = task
+    return fuse_and_save(csv_path, output_dir, debug_dir, chemical_systems=chemical_systems, **options)
+
+
+def fused_clean_all(
+    input_dir: Path,
+    output_dir: Path,
+    systems_file: Path = None,
+    validation_file: Path = None,
+    extract_phases: bool = True,
+    standardize_columns: bool = True,
+    use_column_types: bool = False,
+    cleaning: Optional[Dict] = None,
+    workers: int = 1,
+    debug_dir: Optional[Path] = None
+) -> Dict:
+    """
+    Clean, enhance, fix headers of and validate all tables, one table at a time
+
+    Args:
+        input_dir: Directory with raw extracted CSVs
+        output_dir: Directory for the final tables, metadata and header report
+        systems_file: Path to chemical systems JSON
+        validation_file: Where to save the validation report
+            (default: output_dir/validation_report.json)
+        extract_phases: Whether to extract phase markers
+        standardize_columns: Whether to analyze column types
+        use_column_types: Let header detection use the detected column types
+        cleaning: `cleaning` section of config.yaml (default: built-in settings)
+        workers: Number of worker processes (1 = serial); outputs are the
+            same as in a serial run, apart from the value_cache statistics
+        debug_dir: Also write the intermediate tables, one directory per step
+
+    Returns:
+        Summary dict with the header and validation reports
+    """
+    ensure_directory(output_dir)
+    ensure_directory(output_dir / 'metadata')
+    validation_file = Path(validation_file) if validation_file else output_dir / 'validation_report.json'
+    if debug_dir is not None:
+        for stage in ('ocr_cleaned', 'enhanced'):
+            ensure_directory(debug_dir / stage)
+
+    chemical_systems = {}
+    if systems_file and systems_file.exists():
+        chemical_systems = load_chemical_systems(systems_file)
+        print(f"✓ Loaded {len(chemical_systems)} chemical system mappings")
+
+    csv_files = sorted(input_dir.glob("*.csv"))
+    csv_files = [f for f in csv_files if 'manifest' not in f.name.lower()]
+
+    if not csv_files:
+        print(f"No CSV files found in {input_dir}")
+        return {'success': False, 'files': 0}
+
+    print("="*80)
+    print(f"FUSED TABLE PIPELINE: {len(csv_files)} TABLES")
+    print("="*80)
+    print("Steps: OCR cleaning → phase extraction → column standardization → headers → validation")
+    if debug_dir is not None:
+        print(f"Intermediate tables: {debug_dir}")
+    if workers > 1:
+        print(f"Using {workers} worker processes")
+    print()
+
+    options = {
+        'extract_phases': extract_phases,
+        'standardize_columns': standardize_columns,
+        'cleaner': OcrCleaner.from_config(cleaning),
+        'use_column_types': use_column_types,
+    }
+    tasks = [(csv_path, {csv_path.name: chemical_systems[csv_path.name]} if csv_path.name in chemical_systems else {})
+             for csv_path in csv_files]
+    pool = TablePool(workers)
+
+    headers = []
+    validations = []
+    failed = []
+    with closing(pool.map(_fuse_task, tasks, output_dir, debug_dir, options)) as fused:
+        for i, (csv_path, (result, error)) in enumerate(zip(csv_files, fused), 1):
+            print(f"[{i}/{len(csv_files)}] {csv_path.name}...", end=" ")
+            if error is not None:
+                print(f"✗ Error: {error}")
+                failed.append({'file': csv_path.name, 'error': error})
+                continue
+
+            metadata, header, validation = result
+            headers.append(header)
+            validations.append(validation)
+            print(f"✓ ({header['method']}, score {validation['validation_score']:.0f})")
+
+    header_results = header_report(headers)
+    with open(output_dir / '_header_improvement_report.json', 'w') as f:
+        json.dump(header_results, f, indent=2)
+
+    validation_results = validation_report(validations)
+    ensure_directory(validation_file.parent)
+    with open(validation_file, 'w') as f:
+        json.dump(validation_results, f, indent=2)
+
+    print()
+    print("="*80)
+    print("SUMMARY")
+    print("="*80)
+    print(f"Successfully processed: {len(headers)}/{len(csv_files)} files")
+    print(f"Headers improved: {header_results['improved']}")
+    for method, count in header_results['methods_used'].items():
+        print(f"  {method}: {count} tables")
+    print(f"Average validation score: {validation_results['avg_validation_score']:.1f}/100")
+    print(f"Needs review: {validation_results['needs_review']} "
+          f"(critical: {validation_results['critical_priority']}, high: {validation_results['high_priority']})")
+
+    memo_stats = pool.cache_stats()
+    for name, stats in memo_stats.items():
+        print(f"Memoized {name}: {stats['hit_rate']:.0%} hits ({stats['hits']:,}/{stats['lookups']:,})")
+
+    print(f"\n✓ Header report saved to {output_dir / '_header_improvement_report.json'}")
+    print(f"✓ Validation report saved to {validation_file}")
+
+    return {
+        'success': True,
+        'total_files': len(csv_files),
+        'successful': len(headers),
+        'failed': failed,
+        'headers': header_results,
+        'validation': validation_results,
+        'value_cache': memo_stats,
+        'output_dir': str(output_dir),
+    }
+
+
+def main():
+    """Command-line interface"""
+    parser = argparse.ArgumentParser(
+        description='Clean, enhance, fix headers of and validate tables in memory, writing only the final outputs'
+    )
+    parser.add_argument('--input-dir', type=Path, default=Path('output/01_extracted'),
+                      help='Directory with raw extracted CSVs')
+    parser.add_argument('--output-dir', type=Path, default=Path('output/03_improved_headers'),
+                      help='Directory for the final tables, metadata and header report')
+    parser.add_argument('--systems-file', type=Path,
+                      default=Path('output/02_cleaned/chemical_systems.json'),
+                      help='Path to chemical systems JSON')
+    parser.add_argument('--validation-report', type=Path, default=Path('output/validation_report.json'),
+                      help='Where to save the validation report')
+    parser.add_argument('--no-phases', action='store_true',
+                      help='Disable phase extraction')
+    parser.add_argument('--no-standardize', action='store_true',
+                      help='Disable column standardization')
+    parser.add_argument('--use-column-types', action='store_true',
+                      help='Let header detection use the detected column types')
+    parser.add_argument('--config', type=Path,
+                      help='Configuration YAML whose cleaning section sets the OCR fixes (default: built-in fixes)')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Process tables in N worker processes (default: 1, serial)')
+    parser.add_argument('--debug-dir', type=Path,
+                      help='Also write the intermediate tables of every step to this directory')
+
+    args = parser.parse_args()
+
+    if not args.input_dir.exists():
+        print(f"Error: Input directory not found: {args.input_dir}")
+        return 1
+
+    result = fused_clean_all(
+        args.input_dir,
+        args.output_dir,
+        systems_file=args.systems_file,
+        validation_file=args.validation_report,
+        extract_phases=not args.no_phases,
+        standardize_columns=not args.no_standardize,
+        use_column_types=args.use_column_types,
+        cleaning=load_cleaning_config(args.config) if args.config else None,
+        workers=args.workers,
+        debug_dir=args.debug_dir
+    )
+
+    if result['success']:
+        print(f"\n✓ Successfully processed {result['successful']} tables")
+        return 0
+    else:
+        print("\n✗ Fused pipeline failed")
+        return 1
+
+
+if __name__ == '__main__':
+    exit(main())
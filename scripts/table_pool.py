@@ -0,0 +1,144 @@
+"""
+Per-table work in a process pool, in input order
+
+The cleaning stages handle every table independently: read the CSV, clean
+it, write the CSV and its metadata. TablePool runs such a per-table
+function over many tables in worker processes and hands the results back
+in input order, so the caller aggregates, prints progress and records
+fingerprints exactly as in a serial run.
+
+- Tables are sent in chunks (one task per chunk, not per table), so the
+  per-task overhead of the pool is paid once per chunk.
+- At most a few chunks per worker are in flight; the results of later
+  chunks wait until the earlier ones are handed out.
+- A failing table is returned as an error, like the serial loop records it;
+  it does not fail its chunk.
+- If a worker dies, the chunks that did not finish are run in this process.
+- Workers report the statistics of their value caches with each chunk;
+  cache_stats() adds them up. Each worker has its own caches, so hit counts
+  depend on the number of workers: the stages save them under a
+  'value_cache' key, the one field that differs from a serial run.
+- The workers are shut down when the results are exhausted or the iterator
+  is closed (queued chunks are cancelled). Callers that may stop early
+  close it with contextlib.closing.
+
+With workers=1 everything runs in this process, one table at a time.
+
+Usage:
+    from table_pool import TablePool
+
+    pool = TablePool(workers=4)
+    with closing(pool.map(clean_and_save, csv_files, output_dir)) as cleaned:
+        for csv_path, (metadata, error) in zip(csv_files, cleaned):
+            ...
+    print(pool.cache_stats())
+"""
+
+import math
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from value_cache import cache_stats, merge_cache_stats, reset_cache_stats
+
+# Upper bound on tables per task (smaller chunks balance the load better)
+MAX_CHUNK_SIZE = 64
+
+# Chunks queued per worker ahead of the one being handed out
+CHUNKS_IN_FLIGHT = 2
+
+
+def _run_item(func: Callable, item, args: Tuple) -> Tuple:
+    """(result, None), or (None, error message) if func raised"""
+    try:
+        return func(item, *args), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _run_chunk(func: Callable, chunk: List, args: Tuple) -> Tuple[List[Tuple], Dict]:
+    """Worker task: run func over a chunk; returns the results and this chunk's cache statistics"""
+    reset_cache_stats()
+    results = [_run_item(func, item, args) for item in chunk]
+    return results, cache_stats()
+
+
+class TablePool:
+    """Maps a per-table function over tables in worker processes, yielding results in input order."""
+
+    def __init__(self, workers: int = 1, chunk_size: Optional[int] = None):
+        """
+        Args:
+            workers: Number of worker processes (1 = serial, in this process)
+            chunk_size: Tables per task (default: spread the tables over
+                about four chunks per worker, at most MAX_CHUNK_SIZE)
+        """
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self._worker_stats = []
+
+    def _chunks(self, items: Sequence) -> List[List]:
+        size = self.chunk_size or min(MAX_CHUNK_SIZE, max(1, math.ceil(len(items) / (self.workers * 4))))
+        return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+    def map(self, func: Callable, items: Sequence, *args) -> Iterator[Tuple]:
+        """
+        Run func(item, *args) for every item
+
+        func and args must be picklable (func defined at module level).
+
+        Yields:
+            (result, None), or (None, error message) if func raised, for each
+            item in order
+
+        Closing the iterator before it is exhausted cancels the queued
+        chunks and waits for the running ones.
+        """
+        items = list(items)
+        if self.workers == 1 or len(items) <= 1:
+            for item in items:
+                yield _run_item(func, item, args)
+            return
+
+        # Spawn rather than fork, as for extraction: never inherit a running JVM
+        context = multiprocessing.get_context('spawn')
+        chunks = deque(self._chunks(items))
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        try:
+            in_flight = deque()
+            while chunks or in_flight:
+                while chunks and len(in_flight) < self.workers * CHUNKS_IN_FLIGHT:
+                    chunk = chunks.popleft()
+                    try:
+                        future = executor.submit(_run_chunk, func, chunk, args)
+                    except BrokenProcessPool:
+                        future = None
+                    in_flight.append((chunk, future))
+
+                chunk, future = in_flight.popleft()
+                results = None
+                if future is not None:
+                    try:
+                        results, stats = future.result()
+                        self._worker_stats.append(stats)
+                    except BrokenProcessPool:
+                        pass
+                if results is None:
+                    # The pool broke: finish this chunk here
+                    results = [_run_item(func, item, args) for item in chunk]
+                yield from results
+        finally:
+            # Also reached when the caller closes the iterator early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """
+        Value cache statistics of the tables mapped so far (workers and this process)
+
+        Returns:
+            Dict mapping cache name -> lookups, hits, misses, evictions and
+            hit rate (the merge_cache_stats() keys, however many workers ran)
+        """
+        return merge_cache_stats([cache_stats()] + self._worker_stats)
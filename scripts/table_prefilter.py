@@ -0,0 +1,188 @@
+"""
+Table-presence prefilter
+
+Tabula analyses every page it is given, including title pages, prose and
+reference lists. This module scores each page from its content stream alone
+(text-layer density, share of numeric tokens, ruling lines), using pypdf
+without any layout analysis, and drops pages that almost certainly hold no
+table from the page list before tabula sees them.
+
+Strings shown in composite (Type0/CID) fonts are 2-byte glyph codes that
+only the font's ToUnicode map turns into text; they are not decoded here
+(pypdf's extract_text does, at about ten times the cost) and are left out
+of the word counts. A page showing at least as much CID text as readable
+text cannot be judged and is never skipped.
+
+The score is in [0, 1]; pages scoring below the threshold are skipped.
+A lower threshold keeps more pages (higher recall, less time saved).
+`benchmark.py prefilter` reports skipped pages, saved time and missed tables
+for several thresholds against an extraction manifest.
+
+Usage:
+    from table_prefilter import select_pages
+
+    kept, skipped = select_pages(pdf_path, range(1, 42), threshold=0.2)
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_THRESHOLD = 0.2
+
+# Pages with fewer words have no text layer tabula could read
+MIN_WORDS = 5
+
+# Feature values at which each part of the score saturates
+NUMERIC_RATIO_FULL = 0.3
+NUMERIC_TOKENS_FULL = 10
+RULING_LINES_FULL = 20
+
+NUMERIC_WEIGHT = 0.7
+RULING_WEIGHT = 0.3
+
+# Score of a page whose text is mostly in CID fonts (kept at any threshold)
+UNKNOWN_SCORE = 1.0
+
+# Form XObjects nested deeper than this are not scanned
+MAX_FORM_DEPTH = 3
+
+_NUMERIC_TOKEN = re.compile(r'[-+±]?\d+(?:[.,]\d+)?%?')
+_TEXT_OPERATORS = {b'Tj', b'TJ', b"'", b'"'}
+
+
+def _shown_strings(operands) -> Iterable[str]:
+    """Strings shown by a text operator (TJ takes an array of strings and kerning)"""
+    for operand in operands:
+        if isinstance(operand, list):
+            yield from _shown_strings(operand)
+        elif isinstance(operand, bytes):
+            yield operand.decode('latin-1')
+        elif isinstance(operand, str):
+            yield operand
+
+
+def _is_cid_font(resources, name) -> bool:
+    """Whether the font resource `name` is a composite (Type0) font"""
+    fonts = resources.get('/Font') if resources is not None else None
+    font = fonts.get_object().get(name) if fonts is not None else None
+    return font is not None and font.get_object().get('/Subtype') == '/Type0'
+
+
+def _scan_content(reader, content, resources, features: Dict, depth: int = 0):
+    """Accumulate features of a content stream, descending into form XObjects"""
+    from pypdf.generic import ContentStream
+
+    cid_font = False
+    for operands, operator in ContentStream(content, reader).operations:
+        if operator == b'Tf' and operands:
+            cid_font = _is_cid_font(resources, operands[0])
+        elif operator in _TEXT_OPERATORS and cid_font:
+            # Glyph codes, not text: counted, not tokenized
+            features['cid_chars'] += sum(len(text) for text in _shown_strings(operands)) // 2
+        elif operator in _TEXT_OPERATORS:
+            text = ''.join(_shown_strings(operands))
+            features['chars'] += len(text)
+            for token in text.split():
+                features['words'] += 1
+                if _NUMERIC_TOKEN.fullmatch(token):
+                    features['numeric_tokens'] += 1
+        elif operator in (b'l', b're'):
+            features['ruling_lines'] += 1
+        elif operator == b'Do' and depth < MAX_FORM_DEPTH and resources is not None:
+            xobjects = resources.get('/XObject')
+            xobject = xobjects.get_object().get(operands[0]) if xobjects is not None else None
+            xobject = xobject.get_object() if xobject is not None else None
+            if xobject is not None and xobject.get('/Subtype') == '/Form':
+                form_resources = xobject.get('/Resources')
+                _scan_content(reader, xobject,
+                              form_resources.get_object() if form_resources is not None else resources,
+                              features, depth + 1)
+
+
+def page_features(reader, page) -> Dict:
+    """
+    Text and drawing features of one page, from its content stream
+
+    Args:
+        reader: pypdf PdfReader the page belongs to
+        page: pypdf page object
+
+    Returns:
+        Dict with chars, words, numeric_tokens, numeric_ratio, ruling_lines
+        (line segments and rectangles drawn) and cid_chars (glyphs shown in
+        CID fonts, not part of the other text counts)
+    """
+    features = {'chars': 0, 'words': 0, 'numeric_tokens': 0, 'ruling_lines': 0, 'cid_chars': 0}
+    content = page.get_contents()
+    if content is not None:
+        resources = page.get('/Resources')
+        _scan_content(reader, content, resources.get_object() if resources is not None else None, features)
+    features['numeric_ratio'] = features['numeric_tokens'] / features['words'] if features['words'] else 0.0
+    return features
+
+
+def table_score(features: Dict) -> float:
+    """
+    Likelihood-like score in [0, 1] that a page holds a table
+
+    Numeric tokens carry most of the weight (solubility tables are mostly
+    numbers, prose is not); ruling lines add the rest. Pages with mostly
+    CID-font text get UNKNOWN_SCORE.
+    """
+    if features.get('cid_chars', 0) and features['cid_chars'] >= features['chars']:
+        return UNKNOWN_SCORE
+    if features['words'] < MIN_WORDS:
+        return 0.0
+    numeric = (min(1.0, features['numeric_ratio'] / NUMERIC_RATIO_FULL)
+               * min(1.0, features['numeric_tokens'] / NUMERIC_TOKENS_FULL))
+    ruling = min(1.0, features['ruling_lines'] / RULING_LINES_FULL)
+    return NUMERIC_WEIGHT * numeric + RULING_WEIGHT * ruling
+
+
+def score_pages(pdf_path: Path, page_list: Iterable[int] = None) -> Dict[int, Dict]:
+    """
+    Features and table score of each page
+
+    Args:
+        pdf_path: Path to PDF file
+        page_list: 1-based pages to score (default: all)
+
+    Returns:
+        Dict mapping page number -> features dict with a 'score' entry
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(pdf_path))
+    if page_list is None:
+        page_list = range(1, len(reader.pages) + 1)
+
+    scores = {}
+    for page in page_list:
+        features = page_features(reader, reader.pages[page - 1])
+        features['score'] = table_score(features)
+        scores[page] = features
+    return scores
+
+
+def select_pages(
+    pdf_path: Path,
+    page_list: Iterable[int],
+    threshold: float = DEFAULT_THRESHOLD
+) -> Tuple[List[int], List[int]]:
+    """
+    Split pages into those worth sending to tabula and those to skip
+
+    Args:
+        pdf_path: Path to PDF file
+        page_list: 1-based pages in extraction order
+        threshold: Minimum table score to keep a page (lower = higher recall)
+
+    Returns:
+        (kept pages, skipped pages), both in the given order
+    """
+    page_list = list(page_list)
+    scores = score_pages(pdf_path, page_list)
+    kept = [page for page in page_list if scores[page]['score'] >= threshold]
+    skipped = [page for page in page_list if scores[page]['score'] < threshold]
+    return kept, skipped
@@ -0,0 +1,178 @@
+"""
+Shared tabula-java session
+
+Every tabula.read_pdf call used to pay for a fresh Java startup. This module
+keeps one JVM warm for the whole run (via tabula-py's jpype backend) and
+exposes a single read_pdf entry point that every extraction module uses.
+
+Usage:
+    from tabula_session import read_pdf, close_session
+
+    tables = read_pdf(pdf_path, pages='1', multiple_tables=True)
+    ...
+    close_session()   # at the end of the run
+
+    # Or with an explicit lifecycle
+    with TabulaSession() as session:
+        tables = session.read_pdf(pdf_path, pages='all')
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import tabula
+
+# Keep tabula-java quiet, same options tabula-py adds for silent=True
+DEFAULT_JAVA_OPTIONS = [
+    '-Dfile.encoding=UTF8',
+    '-Dorg.slf4j.simpleLogger.defaultLogLevel=off',
+    '-Dorg.apache.commons.logging.Log=org.apache.commons.logging.impl.NoOpLog',
+]
+
+
+class TabulaSession:
+    """One long-lived tabula-java JVM shared by all extraction calls."""
+
+    def __init__(self, java_options: Optional[List[str]] = None, force_subprocess: bool = False):
+        """
+        Args:
+            java_options: Extra JVM options (e.g. ['-Xmx2g']), only used at JVM start
+            force_subprocess: Spawn a Java process per call (old behaviour)
+        """
+        self.java_options = list(java_options or [])
+        self.force_subprocess = force_subprocess
+        self.started = False
+        self.closed = False
+        self.stats = {'calls': 0, 'seconds': 0.0, 'startup_seconds': 0.0}
+
+    def start(self) -> 'TabulaSession':
+        """Boot the JVM once (no-op if already running)"""
+        if self.closed:
+            raise RuntimeError("TabulaSession is closed; create a new session")
+        if self.started:
+            return self
+
+        if not self.force_subprocess:
+            start = time.perf_counter()
+            try:
+                import jpype
+
+                if not jpype.isJVMStarted():
+                    jpype.addClassPath(tabula.backend.jar_path())
+                    jpype.startJVM(*(DEFAULT_JAVA_OPTIONS + self.java_options), convertStrings=False)
+            except ImportError:
+                print("  ⚠ jpype not installed, falling back to one Java process per call")
+                self.force_subprocess = True
+            except Exception as e:
+                # No usable JVM, or JPype refusing to restart one shut down earlier
+                print(f"  ⚠ Could not start JVM ({e}), falling back to one Java process per call")
+                self.force_subprocess = True
+            self.stats['startup_seconds'] = time.perf_counter() - start
+
+        self.started = True
+        return self
+
+    def read_pdf(self, pdf_path: Path, **kwargs) -> List[pd.DataFrame]:
+        """
+        Extract tables with tabula, reusing the warm JVM
+
+        Args:
+            pdf_path: Path to PDF file
+            **kwargs: Options forwarded to tabula.read_pdf
+
+        Returns:
+            List of DataFrames (or raw JSON when output_format='json')
+        """
+        self.start()
+        kwargs.setdefault('silent', True)
+
+        start = time.perf_counter()
+        try:
+            return tabula.read_pdf(str(pdf_path), force_subprocess=self.force_subprocess, **kwargs)
+        finally:
+            self.stats['calls'] += 1
+            self.stats['seconds'] += time.perf_counter() - start
+
+    def convert_into_by_batch(self, input_dir: Path, **kwargs):
+        """
+        Convert every PDF in a directory in one tabula-java call
+
+        tabula-java writes one output file per PDF next to it
+        (e.g. booklet.pdf -> booklet.json).
+
+        Args:
+            input_dir: Directory of PDF files
+            **kwargs: Options forwarded to tabula.convert_into_by_batch
+        """
+        self.start()
+        kwargs.setdefault('silent', True)
+
+        start = time.perf_counter()
+        try:
+            tabula.convert_into_by_batch(str(input_dir), force_subprocess=self.force_subprocess, **kwargs)
+        finally:
+            self.stats['calls'] += 1
+            self.stats['seconds'] += time.perf_counter() - start
+
+    def close(self):
+        """
+        End the session and shut the JVM down.
+
+        JPype cannot restart a JVM inside the same process, so only close
+        the session once the run is finished.
+        """
+        if self.closed:
+            return
+        if self.started and not self.force_subprocess:
+            try:
+                import jpype
+                if jpype.isJVMStarted():
+                    jpype.shutdownJVM()
+            except ImportError:
+                pass
+        self.closed = True
+
+    def __enter__(self) -> 'TabulaSession':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Process-wide session shared by all modules
+_session: Optional[TabulaSession] = None
+
+
+def get_session() -> TabulaSession:
+    """Return the shared session, starting it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = TabulaSession()
+    return _session.start()
+
+
+def read_pdf(pdf_path: Path, **kwargs) -> List[pd.DataFrame]:
+    """tabula.read_pdf through the shared session"""
+    return get_session().read_pdf(pdf_path, **kwargs)
+
+
+def convert_into_by_batch(input_dir: Path, **kwargs):
+    """tabula.convert_into_by_batch through the shared session"""
+    get_session().convert_into_by_batch(input_dir, **kwargs)
+
+
+def session_stats() -> Dict:
+    """Call counts and timings of the shared session"""
+    if _session is None:
+        return {'calls': 0, 'seconds': 0.0, 'startup_seconds': 0.0}
+    return dict(_session.stats)
+
+
+def close_session():
+    """Shut down the shared session (call once at the end of a run)"""
+    global _session
+    if _session is not None:
+        _session.close()
+    _session = None
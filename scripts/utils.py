@@ -3,11 +3,17 @@ Shared utility functions for solubility data processing pipeline
 """
 
 import pandas as pd
+import hashlib
+import os
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+from numeric_profile import NumericProfile
+from value_cache import memoize_values
 
+
+@memoize_values('advanced_clean')
 def advanced_clean(value) -> Optional[str]:
     """
     Advanced cleaning for OCR artifacts in extracted data
@@ -38,12 +44,8 @@ def advanced_clean(value) -> Optional[str]:
     text = re.sub(r'\.\s+(\d)', r'.\1', text)
 
     # Common OCR fixes
-    text = text.replace('mo1', 'mol')
-    text = text.replace('Q .', '0.')
-    text = text.replace('a .', '0.')
-    text = text.replace('I I', 'II')
-    text = text.replace('0. so', '0.50')
-    text = text.replace('. so', '.50')
+    for old, new in OCR_FIXES:
+        text = text.replace(old, new)
 
     # Fix specific patterns
     text = re.sub(r'\bs\s*o\b', '50', text)  # "s o" -> "50"
@@ -131,6 +133,33 @@ def parse_pdf_filename(pdf_path: Path) -> Dict[str, str]:
     }
 
 
+# Memoized content hashes, keyed by (path, size, mtime)
+_file_hashes: Dict[tuple, str] = {}
+
+
+def file_hash(path: Path) -> str:
+    """
+    SHA-256 of a file's content (memoized while the file is unchanged)
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    stat = os.stat(path)
+    memo_key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+    if memo_key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        _file_hashes[memo_key] = digest.hexdigest()
+
+    return _file_hashes[memo_key]
+
+
 def ensure_directory(path: Path) -> Path:
     """
     Ensure directory exists, create if needed
@@ -145,6 +174,83 @@ def ensure_directory(path: Path) -> Path:
     return path
 
 
+def count_pdf_pages(pdf_path: Path) -> int:
+    """
+    Count pages in a PDF file
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        Number of pages
+    """
+    from pypdf import PdfReader
+
+    return len(PdfReader(str(pdf_path)).pages)
+
+
+def parse_page_spec(pages, page_count: int) -> List[int]:
+    """
+    Expand a tabula-style page specification into page numbers
+
+    Args:
+        pages: 'all', an int, a list of ints, or a string like '1-3,7'
+        page_count: Number of pages in the PDF
+
+    Returns:
+        List of 1-based page numbers in the order given
+    """
+    if pages is None or pages == 'all':
+        return list(range(1, page_count + 1))
+    if isinstance(pages, int):
+        return [pages]
+    if isinstance(pages, (list, tuple, range)):
+        return [int(p) for p in pages]
+
+    page_list = []
+    for part in str(pages).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            page_list.extend(range(int(start), int(end) + 1))
+        else:
+            page_list.append(int(part))
+    return page_list
+
+
+def format_page_spec(page_list: List[int]) -> str:
+    """
+    Collapse page numbers into a compact tabula page string
+
+    Args:
+        page_list: Page numbers, e.g. [1, 2, 3, 7]
+
+    Returns:
+        Page string, e.g. '1-3,7'
+    """
+    parts = []
+    start = prev = None
+    for page in page_list:
+        if prev is not None and page == prev + 1:
+            prev = page
+            continue
+        if start is not None:
+            parts.append(f"{start}-{prev}" if prev != start else str(start))
+        start = prev = page
+    if start is not None:
+        parts.append(f"{start}-{prev}" if prev != start else str(start))
+    return ','.join(parts)
+
+
+def available_cores() -> int:
+    """Number of CPU cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 def count_numeric_values(df: pd.DataFrame) -> int:
     """
     Count numeric values in dataframe
@@ -153,13 +259,10 @@ def count_numeric_values(df: pd.DataFrame) -> int:
         df: DataFrame to analyze
 
     Returns:
-        Count of cells containing numeric data
+        Count of cells containing numeric data (see NumericProfile for the
+        per-column ratios and parsed values from the same pass)
     """
-    count = 0
-    for val in df.values.flatten():
-        if pd.notna(val) and re.search(r'\d+\.?\d*', str(val)):
-            count += 1
-    return count
+    return NumericProfile.from_frame(df).numeric_count
 
 
 def has_data_type(df: pd.DataFrame, data_type: str) -> bool:
@@ -252,7 +355,7 @@ VALID_PHASES = [
     'A+II', 'B+II', 'C+II',
 ]
 
-# OCR artifact patterns
+# OCR artifact fixes, applied in order (default for cleaning.ocr_fixes in config.yaml)
 OCR_FIXES = [
     ('mo1', 'mol'),
     ('Q .', '0.'),
@@ -0,0 +1,188 @@
+"""
+Memoization of per-cell functions
+
+Solubility tables repeat the same strings heavily: phase labels, "----",
+common concentrations, header words. The per-cell functions of the
+cleaning stage (OCR cleaning, phase extraction, the HeaderDetector value
+checks) are pure functions of the cell text, so each goes through a
+bounded LRU cache keyed by the raw string. The caches are module-level:
+they are shared by all tables (and all extractor/detector instances) in a
+process for the whole run.
+
+Only str values are cached; other values (NaN, numbers) are computed
+directly. Cached results must be immutable (str, tuples, bools, None).
+
+Each worker process of a process pool has its own caches (nothing is
+shared between processes). Workers report cache_stats() with their results
+and the parent adds them up with merge_cache_stats().
+
+Usage:
+    from value_cache import memoize_values, cache_stats
+
+    @memoize_values('phase')
+    def extract_phase(value): ...
+
+    print(cache_stats())   # {'phase': {'hits': ..., 'misses': ..., 'hit_rate': ...}}
+"""
+
+import functools
+import threading
+from typing import Callable, Dict, Iterable
+
+# Entries kept per cache (least recently used entries are evicted beyond this)
+DEFAULT_MAXSIZE = 50_000
+
+_STAT_KEYS = ('lookups', 'hits', 'misses', 'evictions')
+
+
+class ValueCache:
+    """A bounded, thread-safe LRU cache with hit statistics."""
+
+    def __init__(self, name: str, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Args:
+            name: Name reported in the statistics
+            maxsize: Maximum number of entries
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def get(self, key, compute: Callable):
+        """
+        Cached result for key, computing and storing it on a miss
+
+        Args:
+            key: Hashable key (the raw cell string)
+            compute: Called without arguments on a miss
+        """
+        with self._lock:
+            if key in self._data:
+                # Re-insert to mark as most recently used (dicts keep insertion order)
+                value = self._data.pop(key)
+                self._data[key] = value
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                del self._data[next(iter(self._data))]
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drop all entries (statistics are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        """Start counting hits and misses from zero"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Lookups, hits, misses, evictions, hit rate and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'lookups': lookups,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+    def __getstate__(self):
+        # Pickled (e.g. sent to a worker process) as an empty cache
+        return {'name': self.name, 'maxsize': self.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'], state['maxsize'])
+
+
+_caches: Dict[str, ValueCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_value_cache(name: str, maxsize: int = DEFAULT_MAXSIZE) -> ValueCache:
+    """The process-wide cache with this name (created on first use)"""
+    with _registry_lock:
+        if name not in _caches:
+            _caches[name] = ValueCache(name, maxsize)
+        return _caches[name]
+
+
+def memoize_values(name: str, maxsize: int = DEFAULT_MAXSIZE):
+    """
+    Decorator: memoize a function (or method) of one cell value by its raw string
+
+    The value is the last positional argument; for methods the result must
+    not depend on the instance, since all instances share the cache.
+
+    Args:
+        name: Cache name (one cache per name, reported in cache_stats())
+        maxsize: Maximum number of cached values
+    """
+    cache = get_value_cache(name, maxsize)
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args):
+            value = args[-1]
+            if type(value) is not str:
+                return func(*args)
+            return cache.get(value, lambda: func(*args))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Statistics of every cache that was used since the last reset"""
+    with _registry_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches if cache.hits or cache.misses}
+
+
+def reset_cache_stats():
+    """Reset the statistics of all caches (their entries are kept)"""
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.reset_stats()
+
+
+def clear_caches():
+    """Drop the entries of all caches (e.g. to time a cold run)"""
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def merge_cache_stats(stats: Iterable[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """
+    Add up cache_stats() results (e.g. from several worker processes)
+
+    Returns:
+        Dict mapping cache name -> lookups, hits, misses, evictions and hit rate
+    """
+    merged = {}
+    for process_stats in stats:
+        for name, cache in (process_stats or {}).items():
+            total = merged.setdefault(name, dict.fromkeys(_STAT_KEYS, 0))
+            for key in _STAT_KEYS:
+                total[key] += cache.get(key, 0)
+    for total in merged.values():
+        total['hit_rate'] = round(total['hits'] / total['lookups'], 4) if total['lookups'] else 0.0
+    return merged